@@ -0,0 +1,27 @@
+"""doctor working hours
+
+Revision ID: 0a9c3e5f7b2d
+Revises: f1b8c2d5e9a3
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0a9c3e5f7b2d"
+down_revision = "f1b8c2d5e9a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("doctors", sa.Column("available_days", sa.ARRAY(sa.String()), nullable=True))
+    op.add_column("doctors", sa.Column("available_hours_start", sa.Time(), nullable=True))
+    op.add_column("doctors", sa.Column("available_hours_end", sa.Time(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("doctors", "available_hours_end")
+    op.drop_column("doctors", "available_hours_start")
+    op.drop_column("doctors", "available_days")
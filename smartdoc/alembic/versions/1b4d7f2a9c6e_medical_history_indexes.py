@@ -0,0 +1,44 @@
+"""medical history lookup indexes
+
+Revision ID: 1b4d7f2a9c6e
+Revises: 0a9c3e5f7b2d
+Create Date: 2026-10-18 14:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "1b4d7f2a9c6e"
+down_revision = "0a9c3e5f7b2d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One record per patient; fails if duplicates exist, which must be merged by hand first
+    op.create_index("uq_medical_history_patient_id", "medical_history", ["patient_id"], unique=True)
+    op.create_index("ix_medical_history_allergies", "medical_history", ["allergies"], postgresql_using="gin")
+    op.create_index(
+        "ix_medical_history_chronic_conditions", "medical_history", ["chronic_conditions"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_medical_history_current_medications",
+        "medical_history",
+        ["current_medications"],
+        postgresql_using="gin",
+        postgresql_ops={"current_medications": "jsonb_path_ops"},
+    )
+    # Existing entries are lower-cased to match the normalisation applied on write
+    op.execute("UPDATE medical_history SET allergies = lower(allergies::text)::varchar[], version = version + 1 WHERE allergies IS NOT NULL")
+    op.execute(
+        "UPDATE medical_history SET chronic_conditions = lower(chronic_conditions::text)::varchar[], version = version + 1 "
+        "WHERE chronic_conditions IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_medical_history_current_medications", table_name="medical_history")
+    op.drop_index("ix_medical_history_chronic_conditions", table_name="medical_history")
+    op.drop_index("ix_medical_history_allergies", table_name="medical_history")
+    op.drop_index("uq_medical_history_patient_id", table_name="medical_history")
@@ -0,0 +1,30 @@
+"""keyset pagination indexes
+
+Revision ID: a3c1f0d2b9e4
+Revises: 
+Create Date: 2026-10-18 09:12:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3c1f0d2b9e4"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_hospitals_name_id", "hospitals", ["name", "id"])
+    op.create_index("ix_doctors_last_name_id", "doctors", ["last_name", "id"])
+    op.create_index("ix_doctors_hospital_id_last_name_id", "doctors", ["hospital_id", "last_name", "id"])
+    op.create_index("ix_patients_created_at_id", "patients", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_patients_created_at_id", table_name="patients")
+    op.drop_index("ix_doctors_hospital_id_last_name_id", table_name="doctors")
+    op.drop_index("ix_doctors_last_name_id", table_name="doctors")
+    op.drop_index("ix_hospitals_name_id", table_name="hospitals")
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,22 @@
+"""hospital coordinates index
+
+Revision ID: b7e2d4a91c05
+Revises: a3c1f0d2b9e4
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e2d4a91c05"
+down_revision = "a3c1f0d2b9e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_hospitals_latitude_longitude", "hospitals", ["latitude", "longitude"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hospitals_latitude_longitude", table_name="hospitals")
@@ -0,0 +1,33 @@
+"""doctor directory filter indexes
+
+Revision ID: c5d8e1f3a6b2
+Revises: b7e2d4a91c05
+Create Date: 2026-10-18 10:48:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c5d8e1f3a6b2"
+down_revision = "b7e2d4a91c05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_doctors_specialization_last_name_id", "doctors", ["specialization", "last_name", "id"])
+    op.create_index(
+        "ix_doctors_hospital_id_specialization_last_name_id",
+        "doctors",
+        ["hospital_id", "specialization", "last_name", "id"],
+    )
+    op.create_index("ix_doctors_last_name_lower_pattern", "doctors", [sa.text("lower(last_name) text_pattern_ops")])
+    op.create_index("ix_doctors_first_name_lower_pattern", "doctors", [sa.text("lower(first_name) text_pattern_ops")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_doctors_first_name_lower_pattern", table_name="doctors")
+    op.drop_index("ix_doctors_last_name_lower_pattern", table_name="doctors")
+    op.drop_index("ix_doctors_hospital_id_specialization_last_name_id", table_name="doctors")
+    op.drop_index("ix_doctors_specialization_last_name_id", table_name="doctors")
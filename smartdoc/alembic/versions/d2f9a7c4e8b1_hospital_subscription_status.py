@@ -0,0 +1,37 @@
+"""hospital subscription status
+
+Revision ID: d2f9a7c4e8b1
+Revises: c5d8e1f3a6b2
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d2f9a7c4e8b1"
+down_revision = "c5d8e1f3a6b2"
+branch_labels = None
+depends_on = None
+
+subscription_status = sa.Enum("ACTIVE", "EXPIRED", "SUSPENDED", name="subscriptionstatus")
+
+
+def upgrade() -> None:
+    subscription_status.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "hospitals",
+        sa.Column("subscription_status", subscription_status, server_default="ACTIVE", nullable=True),
+    )
+    op.create_index(
+        "ix_hospitals_registration_name",
+        "hospitals",
+        ["name", "id"],
+        postgresql_where=sa.text("status = 'ACTIVE' AND subscription_status = 'ACTIVE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hospitals_registration_name", table_name="hospitals")
+    op.drop_column("hospitals", "subscription_status")
+    subscription_status.drop(op.get_bind(), checkfirst=True)
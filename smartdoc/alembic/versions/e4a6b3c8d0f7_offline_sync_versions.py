@@ -0,0 +1,37 @@
+"""offline sync row versions
+
+Revision ID: e4a6b3c8d0f7
+Revises: d2f9a7c4e8b1
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e4a6b3c8d0f7"
+down_revision = "d2f9a7c4e8b1"
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ("patients", "medical_history", "consultations")
+
+
+def upgrade() -> None:
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+        # Delta queries compare updated_at directly, so it must be set from creation on
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+        op.alter_column(table, "updated_at", server_default=sa.func.now())
+    op.create_index("ix_medical_history_patient_id_updated_at", "medical_history", ["patient_id", "updated_at"])
+    op.create_index("ix_consultations_patient_id_updated_at", "consultations", ["patient_id", "updated_at"])
+    op.create_index("ix_consultations_doctor_id_updated_at", "consultations", ["doctor_id", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_consultations_doctor_id_updated_at", table_name="consultations")
+    op.drop_index("ix_consultations_patient_id_updated_at", table_name="consultations")
+    op.drop_index("ix_medical_history_patient_id_updated_at", table_name="medical_history")
+    for table in SYNCED_TABLES:
+        op.alter_column(table, "updated_at", server_default=None)
+        op.drop_column(table, "version")
@@ -0,0 +1,31 @@
+"""consultation slot booking indexes
+
+Revision ID: f1b8c2d5e9a3
+Revises: e4a6b3c8d0f7
+Create Date: 2026-10-18 13:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f1b8c2d5e9a3"
+down_revision = "e4a6b3c8d0f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_consultations_doctor_id_scheduled_at", "consultations", ["doctor_id", "scheduled_at"])
+    op.create_index(
+        "uq_consultations_doctor_slot",
+        "consultations",
+        ["doctor_id", "scheduled_at"],
+        unique=True,
+        postgresql_where=sa.text("status <> 'CANCELLED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_consultations_doctor_slot", table_name="consultations")
+    op.drop_index("ix_consultations_doctor_id_scheduled_at", table_name="consultations")
@@ -3,10 +3,18 @@ from .endpoints.auth import router as auth_router
 from .endpoints.hospitals import router as hospitals_router
 from .endpoints.doctors import router as doctors_router
 from .endpoints.patients import router as patients_router
+from .endpoints.matching import router as matching_router
+from .endpoints.consultations import router as consultations_router
+from .endpoints.medical_history import router as medical_history_router
+from .endpoints.exports import router as exports_router
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(hospitals_router, prefix="/hospitals", tags=["Hospitals"])
 api_router.include_router(doctors_router, prefix="/doctors", tags=["Doctors"])
-api_router.include_router(patients_router, prefix="/patients", tags=["Patients"])
\ No newline at end of file
+api_router.include_router(patients_router, prefix="/patients", tags=["Patients"])
+api_router.include_router(matching_router, prefix="/matching", tags=["Matching"])
+api_router.include_router(consultations_router, prefix="/consultations", tags=["Consultations"])
+api_router.include_router(medical_history_router, prefix="/medical-history", tags=["Medical History"])
+api_router.include_router(exports_router, prefix="/exports", tags=["Exports"])
\ No newline at end of file
@@ -1,19 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from ...db.db import get_database
+from ...db.db import get_database, get_read_database
 from app.services.authService import AuthService
 from app.services.profileService import ProfileService
-from app.schemas.userSchema import UserLogin, Token, ForgotPasswordRequest, ResetPasswordRequest, UserResponse
+from app.services.syncService import SyncService
+from app.schemas.syncSchema import SyncRequest, SyncResponse
+from app.schemas.userSchema import UserLogin, Token, ForgotPasswordRequest, ResetPasswordRequest, UserResponse, UserProfileResponse
 from app.schemas.patientSchema import PatientCreate
 from app.schemas.hospitalSchema import HospitalCreate
 from app.schemas.doctorSchema import DoctorCreate
 from app.schemas.userSchema import AdminCreate
 from app.dependencies.auth import get_current_user, get_current_admin
 from app.models.user import User
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.repositories.hospitalRepository import HospitalRepository
 from ...models import UserRole
+from app.pagination import Page
+from app.serialization import model_response
+from app.cache import hospital_registration_cache
+from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -38,11 +46,22 @@ async def create_hospital_account(
 
 @router.get("/hospitals", response_model=List[Dict])
 async def get_hospitals_for_registration(
+    request: Request,
     db: AsyncSession = Depends(get_database)
 ):
     """Get list of active hospitals for doctor registration"""
-    hospital_repo = HospitalRepository(db)
-    return await hospital_repo.get_hospitals_for_registration()
+    cached = hospital_registration_cache.get("hospitals")
+    if cached is None:
+        hospitals = await HospitalRepository(db).get_hospitals_for_registration()
+        body = json.dumps(hospitals, separators=(",", ":")).encode()
+        cached = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+        hospital_registration_cache.set("hospitals", cached)
+    
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.HOSPITAL_REGISTRATION_CACHE_SECONDS}"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/doctor/register", response_model=Dict)
 async def create_doctor_account(
@@ -94,22 +113,22 @@ async def reset_password(
     auth_service = AuthService(db)
     return await auth_service.reset_password(request.token, request.new_password)
 
-@router.get("/profiles", response_model=List[Dict])
+@router.get("/profiles", response_model=Page[UserProfileResponse])
 async def get_all_profiles(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_read_database)
 ):
     """Get all user profiles (Admin only)"""
     profile_service = ProfileService(db)
-    return await profile_service.get_all_profiles(skip, limit)
+    return model_response(Page[UserProfileResponse], await profile_service.get_all_profiles(cursor, limit))
 
 @router.get("/profile/{user_id}", response_model=Dict)
 async def get_user_profile(
     user_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_read_database)
 ):
     """Get specific user profile"""
     if current_user.role != UserRole.ADMIN and str(current_user.id) != user_id:
@@ -120,7 +139,7 @@ async def get_user_profile(
 @router.get("/profile/me", response_model=Dict)
 async def get_signed_in_user_profile(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_read_database)
 ):
     """Get current user's profile"""
     profile_service = ProfileService(db)
@@ -143,10 +162,15 @@ async def send_otp(phone: str, db: AsyncSession = Depends(get_database)):
     return await auth_service.send_otp(phone)
     # return hospital_schema.HospitalResponse.from_orm(hospital).dict(exclude_unset=True)
 
-@router.post("/sync")
-async def sync_data(data: Dict, current_user: User = Depends(get_current_user)):
-    # Process offline data
-    return {"message": "Data synced"}
+@router.post("/sync", response_model=SyncResponse)
+async def sync_data(
+    request: SyncRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Apply a batch of offline edits and return server-side changes since the client's sync token"""
+    sync_service = SyncService(db)
+    return await sync_service.sync(request, current_user)
 
 # data_consent: bool = Field(..., description="Consent for data processing per NDPR")
 
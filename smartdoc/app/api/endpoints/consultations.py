@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from datetime import date
+from app.db.db import get_database
+from app.services.consultationService import ConsultationService
+from app.schemas.consultationSchema import ConsultationCreate, ConsultationResponse, ConsultationSlot
+from app.dependencies.auth import get_current_user, get_current_patient
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/", response_model=ConsultationResponse, status_code=status.HTTP_201_CREATED)
+async def book_consultation(
+    booking: ConsultationCreate,
+    current_user: User = Depends(get_current_patient),
+    db: AsyncSession = Depends(get_database)
+):
+    """Book a consultation slot with a doctor (Patient only)"""
+    return await ConsultationService(db).book(booking, current_user)
+
+@router.get("/doctors/{doctor_id}/schedule", response_model=List[ConsultationSlot])
+async def get_doctor_schedule(
+    doctor_id: str,
+    day: date,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Get a doctor's booked slots for one (UTC) day"""
+    return await ConsultationService(db).get_doctor_day(doctor_id, day)
+
+@router.post("/{consultation_id}/cancel", response_model=ConsultationResponse)
+async def cancel_consultation(
+    consultation_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Cancel a scheduled consultation (patient, doctor or admin)"""
+    return await ConsultationService(db).cancel(consultation_id, current_user)
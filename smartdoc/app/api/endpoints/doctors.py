@@ -1,32 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.db.db import get_database
+from typing import List, Optional
+from datetime import datetime, timezone
+from app.db.db import get_database, get_read_database
 from app.repositories.doctorRepository import DoctorRepository
 from app.repositories.hospitalRepository import HospitalRepository
-from app.schemas.doctorSchema import DoctorResponse, DoctorUpdate
-from app.dependencies.auth import get_current_user, get_current_hospital_admin
+from app.schemas.doctorSchema import DoctorResponse, DoctorSummary, DoctorUpdate, DoctorAvailability, DoctorImportReport
+from app.services.availabilityService import AvailabilityService
+from app.services.doctorImportService import DoctorImportService
+from app.dependencies.auth import get_current_user, get_current_hospital
 from app.models.user import User
-from app.models import UserRole
+from app.models import UserRole, UserStatus
+from app.pagination import Page
+from app.models.Doctor import Doctor
+from app.serialization import projection_columns, rows_page_response
 
 router = APIRouter(prefix="/doctors", tags=["Doctors"])
 
-@router.get("/", response_model=List[DoctorResponse])
+@router.get("/", response_model=Page[DoctorResponse])
 async def get_doctors(
     hospital_id: str = None,
     specialization: str = None,
-    skip: int = 0,
-    limit: int = 100,
+    sub_specialization: str = None,
+    status: Optional[UserStatus] = None,
+    q: Optional[str] = Query(None, min_length=2, description="First or last name prefix"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or 'summary'"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_database)
+):
+    """Get doctors with optional filters, ordered by last name"""
+    rows, next_cursor = await DoctorRepository(db).get_all(
+        hospital_id, specialization, sub_specialization, status, q, cursor, limit,
+        columns=projection_columns(Doctor, DoctorResponse, fields, (Doctor.last_name, Doctor.id), DoctorSummary)
+    )
+    return rows_page_response(rows, next_cursor)
+
+@router.post("/import", response_model=DoctorImportReport)
+async def import_doctors(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_hospital),
+    db: AsyncSession = Depends(get_database)
+):
+    """Bulk-create doctor accounts for the current hospital from a CSV or NDJSON upload"""
+    hospital = await HospitalRepository(db).get_by_user_id(str(current_user.id))
+    if not hospital:
+        raise HTTPException(status_code=404, detail="Hospital not found")
+    return await DoctorImportService(db).import_upload(str(hospital.id), file, format)
+
+@router.get("/availability", response_model=List[DoctorAvailability])
+async def get_doctor_availability(
+    specialization: Optional[str] = None,
+    hospital_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    hours: float = Query(2, gt=0, le=168),
+    limit: int = Query(50, ge=1, le=500),
     db: AsyncSession = Depends(get_database)
 ):
-    """Get doctors with optional filters"""
-    doctors = await DoctorRepository(db).get_all(hospital_id, skip, limit)
-    return doctors
+    """Doctors with free consultation slots in the window [start, start + hours), clamped to
+    now and the AVAILABILITY_HORIZON_DAYS booking horizon"""
+    if start is None:
+        start = datetime.now(timezone.utc)
+    elif start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return await AvailabilityService(db).search(start, hours, specialization, hospital_id, limit)
 
 @router.get("/{doctor_id}", response_model=DoctorResponse)
 async def get_doctor(
     doctor_id: str,
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_read_database)
 ):
     """Get doctor by ID"""
     doctor = await DoctorRepository(db).get_by_id(doctor_id)
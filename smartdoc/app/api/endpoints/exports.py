@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from typing import Optional
+from app.exports import export_response
+from app.dependencies.auth import get_current_admin
+from app.models.user import User
+from app.models.hospital import Hospital
+from app.models.Doctor import Doctor
+from app.models.Patient import Patient
+
+router = APIRouter()
+
+EXPORT_FORMAT = Query("ndjson", pattern="^(ndjson|csv)$")
+
+@router.get("/hospitals")
+async def export_hospitals(
+    format: str = EXPORT_FORMAT,
+    current_user: User = Depends(get_current_admin)
+):
+    """Stream every hospital as NDJSON or CSV (Admin only)"""
+    query = select(*Hospital.__table__.columns).order_by(Hospital.id)
+    return export_response(query, "hospitals", format)
+
+@router.get("/doctors")
+async def export_doctors(
+    hospital_id: Optional[str] = None,
+    format: str = EXPORT_FORMAT,
+    current_user: User = Depends(get_current_admin)
+):
+    """Stream doctors, optionally for one hospital, as NDJSON or CSV (Admin only)"""
+    query = select(*Doctor.__table__.columns).order_by(Doctor.id)
+    if hospital_id:
+        query = query.where(Doctor.hospital_id == hospital_id)
+    return export_response(query, "doctors", format)
+
+@router.get("/patients")
+async def export_patients(
+    format: str = EXPORT_FORMAT,
+    current_user: User = Depends(get_current_admin)
+):
+    """Stream every patient record as NDJSON or CSV (Admin only)"""
+    query = select(*Patient.__table__.columns).order_by(Patient.id)
+    return export_response(query, "patients", format)
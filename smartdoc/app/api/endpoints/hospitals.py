@@ -1,29 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from ...db import get_database
+from typing import List, Optional
+from ...db.db import get_database, get_read_database
 from ...repositories.hospitalRepository import HospitalRepository
-from ...schemas.hospitalSchema import HospitalResponse, HospitalUpdate
+from ...schemas.hospitalSchema import HospitalResponse, HospitalSummary, HospitalUpdate
 from ...dependencies.auth import get_current_user, get_current_hospital_admin
 from ...models.user import User
+from ...pagination import Page
+from ...models.hospital import Hospital
+from ...serialization import projection_columns, rows_page_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[HospitalResponse])
+@router.get("/", response_model=Page[HospitalResponse])
 async def get_hospitals(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_database)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, or 'summary'"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_database)
 ):
-    """Get all hospitals"""
+    """Get all hospitals, ordered by name"""
     hospital_repo = HospitalRepository(db)
-    hospitals = await hospital_repo.get_all(skip, limit)
-    return hospitals
+    columns = projection_columns(Hospital, HospitalResponse, fields, (Hospital.name, Hospital.id), HospitalSummary)
+    rows, next_cursor = await hospital_repo.get_all(cursor, limit, columns)
+    return rows_page_response(rows, next_cursor)
 
 @router.get("/{hospital_id}", response_model=HospitalResponse)
 async def get_hospital(
     hospital_id: str,
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_read_database)
 ):
     """Get hospital by ID"""
     hospital_repo = HospitalRepository(db)
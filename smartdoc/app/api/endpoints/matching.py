@@ -1,8 +1,19 @@
-# @router.post("/matching/hospitals")
-# async def match_hospitals(
-#     query: MatchingQuery,
-#     current_user: User = Depends(get_current_patient),
-#     db: AsyncSession = Depends(get_db)
-# ):
-#     # Geospatial query for nearby hospitals
-#     pass
\ No newline at end of file
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.db.db import get_database
+from app.services.matchingService import MatchingService
+from app.schemas.matchingSchema import MatchingQuery, HospitalMatch
+from app.dependencies.auth import get_current_patient
+from app.models.user import User
+
+router = APIRouter()
+
+@router.post("/hospitals", response_model=List[HospitalMatch])
+async def match_hospitals(
+    query: MatchingQuery,
+    current_user: User = Depends(get_current_patient),
+    db: AsyncSession = Depends(get_database)
+):
+    """Find the nearest active hospitals, optionally filtered by specialty and emergency services"""
+    return await MatchingService(db).match_hospitals(query)
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.db import get_database
+from app.services.medicalHistoryService import MedicalHistoryService
+from app.schemas.medicalHistorySchema import MedicalHistoryPatch, MedicalHistoryResponse, MedicalHistoryMatch
+from app.dependencies.auth import get_current_user, get_current_patient
+from app.models.user import User
+from app.pagination import Page
+
+router = APIRouter()
+
+@router.get("/me", response_model=MedicalHistoryResponse)
+async def get_my_medical_history(
+    current_user: User = Depends(get_current_patient),
+    db: AsyncSession = Depends(get_database)
+):
+    """Get current patient's medical history"""
+    service = MedicalHistoryService(db)
+    return await service.get(await service.resolve_patient_id(current_user))
+
+@router.patch("/me", response_model=MedicalHistoryResponse)
+async def patch_my_medical_history(
+    patch: MedicalHistoryPatch,
+    current_user: User = Depends(get_current_patient),
+    db: AsyncSession = Depends(get_database)
+):
+    """Apply set/delete/append/remove ops to current patient's medical history"""
+    service = MedicalHistoryService(db)
+    return await service.patch(await service.resolve_patient_id(current_user), patch)
+
+@router.get("/search", response_model=Page[MedicalHistoryMatch])
+async def search_medical_history(
+    allergy: Optional[str] = None,
+    condition: Optional[str] = None,
+    medication: Optional[str] = Query(None, description="Exact name in current_medications"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Find patients by allergy, chronic condition or current medication (patients booked with the caller, or all for admins)"""
+    return await MedicalHistoryService(db).search(current_user, allergy, condition, medication, cursor, limit)
+
+@router.get("/{patient_id}", response_model=MedicalHistoryResponse)
+async def get_medical_history(
+    patient_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Get a patient's medical history"""
+    service = MedicalHistoryService(db)
+    return await service.get(await service.resolve_patient_id(current_user, patient_id))
+
+@router.patch("/{patient_id}", response_model=MedicalHistoryResponse)
+async def patch_medical_history(
+    patch: MedicalHistoryPatch,
+    patient_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database)
+):
+    """Apply set/delete/append/remove ops to a patient's medical history"""
+    service = MedicalHistoryService(db)
+    return await service.patch(await service.resolve_patient_id(current_user, patient_id), patch)
@@ -0,0 +1,193 @@
+import asyncio
+import time as clock
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+from .config import settings
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+@dataclass
+class DoctorSchedule:
+    doctor_id: str
+    hospital_id: str
+    specialization: str
+    weekdays: FrozenSet[int]
+    start: time
+    end: time
+
+    @classmethod
+    def from_doctor(cls, doctor) -> Optional["DoctorSchedule"]:
+        """Build from a Doctor entity or row; None when no working hours are configured"""
+        if not doctor.available_days or doctor.available_hours_start is None or doctor.available_hours_end is None:
+            return None
+        weekdays = frozenset(
+            WEEKDAYS.index(day[:3].lower()) for day in doctor.available_days if day[:3].lower() in WEEKDAYS
+        )
+        return cls(
+            doctor_id=str(doctor.id),
+            hospital_id=str(doctor.hospital_id),
+            specialization=(doctor.specialization or "").lower(),
+            weekdays=weekdays,
+            start=doctor.available_hours_start,
+            end=doctor.available_hours_end,
+        )
+
+class AvailabilityIndex:
+    """Free consultation slots per doctor, kept as one bitmask per (doctor, local day).
+
+    Bit i of a day stands for the slot starting i * slot_minutes after local midnight.
+    Free slots are working-hours bits minus booked bits, so a search over thousands of
+    doctors is a handful of integer operations per doctor and day.
+    """
+
+    def __init__(self, slot_minutes: int, tz: str, max_age_seconds: float):
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.tz = ZoneInfo(tz)
+        self.max_age_seconds = max_age_seconds
+        self._schedules: Dict[str, DoctorSchedule] = {}
+        self._by_specialization: Dict[str, Set[str]] = {}
+        self._booked: Dict[Tuple[str, date], int] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or clock.monotonic() - self.loaded_at > self.max_age_seconds
+
+    async def ensure_fresh(self, loader) -> None:
+        """Reload from `loader()` (awaitable returning schedules and booked datetimes) when stale"""
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                schedules, bookings = await loader()
+                self.replace_all(schedules, bookings)
+
+    def replace_all(self, schedules: Iterable[DoctorSchedule], bookings: Iterable[Tuple[str, datetime]]) -> None:
+        self._schedules, self._by_specialization, self._booked = {}, {}, {}
+        for schedule in schedules:
+            self._add_schedule(schedule)
+        for doctor_id, scheduled_at in bookings:
+            self._set_booked(doctor_id, scheduled_at, True)
+        self.loaded_at = clock.monotonic()
+
+    def _add_schedule(self, schedule: DoctorSchedule) -> None:
+        self._schedules[schedule.doctor_id] = schedule
+        self._by_specialization.setdefault(schedule.specialization, set()).add(schedule.doctor_id)
+
+    def _remove_schedule(self, doctor_id: str) -> None:
+        schedule = self._schedules.pop(doctor_id, None)
+        if schedule is not None:
+            members = self._by_specialization[schedule.specialization]
+            members.discard(doctor_id)
+            if not members:
+                del self._by_specialization[schedule.specialization]
+
+    def invalidate(self) -> None:
+        """Force a reload on next use, after changes too broad to apply one by one"""
+        self.loaded_at = None
+
+    def sync_doctor(self, doctor) -> None:
+        if self.loaded_at is None:
+            return
+        self._remove_schedule(str(doctor.id))
+        schedule = DoctorSchedule.from_doctor(doctor)
+        if schedule is not None and doctor.status == "active":
+            self._add_schedule(schedule)
+
+    def _locate(self, moment: datetime) -> Tuple[date, int]:
+        local = moment.astimezone(self.tz)
+        return local.date(), (local.hour * 60 + local.minute) // self.slot_minutes
+
+    def _slot_start(self, day: date, slot: int) -> datetime:
+        minutes = slot * self.slot_minutes
+        local = datetime.combine(day, time(minutes // 60, minutes % 60), tzinfo=self.tz)
+        return local.astimezone(timezone.utc)
+
+    def _set_booked(self, doctor_id: str, scheduled_at: datetime, booked: bool) -> None:
+        day, slot = self._locate(scheduled_at)
+        key = (doctor_id, day)
+        mask = self._booked.get(key, 0)
+        mask = mask | (1 << slot) if booked else mask & ~(1 << slot)
+        if mask:
+            self._booked[key] = mask
+        else:
+            self._booked.pop(key, None)
+
+    def book(self, doctor_id: str, scheduled_at: datetime) -> None:
+        if self.loaded_at is not None:
+            self._set_booked(doctor_id, scheduled_at, True)
+
+    def release(self, doctor_id: str, scheduled_at: datetime) -> None:
+        if self.loaded_at is not None:
+            self._set_booked(doctor_id, scheduled_at, False)
+
+    def _working_mask(self, schedule: DoctorSchedule, day: date) -> int:
+        if day.weekday() not in schedule.weekdays:
+            return 0
+        first = -(-(schedule.start.hour * 60 + schedule.start.minute) // self.slot_minutes)
+        last = (schedule.end.hour * 60 + schedule.end.minute) // self.slot_minutes  # exclusive
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def in_working_hours(self, doctor_id: str, scheduled_at: datetime) -> Optional[bool]:
+        """None when the doctor has no working hours configured"""
+        schedule = self._schedules.get(doctor_id)
+        if schedule is None:
+            return None
+        day, slot = self._locate(scheduled_at)
+        return bool(self._working_mask(schedule, day) >> slot & 1)
+
+    def search(self, start: datetime, end: datetime, specialization: Optional[str] = None,
+               hospital_id: Optional[str] = None, limit: int = 50) -> List[Tuple[DoctorSchedule, List[datetime]]]:
+        """Doctors with at least one free slot starting in [start, end), with those slots"""
+        if specialization is not None:
+            doctor_ids = self._by_specialization.get(specialization.lower(), ())
+        else:
+            doctor_ids = self._schedules.keys()
+
+        # Window mask per local day touched by [start, end)
+        first_day, first_slot = self._locate(start)
+        last_moment = end - timedelta(microseconds=1)
+        last_day, last_slot = self._locate(last_moment)
+        if self._slot_start(first_day, first_slot) < start:
+            first_slot += 1  # a slot already under way is not bookable
+        full_day = (1 << self.slots_per_day) - 1
+        windows = []
+        day = first_day
+        while day <= last_day:
+            mask = full_day
+            if day == first_day:
+                mask &= ~((1 << first_slot) - 1)
+            if day == last_day:
+                mask &= (1 << (last_slot + 1)) - 1
+            windows.append((day, mask))
+            day += timedelta(days=1)
+
+        results = []
+        for doctor_id in doctor_ids:
+            schedule = self._schedules[doctor_id]
+            if hospital_id is not None and schedule.hospital_id != hospital_id:
+                continue
+            slots = []
+            for day, window in windows:
+                free = self._working_mask(schedule, day) & window & ~self._booked.get((doctor_id, day), 0)
+                while free:
+                    slot = (free & -free).bit_length() - 1
+                    slots.append(self._slot_start(day, slot))
+                    free &= free - 1
+            if slots:
+                results.append((schedule, slots))
+                if len(results) >= limit:
+                    break
+        return results
+
+availability_index = AvailabilityIndex(
+    slot_minutes=settings.CONSULTATION_SLOT_MINUTES,
+    tz=settings.CLINIC_TIMEZONE,
+    max_age_seconds=settings.AVAILABILITY_INDEX_REFRESH_SECONDS,
+)
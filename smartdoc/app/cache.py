@@ -0,0 +1,133 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from redis.exceptions import RedisError
+from .config import settings
+from .db.redis import get_redis
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class PrincipalCache:
+    """Two-tier cache of the fields get_current_user needs, keyed by user id.
+
+    The local tier only lives for a few seconds so invalidations issued by other
+    workers (which only reach Redis) are picked up quickly.
+    """
+
+    key_prefix = "principal:"
+    # Bumped by every invalidation. A loader reads it before going to the database and only
+    # stores its result if it is unchanged, so a principal loaded before a concurrent
+    # invalidation never lands in the cache
+    generation_prefix = "principal_generation:"
+    _SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+    def __init__(self, maxsize: int, local_ttl: float, redis_ttl: int):
+        self.local = TTLCache(maxsize, local_ttl)
+        self.redis_ttl = redis_ttl
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "stale_loads": 0,
+                      "redis_errors": 0}
+
+    async def get(self, user_id: str) -> Optional[Dict]:
+        principal = self.local.get(user_id)
+        if principal is not None:
+            self.stats["local_hits"] += 1
+            return principal
+        try:
+            raw = await get_redis().get(self.key_prefix + user_id)
+        except RedisError:
+            self.stats["redis_errors"] += 1
+            raw = None
+        if raw is None:
+            self.stats["misses"] += 1
+            return None
+        principal = json.loads(raw)
+        self.local.set(user_id, principal)
+        self.stats["redis_hits"] += 1
+        return principal
+
+    async def generation(self, user_id: str) -> Optional[str]:
+        """Read before loading a principal and pass to set(); None if Redis is unavailable"""
+        try:
+            return await get_redis().get(self.generation_prefix + user_id) or "0"
+        except RedisError:
+            self.stats["redis_errors"] += 1
+            return None
+
+    async def set(self, user_id: str, principal: Dict, generation: Optional[str]) -> None:
+        if generation is not None:
+            try:
+                stored = await get_redis().eval(
+                    self._SET_IF_CURRENT, 2, self.key_prefix + user_id, self.generation_prefix + user_id,
+                    generation, json.dumps(principal), self.redis_ttl
+                )
+            except RedisError:
+                self.stats["redis_errors"] += 1
+            else:
+                if not stored:
+                    self.stats["stale_loads"] += 1
+                    return
+        self.local.set(user_id, principal)
+
+    async def invalidate(self, *user_ids: str) -> None:
+        if not user_ids:
+            return
+        for user_id in user_ids:
+            self.local.pop(user_id)
+        self.stats["invalidations"] += len(user_ids)
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                pipe.delete(*(self.key_prefix + user_id for user_id in user_ids))
+                for user_id in user_ids:
+                    pipe.incr(self.generation_prefix + user_id)
+                    pipe.expire(self.generation_prefix + user_id, self.redis_ttl)
+                await pipe.execute()
+        except RedisError:
+            self.stats["redis_errors"] += 1
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Serialized /auth/hospitals payload and its ETag
+hospital_registration_cache = TTLCache(maxsize=1, ttl=settings.HOSPITAL_REGISTRATION_CACHE_SECONDS)
@@ -0,0 +1,53 @@
+from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
+from .config import settings
+
+celery_app = Celery(
+    "smartdoc",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    include=[
+        "app.tasks.email",
+        "app.tasks.otp",
+        "app.tasks.imports",
+        "app.tasks.maintenance",
+    ],
+)
+
+celery_app.conf.update(
+    task_ignore_result=True,
+    task_acks_late=True,
+    # One reserved task per worker process so a long import never holds short jobs hostage
+    worker_prefetch_multiplier=1,
+    task_default_queue="default",
+    task_queues=(
+        Queue("default"),
+        Queue("email"),
+        Queue("otp"),
+        Queue("bulk"),
+        Queue("maintenance"),
+    ),
+    task_routes={
+        "app.tasks.email.*": {"queue": "email"},
+        "app.tasks.otp.*": {"queue": "otp"},
+        "app.tasks.imports.*": {"queue": "bulk"},
+        "app.tasks.maintenance.*": {"queue": "maintenance"},
+    },
+    beat_schedule={
+        "deliver-mail-outbox": {
+            "task": "app.tasks.email.deliver_mail_outbox",
+            "schedule": settings.MAIL_DRAIN_INTERVAL_SECONDS,
+        },
+        "trim-mail-dead-letters": {
+            "task": "app.tasks.maintenance.trim_mail_dead_letters",
+            "schedule": crontab(minute=0),
+        },
+        "analyze-hot-tables": {
+            "task": "app.tasks.maintenance.analyze_hot_tables",
+            "schedule": crontab(hour=3, minute=30),
+        },
+    },
+    # Eager mode runs tasks inline in the caller (tests, local development without a worker)
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+)
@@ -3,19 +3,72 @@ from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str 
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT_SECONDS: Optional[float] = 60
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_HEALTH_CHECK_SECONDS: float = 5
+    DB_REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10
+    READ_YOUR_WRITES_SECONDS: int = 15
     SECRET_KEY: str 
     ALGORITHM: str 
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
     REDIS_URL: str 
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 2
     EMAIL_HOST: str 
     EMAIL_PORT: int
     EMAIL_USERNAME: Optional[str] = None
     EMAIL_PASSWORD: Optional[str] = None
+    EMAIL_FROM: Optional[str] = None
+    EMAIL_USE_TLS: bool = True
+    EMAIL_TIMEOUT_SECONDS: float = 30
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_MAX_ATTEMPTS: int = 5
+    MAIL_RETRY_BASE_SECONDS: float = 30
+    MAIL_RETRY_MAX_SECONDS: float = 3600
+    MAIL_DRAIN_INTERVAL_SECONDS: float = 5
+    MAIL_CONSUMER_TIMEOUT_SECONDS: int = 120
+    MAIL_DEAD_LETTER_LIMIT: int = 10000
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    OTP_TTL_SECONDS: int = 300
+    SYNC_MAX_CHANGES: int = 1000
+    SYNC_CLOCK_SKEW_SECONDS: float = 5
+    CONSULTATION_SLOT_MINUTES: int = 30
+    CLINIC_TIMEZONE: str = "UTC"
+    AVAILABILITY_HORIZON_DAYS: int = 14
+    AVAILABILITY_INDEX_REFRESH_SECONDS: float = 60
+    PASSWORD_RESET_URL: str = "http://localhost:8000/reset"
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_PHONE_NUMBER: Optional[str] = None
     HUGGINGFACE_TOKEN: Optional[str] = None
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    BULK_HASH_WORKERS: int = 2
+    DOCTOR_IMPORT_BATCH_SIZE: int = 500
+    DOCTOR_IMPORT_MAX_ROWS: int = 20000
+    DOCTOR_INVITE_TTL_SECONDS: int = 7 * 24 * 3600
+    EXPORT_BATCH_SIZE: int = 1000
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = 5
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    HOSPITAL_INDEX_ENABLED: bool = True
+    HOSPITAL_INDEX_REFRESH_SECONDS: float = 300
+    HOSPITAL_REGISTRATION_CACHE_SECONDS: int = 30
+    METRICS_ENABLED: bool = True
+    SQL_DEBUG_HEADERS: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
     
     class Config:
         env_file = ".env"
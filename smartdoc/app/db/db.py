@@ -1,18 +1,227 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import itertools
+import logging
+import time
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
-from fastapi import HTTPException
+from app.db.redis import get_redis
+from app.security import verify_token
+from fastapi import HTTPException, Request
+from typing import AsyncGenerator, Dict, List, Optional
 
-engine = create_async_engine(settings.DATABASE_URL, pool_size=20, max_overflow=0)
-async_session = sessionmaker(engine, autoCommit=False, autoFlush=False, expire_on_commit=False, bind=engine)
+logger = logging.getLogger(__name__)
+
+# Time spent waiting for a pooled connection (including opening a new one); read by pool_status()
+pool_wait_stats = {"acquisitions": 0, "timeouts": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited; the pool events fire only after the wait"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_stats["acquisitions"] += 1
+            pool_wait_stats["wait_seconds_total"] += waited
+            pool_wait_stats["wait_seconds_max"] = max(pool_wait_stats["wait_seconds_max"], waited)
+
+def connect_args() -> Dict:
+    # Set DB_PREPARED_STATEMENT_CACHE_SIZE=0 behind PgBouncer in transaction mode
+    return {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT_SECONDS,
+    }
+
+def _create_engine(url: str, **options) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args(),
+        **options
+    )
+
+engine = _create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool)
+async_session = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
-from typing import AsyncGenerator
+async def warm_up_pool(connections: int) -> int:
+    """Open `connections` pooled connections up front so the first requests don't pay for the handshakes"""
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return 0
+
+    async def ping():
+        connection = await engine.connect().start()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    # All connections are held until every ping has finished so each one is distinct
+    results = await asyncio.gather(*(ping() for _ in range(connections)), return_exceptions=True)
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    await asyncio.gather(*(connection.close() for connection in opened))
+    if len(opened) < connections:
+        error = next(result for result in results if isinstance(result, BaseException))
+        logger.warning("Database pool warm-up opened %d of %d connections: %s", len(opened), connections, error)
+    return len(opened)
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = _create_engine(url)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+
+class ReplicaPool:
+    """Round-robin over the read replicas that passed the last health check.
+
+    A replica is healthy when it answers and its replay lag is within
+    DB_REPLICA_MAX_LAG_SECONDS; lag counts as zero once everything received has been
+    replayed, so an idle primary doesn't make its replicas look stale.
+    """
+
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    )
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        return healthy[next(self._counter) % len(healthy)] if healthy else None
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as connection:
+                lag = await asyncio.wait_for(connection.scalar(self.LAG_QUERY),
+                                             settings.DB_REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Read replica %s failed its health check: %s", replica.engine.url.host, e)
+            replica.healthy, replica.lag_seconds = False, None
+            return
+        # NULL when the "replica" is not in recovery, i.e. it is a primary
+        replica.lag_seconds = float(lag or 0)
+        replica.healthy = replica.lag_seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+            await self.check_all()
 
-async def get_database() -> AsyncGenerator[AsyncSession, None]:
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check_all()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await asyncio.gather(*(replica.engine.dispose() for replica in self.replicas))
+
+    def status(self) -> List[Dict]:
+        return [{
+            "host": replica.engine.url.host,
+            "healthy": replica.healthy,
+            "lag_seconds": replica.lag_seconds,
+            "checked_out": replica.engine.pool.checkedout(),
+        } for replica in self.replicas]
+
+replica_pool = ReplicaPool([url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()])
+
+def read_session() -> async_sessionmaker:
+    """Session factory for reads that tolerate replication lag (exports, reports)"""
+    replica = replica_pool.choose()
+    return replica.session if replica else async_session
+
+def pool_status() -> Dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        **pool_wait_stats,
+        "replicas": replica_pool.status(),
+    }
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    session.info["committed"] = True
+
+def _request_user_id(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return verify_token(token) if scheme.lower() == "bearer" and token else None
+
+def _recent_write_key(user_id: str) -> str:
+    return f"recent_write:{user_id}"
+
+async def _remember_write(request: Request) -> None:
+    user_id = _request_user_id(request)
+    if user_id is None:
+        return
     try:
-        async with async_session() as session:
-            yield session
+        await get_redis().set(_recent_write_key(user_id), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
\ No newline at end of file
+        # The write itself succeeded; the user may briefly read their own stale data
+        logger.warning("Could not record recent write for %s: %s", user_id, e)
+
+async def _has_recent_write(request: Request) -> bool:
+    user_id = _request_user_id(request)
+    if user_id is None:
+        return False
+    try:
+        return bool(await get_redis().exists(_recent_write_key(user_id)))
+    except Exception:
+        # Unknown, so play safe and read from the primary
+        return True
+
+async def get_database(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with async_session() as session:
+        try:
+            yield session
+        except PoolTimeoutError:
+            raise HTTPException(status_code=503, detail="Database is busy, please retry",
+                                headers={"Retry-After": "1"})
+        # Pin the user's reads to the primary until the replicas have caught up with this write
+        if replica_pool.replicas and session.info.get("committed"):
+            await _remember_write(request)
+
+async def get_read_database(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """get_database for read-only endpoints: a healthy replica unless the user wrote recently"""
+    replica = replica_pool.choose()
+    if replica is not None and await _has_recent_write(request):
+        replica = None
+    async with (replica.session if replica else async_session)() as session:
+        try:
+            yield session
+        except PoolTimeoutError:
+            raise HTTPException(status_code=503, detail="Database is busy, please retry",
+                                headers={"Retry-After": "1"})
+        except DBAPIError as e:
+            if replica is not None and e.connection_invalidated:
+                # Stop routing here until the next health check says otherwise
+                replica.healthy = False
+            raise
@@ -0,0 +1,58 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+import redis.asyncio as aioredis
+from app.config import settings
+
+redis_pool: Optional[aioredis.BlockingConnectionPool] = None
+redis_client: Optional[aioredis.Redis] = None
+# Set while code runs on an event loop of its own (Celery tasks), which cannot share redis_client
+_scoped_client: ContextVar[Optional[aioredis.Redis]] = ContextVar("scoped_redis_client", default=None)
+
+def init_redis() -> aioredis.Redis:
+    global redis_pool, redis_client
+    if redis_client is None:
+        # Blocking pool: callers wait up to REDIS_POOL_TIMEOUT_SECONDS for a free connection instead of erroring
+        redis_pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=30,
+            decode_responses=True,
+        )
+        redis_client = aioredis.Redis(connection_pool=redis_pool)
+    return redis_client
+
+async def close_redis() -> None:
+    global redis_pool, redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        await redis_pool.disconnect()
+        redis_pool, redis_client = None, None
+
+def _new_client() -> aioredis.Redis:
+    return aioredis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        decode_responses=True,
+    )
+
+@asynccontextmanager
+async def scoped_redis() -> AsyncIterator[aioredis.Redis]:
+    """A private client that get_redis() returns inside the block; closed on exit, leaving redis_client alone"""
+    client = _new_client()
+    token = _scoped_client.set(client)
+    try:
+        yield client
+    finally:
+        _scoped_client.reset(token)
+        await client.aclose()
+
+def get_redis() -> aioredis.Redis:
+    scoped = _scoped_client.get()
+    if scoped is not None:
+        return scoped
+    return redis_client if redis_client is not None else init_redis()
@@ -1,3 +1,5 @@
+import uuid
+from typing import Dict, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,11 +9,35 @@ from app.repositories.userRepository import UserRepository
 from app.repositories.doctorRepository import DoctorRepository
 from app.repositories.hospitalRepository import HospitalRepository
 from app.models.user import User
-from app.models import UserRole
+from app.models import UserRole, UserStatus
 from app.models.__init__ import SubscriptionStatus
+from app.cache import principal_cache
 
 security = HTTPBearer()
 
+async def _load_principal(db: AsyncSession, user_id: str) -> Optional[Dict]:
+    user = await UserRepository(db).get_by_id(user_id)
+    if user is None:
+        return None
+    
+    # None when the subscription does not apply (non-doctors, doctors without a hospital)
+    hospital_subscription_active = None
+    if user.role == UserRole.DOCTOR:
+        doctor = await DoctorRepository(db).get_by_user_id(user_id)
+        if doctor:
+            hospital = await HospitalRepository(db).get_by_id(doctor.hospital_id)
+            if hospital:
+                hospital_subscription_active = hospital.subscription_status == SubscriptionStatus.ACTIVE
+    
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "role": user.role.value,
+        "status": user.status.value if user.status else None,
+        "is_verified": bool(user.is_verified),
+        "hospital_subscription_active": hospital_subscription_active,
+    }
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_database)
@@ -22,21 +48,29 @@ async def get_current_user(
     if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        generation = await principal_cache.generation(user_id)
+        principal = await _load_principal(db, user_id)
+        if principal is None:
+            raise HTTPException(status_code=401, detail="User not found or inactive")
+        await principal_cache.set(user_id, principal, generation)
     
-    if user is None or user.status != "active":
+    if principal["status"] != UserStatus.ACTIVE:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     
     # Check hospital subscription for doctors
-    if user.role == UserRole.DOCTOR:
-        doctor = await DoctorRepository(db).get_by_user_id(user_id)
-        if doctor:
-            hospital = await HospitalRepository(db).get_by_id(doctor.hospital_id)
-            if hospital and hospital.subscription_status != SubscriptionStatus.ACTIVE:
-                raise HTTPException(status_code=403, detail="Hospital subscription is not active")
+    if principal["role"] == UserRole.DOCTOR and principal["hospital_subscription_active"] is False:
+        raise HTTPException(status_code=403, detail="Hospital subscription is not active")
     
-    return user
+    # Detached user carrying only the cached principal fields
+    return User(
+        id=uuid.UUID(principal["id"]),
+        email=principal["email"],
+        role=UserRole(principal["role"]),
+        status=UserStatus(principal["status"]) if principal["status"] else None,
+        is_verified=principal["is_verified"],
+    )
 
 async def get_current_admin(
     current_user: User = Depends(get_current_user)
@@ -52,6 +86,13 @@ async def get_current_hospital(
         raise HTTPException(status_code=403, detail="Hospital access required")
     return current_user
 
+async def get_current_hospital_admin(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    if current_user.role not in (UserRole.HOSPITAL, UserRole.ADMIN):
+        raise HTTPException(status_code=403, detail="Hospital or admin access required")
+    return current_user
+
 async def get_current_doctor(
     current_user: User = Depends(get_current_user)
 ) -> User:
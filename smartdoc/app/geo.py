@@ -0,0 +1,245 @@
+import asyncio
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+from .config import settings
+from .models import UserStatus
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a circle.
+    
+    A box crossing the antimeridian has min_lon > max_lon and covers both ends; a circle
+    containing a pole covers every longitude.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    if abs(lat) + dlat >= 90:
+        return min_lat, max_lat, -180.0, 180.0
+    # Widest longitude span of the circle, reached at latitude asin(sin(lat) / cos(angular radius))
+    sin_dlon = math.sin(math.radians(dlat)) / math.cos(math.radians(lat))
+    if sin_dlon >= 1:
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(math.asin(sin_dlon))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, max_lat, min_lon, max_lon
+
+@dataclass
+class IndexedHospital:
+    id: str
+    name: str
+    city: Optional[str]
+    latitude: float
+    longitude: float
+    specialties: FrozenSet[str]
+    emergency_services: bool
+
+    @classmethod
+    def from_hospital(cls, hospital) -> "IndexedHospital":
+        """Build from a Hospital entity or a row carrying the same column names"""
+        return cls(
+            id=str(hospital.id),
+            name=hospital.name,
+            city=hospital.city,
+            latitude=float(hospital.latitude),
+            longitude=float(hospital.longitude),
+            specialties=frozenset(s.lower() for s in hospital.specialties or ()),
+            emergency_services=bool(hospital.emergency_services),
+        )
+
+class HospitalSpatialIndex:
+    """Fixed-size lat/lon grid over active hospitals supporting filtered k-nearest lookups.
+
+    The search grows a window of cells around the query cell until nothing outside it can
+    be closer than the current k-th match. Cells narrow towards the poles, so the window
+    widens in columns by 1 / cos(latitude) to cover about the same distance both ways, and
+    each grid row keeps its occupied columns so wide, mostly empty spans cost no more than
+    their hospitals. Hospitals are also grouped by specialty so that rare specialties are
+    answered by scanning their (small) member set instead of walking non-matching cells.
+    """
+
+    # Specialty groups up to this size are scanned directly
+    small_group_size = 2000
+
+    def __init__(self, cell_degrees: float = 0.25, max_age_seconds: float = 300):
+        self.cell_degrees = cell_degrees
+        self.max_age_seconds = max_age_seconds
+        self.rows = math.ceil(180 / cell_degrees)
+        self.cols = math.ceil(360 / cell_degrees)
+        self._entries: Dict[str, IndexedHospital] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._entry_cells: Dict[str, Tuple[int, int]] = {}
+        self._row_columns: Dict[int, Set[int]] = {}
+        self._by_specialty: Dict[str, Set[str]] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age_seconds
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        row = min(self.rows - 1, int((lat + 90) // self.cell_degrees))
+        col = int((lon + 180) // self.cell_degrees) % self.cols
+        return row, col
+
+    def _add(self, entry: IndexedHospital) -> None:
+        cell = self._cell(entry.latitude, entry.longitude)
+        self._entries[entry.id] = entry
+        self._entry_cells[entry.id] = cell
+        self._cells.setdefault(cell, set()).add(entry.id)
+        self._row_columns.setdefault(cell[0], set()).add(cell[1])
+        for specialty in entry.specialties:
+            self._by_specialty.setdefault(specialty, set()).add(entry.id)
+
+    def remove(self, hospital_id: str) -> None:
+        entry = self._entries.pop(hospital_id, None)
+        if entry is not None:
+            for specialty in entry.specialties:
+                members = self._by_specialty[specialty]
+                members.discard(hospital_id)
+                if not members:
+                    del self._by_specialty[specialty]
+        cell = self._entry_cells.pop(hospital_id, None)
+        if cell is not None:
+            members = self._cells[cell]
+            members.discard(hospital_id)
+            if not members:
+                del self._cells[cell]
+                columns = self._row_columns[cell[0]]
+                columns.discard(cell[1])
+                if not columns:
+                    del self._row_columns[cell[0]]
+
+    def sync_hospital(self, hospital) -> None:
+        """Reflect a created or updated Hospital without waiting for the next full reload"""
+        if self.loaded_at is None:
+            # Nothing to keep in sync until the first full load
+            return
+        self.remove(str(hospital.id))
+        if hospital.status == UserStatus.ACTIVE and hospital.latitude is not None and hospital.longitude is not None:
+            self._add(IndexedHospital.from_hospital(hospital))
+
+    def replace_all(self, entries: List[IndexedHospital]) -> None:
+        self._entries, self._cells, self._entry_cells, self._row_columns, self._by_specialty = {}, {}, {}, {}, {}
+        for entry in entries:
+            self._add(entry)
+        self.loaded_at = time.monotonic()
+
+    async def ensure_fresh(self, loader: Callable) -> None:
+        """Reload from `loader()` (an awaitable returning all entries) when the index is stale"""
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                self.replace_all(await loader())
+
+    def _scan_row(self, row: int, col: int, start: int, count: int, visit: Callable[[str], None]) -> int:
+        """Visit the `count` cells of `row` from column col + start eastwards; returns the work done"""
+        occupied = self._row_columns.get(row)
+        if not occupied or count <= 0:
+            return 1
+        if count < len(occupied):
+            for offset in range(start, start + count):
+                for hospital_id in self._cells.get((row, (col + offset) % self.cols), ()):
+                    visit(hospital_id)
+            return count
+        for column in occupied:
+            if (column - col - start) % self.cols < count:
+                for hospital_id in self._cells[(row, column)]:
+                    visit(hospital_id)
+        return len(occupied)
+
+    def nearest(self, lat: float, lon: float, k: int,
+                predicate: Optional[Callable[[IndexedHospital], bool]] = None,
+                max_distance_km: Optional[float] = None,
+                specialty: Optional[str] = None) -> List[Tuple[float, IndexedHospital]]:
+        """k nearest hospitals as (distance_km, hospital), closest first; `specialty` must be lowercase"""
+        best: List[Tuple[float, str]] = []  # max-heap on distance via negation
+
+        def consider(hospital_id: str) -> None:
+            entry = self._entries[hospital_id]
+            if specialty is not None and specialty not in entry.specialties:
+                return
+            if predicate is not None and not predicate(entry):
+                return
+            distance = haversine_km(lat, lon, entry.latitude, entry.longitude)
+            if max_distance_km is not None and distance > max_distance_km:
+                return
+            if len(best) < k:
+                heapq.heappush(best, (-distance, hospital_id))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, hospital_id))
+
+        group = self._by_specialty.get(specialty, ()) if specialty is not None else None
+        if group is not None and len(group) <= self.small_group_size:
+            for hospital_id in group:
+                consider(hospital_id)
+            return self._sorted(best)
+
+        row, col = self._cell(lat, lon)
+        work = 0
+        radius, half_width, full_width = 0, -1, False
+        while True:
+            # The window spans rows row ± radius and columns col ± width
+            previous_width, previous_full = half_width, full_width
+            far_lat = min(90.0, abs(lat) + (radius + 1) * self.cell_degrees)
+            cos_far = math.cos(math.radians(far_lat))
+            half_width = self.cols if cos_far * self.cols <= radius else math.ceil(radius / cos_far)
+            full_width = 2 * half_width + 1 >= self.cols
+            for r in range(max(0, row - radius), min(self.rows - 1, row + radius) + 1):
+                if abs(r - row) == radius:
+                    if full_width:
+                        work += self._scan_row(r, col, 0, self.cols, consider)
+                    else:
+                        work += self._scan_row(r, col, -half_width, 2 * half_width + 1, consider)
+                elif not previous_full and half_width > previous_width:
+                    if full_width:
+                        work += self._scan_row(r, col, previous_width + 1, self.cols - 2 * previous_width - 1, consider)
+                    else:
+                        work += self._scan_row(r, col, previous_width + 1, half_width - previous_width, consider)
+                        work += self._scan_row(r, col, -half_width, half_width - previous_width, consider)
+            
+            # Lower bound on the distance to any cell outside the window
+            bound = math.inf
+            if row - radius > 0 or row + radius < self.rows - 1:
+                bound = radius * self.cell_degrees * KM_PER_DEGREE
+            if not full_width:
+                dlon = math.radians(min(180.0, half_width * self.cell_degrees))
+                bound = min(bound, 2 * EARTH_RADIUS_KM * math.asin(min(1.0, cos_far * math.sin(dlon / 2))))
+            if bound == math.inf or (len(best) == k and bound > -best[0][0]):
+                break
+            if max_distance_km is not None and bound > max_distance_km:
+                break
+            if work > len(self._cells):
+                # Sparse matches: scanning every entry is cheaper than widening the window further
+                best.clear()
+                for hospital_id in self._entries:
+                    consider(hospital_id)
+                break
+            radius += 1
+
+        return self._sorted(best)
+
+    def _sorted(self, best: List[Tuple[float, str]]) -> List[Tuple[float, IndexedHospital]]:
+        return [(-neg_distance, self._entries[hospital_id]) for neg_distance, hospital_id in sorted(best, reverse=True)]
+
+hospital_index = HospitalSpatialIndex(max_age_seconds=settings.HOSPITAL_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,148 @@
+import json
+import logging
+import smtplib
+import time
+import uuid
+from email.mime.text import MIMEText
+from typing import Dict, Optional
+from .config import settings
+from .db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_KEY = "mail:outbox"
+RETRY_KEY = "mail:retry"
+DEAD_LETTER_KEY = "mail:dead"
+# Each worker process moves messages into its own processing list while sending them and
+# keeps a heartbeat key alive; lists whose heartbeat has expired belong to dead workers
+CONSUMERS_KEY = "mail:consumers"
+PROCESSING_KEY = "mail:processing:{}"
+HEARTBEAT_KEY = "mail:heartbeat:{}"
+PROMOTE_BATCH_SIZE = 1000
+
+# ZRANGEBYSCORE + ZREM + RPUSH in one step, so two workers never requeue the same retry
+_PROMOTE_DUE_RETRIES = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    redis.call('RPUSH', KEYS[2], unpack(due))
+end
+return #due
+"""
+
+async def enqueue_email(to: str, subject: str, body: str) -> str:
+    """Queue a message for the mail worker and return immediately"""
+    message_id = str(uuid.uuid4())
+    message = {"id": message_id, "to": to, "subject": subject, "body": body, "attempts": 0}
+    await get_redis().rpush(OUTBOX_KEY, json.dumps(message))
+    return message_id
+
+class SMTPConnection:
+    """A single SMTP session reused across messages; reconnects when the server drops it"""
+
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT, timeout=settings.EMAIL_TIMEOUT_SECONDS)
+        if settings.EMAIL_USE_TLS:
+            server.starttls()
+        if settings.EMAIL_USERNAME:
+            server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
+        return server
+
+    def send(self, message: MIMEText) -> None:
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self._server = self._connect()
+            self._server.send_message(message)
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except smtplib.SMTPException:
+                pass
+            self._server = None
+
+def _build_message(message: Dict) -> MIMEText:
+    mime = MIMEText(message["body"])
+    mime["Subject"] = message["subject"]
+    mime["From"] = settings.EMAIL_FROM or settings.EMAIL_USERNAME
+    mime["To"] = message["to"]
+    mime["Message-ID"] = f"<{message['id']}@smartdoc>"
+    return mime
+
+def _retry_delay(attempts: int) -> float:
+    return min(settings.MAIL_RETRY_MAX_SECONDS, settings.MAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+def promote_due_retries(redis_client) -> int:
+    """Move retries whose backoff has elapsed back onto the outbox"""
+    promoted = 0
+    while True:
+        moved = redis_client.eval(_PROMOTE_DUE_RETRIES, 2, RETRY_KEY, OUTBOX_KEY, time.time(), PROMOTE_BATCH_SIZE)
+        promoted += moved
+        if moved < PROMOTE_BATCH_SIZE:
+            return promoted
+
+def _requeue(redis_client, processing_key: str) -> int:
+    # LMOVE from the right puts the oldest in-flight message back at the head of the outbox
+    requeued = 0
+    while redis_client.lmove(processing_key, OUTBOX_KEY, "RIGHT", "LEFT") is not None:
+        requeued += 1
+    return requeued
+
+def recover_abandoned(redis_client, consumer: str) -> int:
+    """Requeue messages left in flight by this consumer's previous run or by workers that died"""
+    recovered = _requeue(redis_client, PROCESSING_KEY.format(consumer))
+    for other in redis_client.smembers(CONSUMERS_KEY):
+        if other != consumer and not redis_client.exists(HEARTBEAT_KEY.format(other)):
+            recovered += _requeue(redis_client, PROCESSING_KEY.format(other))
+            redis_client.srem(CONSUMERS_KEY, other)
+    if recovered:
+        logger.warning("Requeued %s in-flight mail messages", recovered)
+    return recovered
+
+def deliver_outbox(redis_client, connection: SMTPConnection, batch_size: int, consumer: str) -> Dict[str, int]:
+    """Send up to `batch_size` queued messages over `connection` (sync; runs in the mail worker).
+
+    A message stays in the consumer's processing list until it has been sent, retried or
+    dead-lettered, so a worker that dies mid-batch loses nothing: the next run requeues it.
+    """
+    stats = {"sent": 0, "retried": 0, "dead": 0}
+    processing_key = PROCESSING_KEY.format(consumer)
+    heartbeat_key = HEARTBEAT_KEY.format(consumer)
+    redis_client.sadd(CONSUMERS_KEY, consumer)
+    redis_client.set(heartbeat_key, 1, ex=settings.MAIL_CONSUMER_TIMEOUT_SECONDS)
+    recover_abandoned(redis_client, consumer)
+    promote_due_retries(redis_client)
+    
+    for _ in range(batch_size):
+        raw = redis_client.lmove(OUTBOX_KEY, processing_key, "LEFT", "RIGHT")
+        if raw is None:
+            break
+        redis_client.set(heartbeat_key, 1, ex=settings.MAIL_CONSUMER_TIMEOUT_SECONDS)
+        message = json.loads(raw)
+        pipe = redis_client.pipeline()
+        try:
+            connection.send(_build_message(message))
+            stats["sent"] += 1
+        except (smtplib.SMTPException, OSError) as e:
+            # Drop the session so the next message starts from a fresh connection
+            connection.close()
+            message["attempts"] += 1
+            message["last_error"] = str(e)
+            if message["attempts"] >= settings.MAIL_MAX_ATTEMPTS:
+                logger.error("Dead-lettering mail %s after %s attempts: %s", message["id"], message["attempts"], e)
+                pipe.rpush(DEAD_LETTER_KEY, json.dumps(message))
+                stats["dead"] += 1
+            else:
+                pipe.zadd(RETRY_KEY, {json.dumps(message): time.time() + _retry_delay(message["attempts"])})
+                stats["retried"] += 1
+        # Acknowledge: drop the in-flight copy in the same MULTI as any retry or dead letter
+        pipe.lrem(processing_key, 1, raw)
+        pipe.execute()
+    return stats
@@ -0,0 +1,240 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .cache import principal_cache
+from .db.db import pool_status
+
+# Prometheus text exposition (format 0.0.4) without the client library: the app runs
+# as a single process per container, so plain dicts behind the event loop are enough.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Labels, Sequence[str], float]]:
+        """(name suffix, label values, label names, value) for each exposed series"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, names, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield "_total", labels, self.labelnames, value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield "", labels, self.labelnames, value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self.values: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", labels + (_format_value(bound),), names, cumulative
+            yield "_sum", labels, self.labelnames, total
+            yield "_count", labels, self.labelnames, cumulative
+
+class CallbackMetric(Metric):
+    """Counter or gauge read at scrape time from state that other modules already keep"""
+
+    def __init__(self, name: str, description: str, kind: str, read: Callable[[], Dict[Labels, float]],
+                 labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self.kind = kind
+        self.read = read
+
+    def samples(self):
+        suffix = "_total" if self.kind == "counter" else ""
+        for labels, value in self.read().items():
+            yield suffix, labels, self.labelnames, value
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "smartdoc_http_requests", "HTTP requests by route template and status", ("method", "route", "status")))
+http_latency = registry.register(Histogram(
+    "smartdoc_http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+http_in_flight = registry.register(Gauge(
+    "smartdoc_http_requests_in_flight", "HTTP requests currently being served"))
+db_statements = registry.register(Counter(
+    "smartdoc_db_statements", "SQL statements executed, by route (empty outside requests)", ("route",)))
+db_statements_per_request = registry.register(Histogram(
+    "smartdoc_db_statements_per_request", "SQL statements per request; a high count on a route hints at N+1 loading",
+    ("route",), STATEMENT_BUCKETS))
+db_time_per_request = registry.register(Histogram(
+    "smartdoc_db_time_per_request_seconds", "Time spent executing SQL per request", ("route",)))
+
+_POOL_STATES = ("checked_out", "checked_in", "overflow")
+
+registry.register(CallbackMetric(
+    "smartdoc_db_pool_connections", "Primary pool connections by state", "gauge",
+    lambda: {(state,): pool_status()[state] for state in _POOL_STATES}, ("state",)))
+registry.register(CallbackMetric(
+    "smartdoc_db_pool_size", "Configured primary pool size (excluding overflow)", "gauge",
+    lambda: {(): pool_status()["size"]}))
+registry.register(CallbackMetric(
+    "smartdoc_db_pool_checkouts", "Primary pool checkouts, including ones that timed out", "counter",
+    lambda: {(): pool_status()["acquisitions"]}))
+registry.register(CallbackMetric(
+    "smartdoc_db_pool_timeouts", "Primary pool checkouts that hit DB_POOL_TIMEOUT_SECONDS", "counter",
+    lambda: {(): pool_status()["timeouts"]}))
+registry.register(CallbackMetric(
+    "smartdoc_db_pool_wait_seconds", "Time spent waiting for primary pool connections", "counter",
+    lambda: {(): pool_status()["wait_seconds_total"]}))
+registry.register(CallbackMetric(
+    "smartdoc_db_replica_healthy", "1 when the read replica passed its last health check", "gauge",
+    lambda: {(replica["host"],): int(replica["healthy"]) for replica in pool_status()["replicas"]}, ("host",)))
+registry.register(CallbackMetric(
+    "smartdoc_principal_cache_events", "Principal cache lookups and maintenance by outcome", "counter",
+    lambda: {(outcome,): count for outcome, count in principal_cache.stats.items()}, ("outcome",)))
+registry.register(CallbackMetric(
+    "smartdoc_principal_cache_local_entries", "Principals held in the in-process tier", "gauge",
+    lambda: {(): len(principal_cache.local)}))
+
+class RequestDatabaseStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+# Set by MetricsMiddleware for the duration of each request; the engine hooks add to it
+request_database_stats: ContextVar[Optional[RequestDatabaseStats]] = ContextVar("request_database_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+    stats = request_database_stats.get()
+    if stats is None:
+        db_statements.inc(("",))
+        return
+    stats.statements += 1
+    stats.seconds += elapsed
+
+def _route_template(scope) -> str:
+    # Templates, not raw paths, keep the label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead) recording per-route metrics"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestDatabaseStats()
+        token = request_database_stats.set(stats)
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            request_database_stats.reset(token)
+            route = _route_template(scope)
+            method = scope["method"]
+            http_requests.inc((method, route, str(status)))
+            http_latency.observe((method, route), elapsed)
+            if stats.statements:
+                db_statements.inc((route,), stats.statements)
+                db_statements_per_request.observe((route,), stats.statements)
+                db_time_per_request.observe((route,), stats.seconds)
+
+def render_metrics() -> str:
+    return registry.render()
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from enum import Enum
 import uuid
 from .__init__ import Gender, UserStatus
@@ -11,6 +11,14 @@ from ..db.db import Base
 
 class Doctor(Base):
     __tablename__ = "doctors"
+    __table_args__ = (
+        Index("ix_doctors_last_name_id", "last_name", "id"),
+        Index("ix_doctors_hospital_id_last_name_id", "hospital_id", "last_name", "id"),
+        Index("ix_doctors_specialization_last_name_id", "specialization", "last_name", "id"),
+        Index("ix_doctors_hospital_id_specialization_last_name_id", "hospital_id", "specialization", "last_name", "id"),
+        Index("ix_doctors_last_name_lower_pattern", text("lower(last_name) text_pattern_ops")),
+        Index("ix_doctors_first_name_lower_pattern", text("lower(first_name) text_pattern_ops")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
@@ -27,14 +35,16 @@ class Doctor(Base):
     # certifications = Column(ARRAY(String))
     # languages_spoken = Column(ARRAY(String))
     # consultation_fee = Column(DECIMAL(10, 2))
-    # available_days = Column(ARRAY(String))
-    # available_hours_start = Column(Time)
-    # available_hours_end = Column(Time)
+    available_days = Column(ARRAY(String))
+    available_hours_start = Column(Time)
+    available_hours_end = Column(Time)
     bio = Column(Text)
     # profile_image_url = Column(String(500))
     status = Column(SQLEnum(UserStatus), default=UserStatus.ACTIVE)  # Renamed is_accepting_patients to status
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    
+    __mapper_args__ = {"eager_defaults": True}
     
     # Relationships
     user = relationship("User", back_populates="doctor")
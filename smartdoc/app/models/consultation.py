@@ -1,8 +1,8 @@
-from sqlalchemy import CheckConstraint, Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY
+from sqlalchemy import CheckConstraint, Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from enum import Enum
 import uuid
 from .__init__ import ConsultationType, ConsultationStatus
@@ -10,6 +10,19 @@ from ..db.db import Base
 
 class Consultation(Base):
     __tablename__ = "consultations"
+    __table_args__ = (
+        Index("ix_consultations_patient_id_updated_at", "patient_id", "updated_at"),
+        Index("ix_consultations_doctor_id_updated_at", "doctor_id", "updated_at"),
+        Index("ix_consultations_doctor_id_scheduled_at", "doctor_id", "scheduled_at"),
+        # One live booking per doctor slot; cancelled rows free the slot again
+        Index(
+            "uq_consultations_doctor_slot",
+            "doctor_id",
+            "scheduled_at",
+            unique=True,
+            postgresql_where=text("status <> 'CANCELLED'"),
+        ),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("patients.id"), nullable=False)
     doctor_id = Column(UUID(as_uuid=True), ForeignKey("doctors.id"), nullable=False)
@@ -28,7 +41,10 @@ class Consultation(Base):
     rating = Column(Integer, CheckConstraint('rating >= 1 AND rating <= 5'))
     patient_feedback = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Offline sync row version
+    
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
 
     
     # Relationships
@@ -1,15 +1,25 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from enum import Enum
 import uuid
-from .__init__ import UserStatus
+from .__init__ import UserStatus, SubscriptionStatus
 from ..db.db import Base
 
 class Hospital(Base):
     __tablename__ = "hospitals"
+    __table_args__ = (
+        Index("ix_hospitals_name_id", "name", "id"),
+        Index("ix_hospitals_latitude_longitude", "latitude", "longitude"),
+        Index(
+            "ix_hospitals_registration_name",
+            "name",
+            "id",
+            postgresql_where=text("status = 'ACTIVE' AND subscription_status = 'ACTIVE'"),
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
@@ -31,9 +41,12 @@ class Hospital(Base):
     founded_year = Column(Integer)
     accreditation = Column(String(255))
     status = Column(SQLEnum(UserStatus), default=UserStatus.ACTIVE)
-    # subscription_status = Column(SQLEnum(SubscriptionStatus), default=SubscriptionStatus.ACTIVE)  # New
+    subscription_status = Column(SQLEnum(SubscriptionStatus), default=SubscriptionStatus.ACTIVE,
+                                 server_default=SubscriptionStatus.ACTIVE.name)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    
+    __mapper_args__ = {"eager_defaults": True}
     
     # Relationships
     user = relationship("User", back_populates="hospital")
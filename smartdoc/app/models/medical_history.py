@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -10,6 +10,19 @@ from ..db.db import Base
 
 class MedicalHistory(Base):
     __tablename__ = "medical_history"
+    __table_args__ = (
+        Index("ix_medical_history_patient_id_updated_at", "patient_id", "updated_at"),
+        Index("uq_medical_history_patient_id", "patient_id", unique=True),
+        # GIN indexes serve the @> containment lookups behind /medical-history/search
+        Index("ix_medical_history_allergies", "allergies", postgresql_using="gin"),
+        Index("ix_medical_history_chronic_conditions", "chronic_conditions", postgresql_using="gin"),
+        Index(
+            "ix_medical_history_current_medications",
+            "current_medications",
+            postgresql_using="gin",
+            postgresql_ops={"current_medications": "jsonb_path_ops"},
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     patient_id = Column(UUID(as_uuid=True), ForeignKey("patients.id"), nullable=False)
@@ -32,7 +45,10 @@ class MedicalHistory(Base):
     vaccination_records = Column(JSONB)
     other_medical_notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Offline sync row version
+    
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
     
     # Relationships
     patient = relationship("Patient", back_populates="medical_history")
\ No newline at end of file
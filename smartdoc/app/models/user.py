@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, DECIMAL, Date, Time, Enum as SQLEnum, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -10,6 +10,9 @@ from ..db.db import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -18,10 +21,18 @@ class User(Base):
     status = Column(SQLEnum(UserStatus), default=UserStatus.ACTIVE) 
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     last_login = Column(DateTime(timezone=True))
     
+    # Server-generated columns come back via RETURNING (every model sets eager_defaults), so
+    # writes need no refresh() round trip
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     hospital = relationship("Hospital", back_populates="user", uselist=False)
     doctor = relationship("Doctor", back_populates="user", uselist=False)
-    patient = relationship("Patient", back_populates="user", uselist=False)
\ No newline at end of file
+    patient = relationship("Patient", back_populates="user", uselist=False)
+    
+    @property
+    def is_active(self) -> bool:
+        return self.status == UserStatus.ACTIVE
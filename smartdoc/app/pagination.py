@@ -0,0 +1,89 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import settings
+
+T = TypeVar("T")
+
+_SIGNATURE_BYTES = 16
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+def _signature(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    return value
+
+def _load_value(value: Any, column) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return value
+
+def _sort_key(columns: Sequence) -> List[str]:
+    return [str(column) for column in columns]
+
+def encode_cursor(values: Sequence[Any], endpoint: str, columns: Sequence) -> str:
+    """Signed cursor for `values`, valid only for the listing `endpoint` sorted by `columns`"""
+    values = [_dump_value(v) for v in values]
+    payload = json.dumps([endpoint, _sort_key(columns), values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(_signature(payload) + payload).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str, endpoint: str, columns: Sequence) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        signature, payload = raw[:_SIGNATURE_BYTES], raw[_SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, _signature(payload)):
+            raise ValueError("bad signature")
+        cursor_endpoint, sort_key, values = json.loads(payload)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    # A genuine cursor replayed against another listing would seek the wrong columns
+    if cursor_endpoint != endpoint or sort_key != _sort_key(columns) or len(values) != len(columns):
+        raise HTTPException(status_code=400, detail="Pagination cursor was issued for a different listing")
+    try:
+        return [_load_value(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+async def fetch_page(db: AsyncSession, endpoint: str, query: Select, order_by: Sequence,
+                     cursor: Optional[str] = None, limit: int = 100, scalars: bool = True) -> Tuple[List[Any], Optional[str]]:
+    """Run `query` as a keyset page ordered by `order_by` (which must end in a unique column).
+    Cursors are bound to `endpoint` and the sort order, so one listing's cursor is rejected by another."""
+    if cursor:
+        query = query.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, endpoint, order_by)))
+    result = await db.execute(query.order_by(*order_by).limit(limit + 1))
+    rows = result.scalars().all() if scalars else result.all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by], endpoint, order_by)
+    return rows, next_cursor
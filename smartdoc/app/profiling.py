@@ -0,0 +1,148 @@
+import functools
+import inspect
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Statement text with placeholders and expanded IN lists collapsed, so loop iterations compare equal"""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class StatementRecorder:
+    """SQL statements executed while the recorder is active (an executemany counts once)"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes run at least `threshold` times, most frequent first: the usual N+1 signature"""
+        shapes = Counter(statement_shape(statement) for statement in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+    def report(self) -> str:
+        return "\n".join(f"  {index}. {statement_shape(statement)}" for index, statement in enumerate(self.statements, 1))
+
+# Process-wide recorders see every statement (tests drive the app from another thread,
+# where a context variable would not be visible); the request recorder sees only its request
+_global_recorders: List[StatementRecorder] = []
+_request_recorder: ContextVar[Optional[StatementRecorder]] = ContextVar("request_recorder", default=None)
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    request_recorder = _request_recorder.get()
+    if request_recorder is not None:
+        request_recorder.statements.append(statement)
+    for recorder in _global_recorders:
+        recorder.statements.append(statement)
+
+class record_statements:
+    """Record every statement the process executes inside the block:
+
+        with record_statements() as recorder:
+            client.get("/api/v1/auth/profiles")
+        assert recorder.count <= 2
+    """
+
+    def __enter__(self) -> StatementRecorder:
+        self.recorder = StatementRecorder()
+        _global_recorders.append(self.recorder)
+        return self.recorder
+
+    def __exit__(self, *exc_info) -> None:
+        _global_recorders.remove(self.recorder)
+
+class StatementBudgetExceeded(AssertionError):
+    pass
+
+class statement_budget:
+    """Fail when the block or decorated (sync or async) function executes more than
+    `max_statements` statements, listing them so the loop is easy to find."""
+
+    def __init__(self, max_statements: int, label: str = "block"):
+        self.max_statements = max_statements
+        self.label = label
+        self._recording = None
+
+    def __enter__(self) -> StatementRecorder:
+        self._recording = record_statements()
+        return self._recording.__enter__()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        recorder = self._recording.recorder
+        self._recording.__exit__(exc_type, exc, traceback)
+        if exc_type is None and recorder.count > self.max_statements:
+            raise StatementBudgetExceeded(
+                f"{self.label} executed {recorder.count} SQL statements, budget is {self.max_statements}:\n"
+                f"{recorder.report()}"
+            )
+
+    def __call__(self, func):
+        label = self.label if self.label != "block" else func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with statement_budget(self.max_statements, label):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with statement_budget(self.max_statements, label):
+                return func(*args, **kwargs)
+        return wrapper
+
+class QueryDebugMiddleware:
+    """Dev-mode ASGI middleware: reports the request's statement count in X-SQL-Statements and,
+    when one statement shape repeats SQL_N_PLUS_ONE_THRESHOLD times or more, names it in
+    X-SQL-N-Plus-One and logs a warning. Headers go out with the response start, so statements
+    run while streaming a body are only logged."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = StatementRecorder()
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-sql-statements", str(recorder.count).encode()))
+                repeated = recorder.repeated_shapes(threshold)
+                if repeated:
+                    shape, count = repeated[0]
+                    headers.append((b"x-sql-n-plus-one", f"{count}x {shape[:200]}".encode("latin-1", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _request_recorder.set(recorder)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_recorder.reset(token)
+            for shape, count in recorder.repeated_shapes(threshold):
+                logger.warning("Possible N+1 on %s %s: %d x %s", scope["method"], scope["path"], count, shape)
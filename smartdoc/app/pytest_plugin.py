@@ -0,0 +1,51 @@
+"""SQL statement budgets for tests.
+
+Enable with `pytest -p app.pytest_plugin` or `pytest_plugins = ["app.pytest_plugin"]` in a
+conftest, then either mark a test:
+
+    @pytest.mark.statement_budget(2)
+    def test_profiles_page(client, admin_headers):
+        client.get("/api/v1/auth/profiles", headers=admin_headers)
+
+or check part of a test with the fixture:
+
+    def test_login(client, statement_budget):
+        with statement_budget(3, "POST /auth/login"):
+            client.post("/api/v1/auth/login", json=credentials)
+
+Only the test body is counted, not fixture setup. Fixtures run first, so seeding does not
+use up the budget.
+"""
+import pytest
+from app.profiling import record_statements, statement_budget as _statement_budget
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "statement_budget(max_statements): fail if the test body executes more SQL statements"
+    )
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("statement_budget")
+    if marker is None:
+        yield
+        return
+    budget = _statement_budget(marker.args[0], item.nodeid)
+    budget.__enter__()
+    outcome = yield
+    failed = outcome.excinfo is not None
+    try:
+        budget.__exit__(*(outcome.excinfo or (None, None, None)))
+    except AssertionError as e:
+        if not failed:
+            outcome.force_exception(e)
+
+@pytest.fixture
+def statement_budget():
+    return _statement_budget
+
+@pytest.fixture
+def sql_recorder():
+    """Statements executed during the test, for assertions finer than a budget"""
+    with record_statements() as recorder:
+        yield recorder
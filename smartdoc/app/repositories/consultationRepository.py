@@ -0,0 +1,73 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional, List, Tuple
+from datetime import datetime
+from ..models.consultation import Consultation
+from ..models.Doctor import Doctor
+from ..models import ConsultationStatus
+
+class ConsultationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, consultation_data: dict) -> Consultation:
+        # A concurrent booking of the same doctor slot fails here on uq_consultations_doctor_slot
+        try:
+            consultation = Consultation(**consultation_data)
+            self.db.add(consultation)
+            await self.db.commit()
+            return consultation
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+    
+    async def get_by_id(self, consultation_id: str) -> Optional[Consultation]:
+        result = await self.db.execute(select(Consultation).where(Consultation.id == consultation_id))
+        return result.scalar_one_or_none()
+    
+    async def get_doctor_schedule(self, doctor_id: str, start: datetime, end: datetime,
+                                  include_cancelled: bool = False) -> List[Consultation]:
+        # Range scan on ix_consultations_doctor_id_scheduled_at
+        query = select(Consultation).where(
+            Consultation.doctor_id == doctor_id,
+            Consultation.scheduled_at >= start,
+            Consultation.scheduled_at < end
+        ).order_by(Consultation.scheduled_at)
+        if not include_cancelled:
+            query = query.where(Consultation.status != ConsultationStatus.CANCELLED)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def update_status(self, consultation: Consultation, status: ConsultationStatus) -> Consultation:
+        consultation.status = status
+        await self.db.commit()
+        return consultation
+    
+    async def get_booked_slots(self, start: datetime, end: datetime) -> List[Tuple[str, datetime]]:
+        result = await self.db.execute(
+            select(Consultation.doctor_id, Consultation.scheduled_at).where(
+                Consultation.scheduled_at >= start,
+                Consultation.scheduled_at < end,
+                Consultation.status != ConsultationStatus.CANCELLED
+            )
+        )
+        return [(str(doctor_id), scheduled_at) for doctor_id, scheduled_at in result]
+    
+    def care_patient_ids(self, doctor_id: Optional[str] = None, hospital_id: Optional[str] = None):
+        """Subquery of patients with a live booking with the doctor, or with one of the hospital's doctors.
+
+        Ownership is checked through doctors.hospital_id rather than the consultation's own
+        hospital_id, and cancelled bookings grant nothing.
+        """
+        query = select(Consultation.patient_id).where(Consultation.status != ConsultationStatus.CANCELLED)
+        if doctor_id is not None:
+            query = query.where(Consultation.doctor_id == doctor_id)
+        if hospital_id is not None:
+            query = query.join(Doctor, Doctor.id == Consultation.doctor_id).where(Doctor.hospital_id == hospital_id)
+        return query
+    
+    async def has_patient_in_care(self, patient_id: str, doctor_id: Optional[str] = None,
+                                  hospital_id: Optional[str] = None) -> bool:
+        query = self.care_patient_ids(doctor_id, hospital_id).where(Consultation.patient_id == patient_id)
+        result = await self.db.execute(select(query.exists()))
+        return result.scalar()
@@ -1,7 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, insert, func, or_
+from typing import Any, Optional, Dict, List, Sequence, Tuple
 from ..models.Doctor import Doctor
+from ..models import UserStatus
+from ..cache import principal_cache
+from ..pagination import fetch_page
+from ..availability import DoctorSchedule, availability_index
 
 class DoctorRepository:
     def __init__(self, db: AsyncSession):
@@ -12,12 +16,15 @@ class DoctorRepository:
             doctor = Doctor(**doctor_data)
             self.db.add(doctor)
             await self.db.commit()
-            await self.db.refresh(doctor)
             return doctor
         except Exception as e:
             await self.db.rollback()
             raise e
     
+    async def bulk_create(self, doctors: List[Dict]) -> None:
+        # executemany, batched into multi-row VALUES by the asyncpg dialect; committed by the caller
+        await self.db.execute(insert(Doctor), doctors)
+    
     async def get_by_id(self, user_id: str) -> Optional[Doctor]:
         result = await self.db.execute(select(Doctor).where(Doctor.id == user_id))
         return result.scalar_one_or_none()
@@ -26,19 +33,34 @@ class DoctorRepository:
         result = await self.db.execute(select(Doctor).where(Doctor.user_id == user_id))
         return result.scalar_one_or_none()
     
-    async def get_by_hospital_id(self, hospital_id: str, skip: int = 0, limit: int = 100) -> List[Doctor]:
-        result = await self.db.execute(
-            select(Doctor).where(Doctor.hospital_id == hospital_id).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
+    async def get_by_hospital_id(self, hospital_id: str, cursor: Optional[str] = None,
+                                 limit: int = 100) -> Tuple[List[Doctor], Optional[str]]:
+        query = select(Doctor).where(Doctor.hospital_id == hospital_id)
+        return await fetch_page(self.db, "doctors.by_hospital", query, (Doctor.last_name, Doctor.id), cursor, limit)
     
-    async def get_all(self, hospital_id: Optional[str] = None,
- skip: int = 0, limit: int = 100) -> List[Doctor]:
-        query = select(Doctor)
+    async def get_all(self, hospital_id: Optional[str] = None, specialization: Optional[str] = None,
+                      sub_specialization: Optional[str] = None, status: Optional[UserStatus] = None,
+                      name_prefix: Optional[str] = None, cursor: Optional[str] = None,
+                      limit: int = 100, columns: Optional[Sequence] = None) -> Tuple[List[Any], Optional[str]]:
+        """Filtered doctors page; with `columns`, Rows of just those columns instead of entities"""
+        query = select(*columns) if columns else select(Doctor)
         if hospital_id:
-            query = query.filter_by(hospital_id == hospital_id)
-        result = await self.db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all()
+            query = query.where(Doctor.hospital_id == hospital_id)
+        if specialization:
+            query = query.where(Doctor.specialization == specialization)
+        if sub_specialization:
+            query = query.where(Doctor.sub_specialization == sub_specialization)
+        if status:
+            query = query.where(Doctor.status == status)
+        if name_prefix:
+            # A 'prefix%' pattern (bound, with LIKE's wildcards escaped) that the planner turns into a
+            # range on the lower(...) text_pattern_ops indexes
+            pattern = name_prefix.lower().replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+            query = query.where(or_(
+                func.lower(Doctor.last_name).like(pattern, escape="/"),
+                func.lower(Doctor.first_name).like(pattern, escape="/")
+            ))
+        return await fetch_page(self.db, "doctors", query, (Doctor.last_name, Doctor.id), cursor, limit, scalars=not columns)
     
     async def update(self, doctor: Doctor, update_data: dict) -> Doctor:
         for field, value in update_data.items():
@@ -46,5 +68,16 @@ class DoctorRepository:
                 setattr(doctor, field, value)
         
         await self.db.commit()
-        await self.db.refresh(doctor)
-        return doctor
\ No newline at end of file
+        await principal_cache.invalidate(str(doctor.user_id))
+        availability_index.sync_doctor(doctor)
+        return doctor
+    
+    async def get_availability_schedules(self) -> List[DoctorSchedule]:
+        result = await self.db.execute(
+            select(
+                Doctor.id, Doctor.hospital_id, Doctor.specialization,
+                Doctor.available_days, Doctor.available_hours_start, Doctor.available_hours_end
+            ).where(Doctor.status == UserStatus.ACTIVE, Doctor.available_days.isnot(None))
+        )
+        schedules = (DoctorSchedule.from_doctor(row) for row in result)
+        return [schedule for schedule in schedules if schedule is not None]
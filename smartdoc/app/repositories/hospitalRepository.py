@@ -1,7 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Optional, List
+from sqlalchemy import select, and_, or_
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 from ..models.hospital import Hospital
+from ..models.Doctor import Doctor
+from ..models import UserStatus, SubscriptionStatus
+from ..geo import IndexedHospital, hospital_index
+from ..cache import principal_cache, hospital_registration_cache
+from ..pagination import fetch_page
 
 class HospitalRepository:
     def __init__(self, db: AsyncSession):
@@ -12,7 +17,8 @@ class HospitalRepository:
             hospital = Hospital(**hospital_data)
             self.db.add(hospital)
             await self.db.commit()
-            await self.db.refresh(hospital)
+            hospital_index.sync_hospital(hospital)
+            hospital_registration_cache.clear()
             return hospital
         except Exception as e:
             await self.db.rollback()
@@ -26,11 +32,11 @@ class HospitalRepository:
         result = await self.db.execute(select(Hospital).where(Hospital.user_id == user_id))
         return result.scalar_one_or_none()
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Hospital]:
-        result = await self.db.execute(
-            select(Hospital).offset(skip).limit(limit)
-        )
-        return result.scalars().all()
+    async def get_all(self, cursor: Optional[str] = None, limit: int = 100,
+                      columns: Optional[Sequence] = None) -> Tuple[List[Any], Optional[str]]:
+        """Hospitals page; with `columns`, Rows of just those columns instead of entities"""
+        query = select(*columns) if columns else select(Hospital)
+        return await fetch_page(self.db, "hospitals", query, (Hospital.name, Hospital.id), cursor, limit, scalars=not columns)
     
     async def update(self, hospital: Hospital, update_data: dict) -> Hospital:
         for field, value in update_data.items():
@@ -38,12 +44,47 @@ class HospitalRepository:
                 setattr(hospital, field, value)
         
         await self.db.commit()
-        await self.db.refresh(hospital)
+        hospital_index.sync_hospital(hospital)
+        hospital_registration_cache.clear()
+        
+        # Subscription state is part of every doctor's cached principal
+        result = await self.db.execute(select(Doctor.user_id).where(Doctor.hospital_id == hospital.id))
+        await principal_cache.invalidate(str(hospital.user_id), *(str(user_id) for user_id in result.scalars()))
         return hospital
     
     async def get_hospitals_for_registration(self) -> List[Dict]:
-        hospitals = await self.get_all()
-        return [
-            {"id": str(hospital.id), "name": str(hospital.name)}
-            for hospital in hospitals if hospital.status == "active" and hospital.subscription_status == "active"
-        ]
\ No newline at end of file
+        # Served by the ix_hospitals_registration_name partial index
+        result = await self.db.execute(
+            select(Hospital.id, Hospital.name)
+            .where(
+                Hospital.status == UserStatus.ACTIVE,
+                Hospital.subscription_status == SubscriptionStatus.ACTIVE
+            )
+            .order_by(Hospital.name)
+        )
+        return [{"id": str(hospital_id), "name": name} for hospital_id, name in result]
+    
+    def _geo_query(self):
+        return select(
+            Hospital.id, Hospital.name, Hospital.city, Hospital.latitude, Hospital.longitude,
+            Hospital.specialties, Hospital.emergency_services
+        ).where(
+            Hospital.status == UserStatus.ACTIVE,
+            Hospital.latitude.isnot(None),
+            Hospital.longitude.isnot(None)
+        )
+    
+    async def get_geo_index_entries(self) -> List[IndexedHospital]:
+        result = await self.db.execute(self._geo_query())
+        return [IndexedHospital.from_hospital(row) for row in result]
+    
+    async def get_in_bounding_box(self, min_lat: float, max_lat: float,
+                                  min_lon: float, max_lon: float) -> List[IndexedHospital]:
+        if min_lon <= max_lon:
+            longitude = Hospital.longitude.between(min_lon, max_lon)
+        else:
+            # The box wraps around the antimeridian
+            longitude = or_(Hospital.longitude >= min_lon, Hospital.longitude <= max_lon)
+        query = self._geo_query().where(and_(Hospital.latitude.between(min_lat, max_lat), longitude))
+        result = await self.db.execute(query)
+        return [IndexedHospital.from_hospital(row) for row in result]
@@ -0,0 +1,128 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, literal, null, type_coerce, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, aggregate_order_by, insert
+from typing import Optional, List, Tuple, Any
+from ..models.medical_history import MedicalHistory
+from ..pagination import fetch_page
+
+JSONB_FIELDS = frozenset({"current_medications", "past_surgeries", "pregnancy_history", "vaccination_records"})
+ARRAY_FIELDS = frozenset({"chronic_conditions", "allergies"})
+
+# (op, field, path below the field, value)
+PatchOp = Tuple[str, str, List[str], Any]
+
+def _jsonb(value: Any):
+    return literal(value, JSONB)
+
+def _remove_from_array(array, value: Any):
+    elements = func.jsonb_array_elements(array).table_valued("value", with_ordinality="ordinality")
+    return (
+        select(func.coalesce(func.jsonb_agg(aggregate_order_by(elements.c.value, elements.c.ordinality)), _jsonb([])))
+        .select_from(elements)
+        .where(elements.c.value != _jsonb(value))
+        .scalar_subquery()
+    )
+
+def _with_current(expr, build):
+    # Bind the value built so far to one name so chained ops don't repeat it in the SQL
+    current = select(expr.label("current")).correlate(MedicalHistory).subquery()
+    return select(build(current.c.current)).select_from(current).scalar_subquery()
+
+def _jsonb_expression(expr, op: str, path: List[str], value: Any):
+    if not path:
+        if op == "set":
+            return null() if value is None else _jsonb(value)
+        if op == "delete":
+            return null()
+        if op == "append":
+            return func.coalesce(expr, _jsonb([])).op("||", return_type=JSONB)(_jsonb([value]))
+        return _remove_from_array(expr, value)
+    
+    path_param = literal(path, ARRAY(Text))
+    if op == "set":
+        return func.jsonb_set(func.coalesce(expr, _jsonb({})), path_param, _jsonb(value), True, type_=JSONB)
+    if op == "delete":
+        return expr.op("#-", return_type=JSONB)(path_param)
+    
+    def build(current):
+        target = current.op("#>", return_type=JSONB)(path_param)
+        if op == "append":
+            replacement = func.coalesce(target, _jsonb([])).op("||", return_type=JSONB)(_jsonb([value]))
+        else:
+            replacement = _remove_from_array(target, value)
+        return func.jsonb_set(current, path_param, replacement, True, type_=JSONB)
+    return _with_current(expr, build)
+
+def _array_expression(expr, op: str, value: Any):
+    if op == "set":
+        return null() if value is None else literal(value, ARRAY(String))
+    if op == "delete":
+        return null()
+    # Removing first keeps append idempotent, which matters for retried offline edits
+    removed = func.array_remove(expr, literal(value, String), type_=ARRAY(String))
+    if op == "append":
+        return func.array_append(removed, literal(value, String), type_=ARRAY(String))
+    return removed
+
+class MedicalHistoryRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_patient_id(self, patient_id: str) -> Optional[MedicalHistory]:
+        result = await self.db.execute(select(MedicalHistory).where(MedicalHistory.patient_id == patient_id))
+        return result.scalar_one_or_none()
+    
+    async def ensure_exists(self, patient_id: str) -> None:
+        await self.db.execute(
+            insert(MedicalHistory)
+            .values(patient_id=patient_id)
+            .on_conflict_do_nothing(index_elements=[MedicalHistory.patient_id])
+        )
+    
+    async def apply_patch(self, patient_id: str, ops: List[PatchOp],
+                          expected_version: Optional[int] = None) -> Optional[MedicalHistory]:
+        """Apply all ops in one UPDATE ... RETURNING; None when no row matched"""
+        values = {}
+        for op, field, path, value in ops:
+            expr = values.get(field, getattr(MedicalHistory, field))
+            if field in JSONB_FIELDS:
+                values[field] = _jsonb_expression(expr, op, path, value)
+            elif field in ARRAY_FIELDS:
+                values[field] = _array_expression(expr, op, value)
+            else:
+                values[field] = null() if op == "delete" else literal(value, getattr(MedicalHistory, field).type)
+        
+        query = (
+            update(MedicalHistory)
+            .where(MedicalHistory.patient_id == patient_id)
+            .values(**values, version=MedicalHistory.version + 1, updated_at=func.now())
+            .returning(MedicalHistory)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(MedicalHistory.version == expected_version)
+        try:
+            result = await self.db.execute(query)
+            history = result.scalar_one_or_none()
+            await self.db.commit()
+            return history
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+    
+    async def search(self, allergy: Optional[str] = None, condition: Optional[str] = None,
+                     medication: Optional[str] = None, patient_scope=None, cursor: Optional[str] = None,
+                     limit: int = 100) -> Tuple[List[Any], Optional[str]]:
+        # Containment predicates so the GIN indexes on these columns can serve the lookup
+        query = select(MedicalHistory.id, MedicalHistory.patient_id, MedicalHistory.allergies,
+                       MedicalHistory.chronic_conditions)
+        # The models declare the generic ARRAY, which has no contains(); the PostgreSQL type renders @>
+        if allergy:
+            query = query.where(type_coerce(MedicalHistory.allergies, ARRAY(String)).contains([allergy]))
+        if condition:
+            query = query.where(type_coerce(MedicalHistory.chronic_conditions, ARRAY(String)).contains([condition]))
+        if medication:
+            query = query.where(MedicalHistory.current_medications.contains([{"name": medication}]))
+        if patient_scope is not None:
+            query = query.where(MedicalHistory.patient_id.in_(patient_scope))
+        return await fetch_page(self.db, "medical_history.search", query, (MedicalHistory.id,), cursor, limit, scalars=False)
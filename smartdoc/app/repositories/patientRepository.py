@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from ..models.Patient import Patient
+from ..pagination import fetch_page
 
 class PatientRepository:
     def __init__(self, db: AsyncSession):
@@ -12,7 +13,6 @@ class PatientRepository:
             patient = Patient(**patient_data)
             self.db.add(patient)
             await self.db.commit()
-            await self.db.refresh(patient)
             return patient
         except Exception as e:
             await self.db.rollback()
@@ -26,14 +26,16 @@ class PatientRepository:
         result = await self.db.execute(select(Patient).where(Patient.user_id == user_id))
         return result.scalar_one_or_none()
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Patient]:
-        result = await self.db.execute(select(Patient).offset(skip).limit(limit))
-        return result.scalars().all()
+    async def get_by_phone(self, phone: str) -> Optional[Patient]:
+        result = await self.db.execute(select(Patient).where(Patient.phone == phone).limit(1))
+        return result.scalar_one_or_none()
+    
+    async def get_all(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Patient], Optional[str]]:
+        return await fetch_page(self.db, "patients", select(Patient), (Patient.created_at, Patient.id), cursor, limit)
     
     async def update(self, patient: Patient, update_data: dict) -> Patient:
         for field, value in update_data.items():
             if hasattr(patient, field) and value is not None:
                 setattr(patient, field, value)
         await self.db.commit()
-        await self.db.refresh(patient)
         return patient
\ No newline at end of file
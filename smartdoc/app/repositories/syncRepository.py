@@ -0,0 +1,91 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, tuple_, values, column, cast, Integer
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+
+# Rows per multi-row INSERT or UPDATE ... FROM (VALUES ...); keeps bind parameters well under PostgreSQL's 32767 limit
+UPSERT_CHUNK_SIZE = 500
+
+class SyncRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def server_now(self) -> datetime:
+        return await self.db.scalar(select(func.now()))
+    
+    async def upsert_versioned(self, model, owner_column: str, owner_id, rows: List[Dict[str, Any]]) -> Set:
+        """Insert or update `rows` (all with the same keys) and return the ids that were written.
+        
+        Each row carries `version = base_version + 1` and `owner_column = owner_id`; an existing
+        row is only overwritten when it is still at base_version and belongs to the same owner,
+        otherwise it is left alone and its id is missing from the result.
+        """
+        applied = set()
+        table = model.__table__
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+            stmt = insert(table).values(chunk)
+            excluded = stmt.excluded
+            update_columns = {
+                key: excluded[key] for key in chunk[0] if key not in ("id", owner_column)
+            }
+            update_columns["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_=update_columns,
+                where=and_(
+                    table.c.version == excluded.version - 1,
+                    table.c[owner_column] == owner_id
+                )
+            ).returning(table.c.id)
+            result = await self.db.execute(stmt)
+            applied.update(result.scalars())
+        return applied
+    
+    async def update_versioned(self, model, owner_column: str, owner_id, rows: List[Dict[str, Any]]) -> Set:
+        """Apply `rows` (all with the same keys) as one UPDATE ... FROM (VALUES ...) per chunk and
+        return the ids that were written.
+        
+        Each row carries its `id`, the client's `base_version` and the new values; a row is only
+        updated while it is still at base_version and belongs to the owner.
+        """
+        applied = set()
+        table = model.__table__
+        keys = [key for key in rows[0] if key not in ("id", "base_version")]
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+            data = values(
+                column("id", table.c.id.type), column("base_version", Integer),
+                *(column(key, table.c[key].type) for key in keys),
+                name="data"
+            ).data([(row["id"], row["base_version"], *(row[key] for key in keys)) for row in chunk])
+            result = await self.db.execute(
+                table.update()
+                .where(table.c.id == data.c.id, table.c.version == data.c.base_version,
+                       table.c[owner_column] == owner_id)
+                # A column that is NULL in every row comes back as text, so cast to the target type
+                .values({
+                    **{key: cast(data.c[key], table.c[key].type) for key in keys},
+                    "version": table.c.version + 1,
+                    "updated_at": func.now(),
+                })
+                .returning(table.c.id)
+            )
+            applied.update(result.scalars())
+        return applied
+    
+    async def get_rows(self, model, ids: Iterable, owner_clause) -> List[Dict[str, Any]]:
+        table = model.__table__
+        result = await self.db.execute(select(table).where(table.c.id.in_(list(ids)), owner_clause))
+        return [dict(row) for row in result.mappings()]
+    
+    async def changed_since(self, model, owner_clause, after: Optional[Tuple[datetime, Any]],
+                            limit: int) -> List[Dict[str, Any]]:
+        """Rows past the (updated_at, id) position `after`, oldest first"""
+        table = model.__table__
+        query = select(table).where(owner_clause).order_by(table.c.updated_at, table.c.id).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(table.c.updated_at, table.c.id) > tuple_(*after))
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
@@ -1,26 +1,42 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
+from typing import Dict, List, Optional, Set, Tuple
 from ..models.user import User
 from ..models import UserRole
-from ..security import get_password_hash, verify_password
+from ..cache import principal_cache
+from ..pagination import fetch_page
+from ..security import get_password_hash_async, verify_and_update_password_async
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def create_user(self, email: str, password: str, role: UserRole) -> User:
-        hashed_password = get_password_hash(password)
+    async def create_user(self, email: str, password: str, role: UserRole, commit: bool = True) -> User:
+        """With commit=False the user is only flushed, joining the caller's transaction"""
+        hashed_password = await get_password_hash_async(password)
         user = User(
             email=email,
             hashed_password=hashed_password,
             role=role
         )
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        if commit:
+            await self.db.commit()
+        else:
+            await self.db.flush()
         return user
     
+    async def bulk_create(self, users: List[Dict]) -> Set[str]:
+        """Multi-row insert that skips already registered emails; returns the emails inserted"""
+        result = await self.db.execute(
+            insert(User)
+            .values(users)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email)
+        )
+        return set(result.scalars())
     
     async def get_by_email(self, email: str) -> Optional[User]:
         result = await self.db.execute(select(User).where(User.email == email))
@@ -32,18 +48,31 @@ class UserRepository:
     
     async def authenticate(self, email: str, password: str) -> Optional[User]:
         user = await self.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        # End the read transaction so the connection goes back to the pool during bcrypt;
+        # the session checks out a fresh one for the last_login write
+        await self.db.commit()
+        if not user:
             return None
+        verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            # Persisted by the caller's commit (login updates last_login)
+            user.hashed_password = new_hash
         return user
     
     async def update_password(self, user: User, new_password: str):
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await get_password_hash_async(new_password)
         await self.db.commit()
-        await self.db.refresh(user)
+        await principal_cache.invalidate(str(user.id))
         return user
     
-    async def get_all_users(self, skip: int = 0, limit: int = 100):
-        result = await self.db.execute(
-            select(User).offset(skip).limit(limit)
+    async def get_all_users(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[User], Optional[str]]:
+        return await fetch_page(self.db, "users", select(User), (User.created_at, User.id), cursor, limit)
+    
+    async def get_profiles_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[User], Optional[str]]:
+        # One statement per page: profiles are outer-joined onto the users page
+        query = select(User).options(
+            joinedload(User.hospital), joinedload(User.doctor), joinedload(User.patient)
         )
-        return result.scalars().all()
\ No newline at end of file
+        return await fetch_page(self.db, "users.profiles", query, (User.created_at, User.id), cursor, limit)
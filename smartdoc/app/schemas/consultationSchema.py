@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from ..models import ConsultationType, ConsultationStatus
+
+class ConsultationCreate(BaseModel):
+    doctor_id: UUID
+    scheduled_at: datetime
+    consultation_type: ConsultationType = ConsultationType.DIRECT_BOOKING
+    symptoms: Optional[str] = None
+
+class ConsultationResponse(BaseModel):
+    id: UUID
+    patient_id: UUID
+    doctor_id: UUID
+    hospital_id: UUID
+    consultation_type: ConsultationType
+    status: ConsultationStatus
+    scheduled_at: Optional[datetime] = None
+    symptoms: Optional[str] = None
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ConsultationSlot(BaseModel):
+    scheduled_at: datetime
+    status: ConsultationStatus
+    
+    class Config:
+        from_attributes = True
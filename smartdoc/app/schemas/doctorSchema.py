@@ -1,6 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional, List
-# from datetime import date, time, datetime
+from typing import Optional, List, Any
+from datetime import time, datetime
+from uuid import UUID
+# from datetime import date
 # from decimal import Decimal
 from ..models import Gender, UserStatus
 
@@ -15,9 +17,9 @@ class DoctorBase(BaseModel):
     # certifications: Optional[List[str]] = None
     # languages_spoken: Optional[List[str]] = None
     # consultation_fee: Optional[Decimal] = None
-    # available_days: Optional[List[str]] = None
-    # available_hours_start: Optional[time] = None
-    # available_hours_end: Optional[time] = None
+    available_days: Optional[List[str]] = None
+    available_hours_start: Optional[time] = None
+    available_hours_end: Optional[time] = None
     bio: Optional[str] = None
     # is_accepting_patients: bool = True
 
@@ -29,6 +31,24 @@ class DoctorCreate(DoctorBase):
     # date_of_birth: Optional[date] = None
     gender: Optional[Gender] = None
 
+class DoctorImportRow(DoctorCreate):
+    # Rows without a password get an invitation email to set one
+    password: Optional[str] = None
+
+class DoctorImportResult(BaseModel):
+    row: int
+    status: str  # created | invalid | duplicate | failed
+    email: Optional[str] = None
+    doctor_id: Optional[str] = None
+    errors: Optional[Any] = None
+
+class DoctorImportReport(BaseModel):
+    created: int
+    invalid: int
+    duplicate: int
+    failed: int
+    rows: List[DoctorImportResult]
+
 class DoctorUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -40,18 +60,37 @@ class DoctorUpdate(BaseModel):
     # certifications: Optional[List[str]] = None
     # languages_spoken: Optional[List[str]] = None
     # consultation_fee: Optional[Decimal] = None
-    # available_days: Optional[List[str]] = None
-    # available_hours_start: Optional[time] = None
-    # available_hours_end: Optional[time] = None
+    available_days: Optional[List[str]] = None
+    available_hours_start: Optional[time] = None
+    available_hours_end: Optional[time] = None
     bio: Optional[str] = None
     # is_accepting_patients: Optional[bool] = None
 
 class DoctorResponse(DoctorBase):
-    id: str
-    user_id: str
-    hospital_id: str
+    id: UUID
+    user_id: UUID
+    hospital_id: UUID
     gender: Optional[Gender] = None
     status: UserStatus
+    
+    class Config:
+        from_attributes = True
+
+class DoctorSummary(BaseModel):
+    # Directory listing fields, selectable with ?fields=summary
+    id: UUID
+    hospital_id: UUID
+    first_name: str
+    last_name: str
+    specialization: str
+    sub_specialization: Optional[str] = None
+    status: UserStatus
+
+class DoctorAvailability(BaseModel):
+    doctor_id: str
+    hospital_id: str
+    specialization: str
+    slots: List[datetime]
 
 # class ConsultationBase(BaseModel):
 #     patient_id: str
@@ -68,7 +107,4 @@ class DoctorResponse(DoctorBase):
 # class ConsultationResponse(ConsultationBase):
 #     id: str
 #     scheduled_at: Optional[datetime]
-#     created_at: datetime
-
-    class Config:
-        from_attributes = True
\ No newline at end of file
+#     created_at: datetime
\ No newline at end of file
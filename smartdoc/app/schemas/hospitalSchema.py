@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
+from uuid import UUID
 from decimal import Decimal
 from ..models.__init__ import SubscriptionStatus
 
@@ -46,11 +47,21 @@ class HospitalUpdate(BaseModel):
     # subscription_status: Optional[SubscriptionStatus] = None  # New
 
 class HospitalResponse(HospitalBase):
-    id: str
-    user_id: str
+    id: UUID
+    user_id: UUID
     latitude: Optional[Decimal] = None
     longitude: Optional[Decimal] = None
     status: str
+    subscription_status: Optional[SubscriptionStatus] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class HospitalSummary(BaseModel):
+    # Directory listing fields, selectable with ?fields=summary
+    id: UUID
+    name: str
+    city: str
+    state: str
+    specialties: Optional[List[str]] = None
+    emergency_services: bool = False
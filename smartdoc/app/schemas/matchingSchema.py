@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class MatchingQuery(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    specialty: Optional[str] = None
+    emergency_services: Optional[bool] = None
+    limit: int = Field(10, ge=1, le=50)
+    max_distance_km: Optional[float] = Field(None, gt=0)
+
+class HospitalMatch(BaseModel):
+    id: str
+    name: str
+    city: Optional[str] = None
+    latitude: float
+    longitude: float
+    specialties: List[str]
+    emergency_services: bool
+    distance_km: float
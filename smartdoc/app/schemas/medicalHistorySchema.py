@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Literal
+from datetime import datetime
+from uuid import UUID
+
+class MedicalHistoryUpdate(BaseModel):
+    # Whole-field values accepted by "set" on a top-level path
+    chronic_conditions: Optional[List[str]] = None
+    allergies: Optional[List[str]] = None
+    allergy_severity: Optional[Literal['mild', 'moderate', 'severe']] = None
+    current_medications: Optional[List[Any]] = None
+    past_surgeries: Optional[List[Any]] = None
+    family_history_diabetes: Optional[bool] = None
+    family_history_heart_disease: Optional[bool] = None
+    family_history_cancer: Optional[bool] = None
+    family_history_hypertension: Optional[bool] = None
+    family_history_mental_health: Optional[bool] = None
+    family_history_other: Optional[str] = None
+    smoking_status: Optional[Literal['never', 'former', 'current']] = None
+    alcohol_consumption: Optional[Literal['never', 'occasional', 'moderate', 'heavy']] = None
+    exercise_frequency: Optional[Literal['none', 'rare', 'weekly', 'daily']] = None
+    pregnancy_history: Optional[Any] = None
+    menstrual_history: Optional[str] = None
+    vaccination_records: Optional[List[Any]] = None
+    other_medical_notes: Optional[str] = None
+
+class MedicalHistoryPatchOp(BaseModel):
+    op: Literal["set", "delete", "append", "remove"]
+    path: str = Field(..., description="JSON pointer such as /allergies or /current_medications/0/dose")
+    value: Any = None
+
+class MedicalHistoryPatch(BaseModel):
+    ops: List[MedicalHistoryPatchOp] = Field(..., min_length=1, max_length=50)
+    expected_version: Optional[int] = Field(None, ge=1, description="Reject the patch with 409 if the record has moved on")
+
+class MedicalHistoryResponse(MedicalHistoryUpdate):
+    id: UUID
+    patient_id: UUID
+    version: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class MedicalHistoryMatch(BaseModel):
+    patient_id: UUID
+    allergies: Optional[List[str]] = None
+    chronic_conditions: Optional[List[str]] = None
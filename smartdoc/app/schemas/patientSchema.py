@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import date
+from uuid import UUID
 from decimal import Decimal
 from ..models import Gender, BloodGroup
 
@@ -53,8 +54,8 @@ class PatientUpdate(BaseModel):
     data_consent: bool = True  # NDPR compliance
 
 class PatientResponse(PatientBase):
-    id: str
-    user_id: str
+    id: UUID
+    user_id: UUID
     
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+class SyncEntity(str, Enum):
+    PATIENT = "patient"
+    MEDICAL_HISTORY = "medical_history"
+    CONSULTATION = "consultation"
+
+class SyncMutation(BaseModel):
+    entity: SyncEntity
+    id: UUID
+    base_version: int = Field(0, ge=0, description="Version the edit was made against, 0 for rows created offline")
+    data: Dict[str, Any]
+
+class SyncRequest(BaseModel):
+    sync_token: Optional[str] = None
+    mutations: List[SyncMutation] = Field(default_factory=list, max_length=10000)
+
+class SyncRejection(BaseModel):
+    id: UUID
+    reason: str
+
+class SyncResponse(BaseModel):
+    applied: List[UUID]
+    conflicts: List[UUID]
+    rejected: List[SyncRejection]
+    changes: Dict[SyncEntity, List[Dict[str, Any]]]
+    has_more: bool = False
+    sync_token: str
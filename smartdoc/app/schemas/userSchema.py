@@ -1,7 +1,11 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from ..models import UserRole
+from .hospitalSchema import HospitalResponse
+from .doctorSchema import DoctorResponse
+from .patientSchema import PatientResponse
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -17,7 +21,7 @@ class UserLogin(BaseModel):
     password: str
 
 class UserResponse(UserBase):
-    id: str
+    id: UUID
     email: EmailStr
     role: UserRole
     is_active: bool
@@ -28,6 +32,12 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class UserProfileResponse(UserResponse):
+    # Only the profile matching the user's role is set
+    hospital: Optional[HospitalResponse] = None
+    doctor: Optional[DoctorResponse] = None
+    patient: Optional[PatientResponse] = None
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,10 +1,35 @@
+import asyncio
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Any
+from typing import List, Optional, Tuple, Union, Any
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max rounds pinned to the configured cost so verify_and_update flags older hashes for rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_pending_hash_jobs = 0
+
+# Bulk imports get their own pool so an onboarding run cannot starve interactive logins
+_bulk_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.BULK_HASH_WORKERS,
+    thread_name_prefix="bulk-password-hash",
+)
+_unusable_password_hash: Optional[str] = None
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
@@ -28,6 +53,51 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def _run_hash_job(func, *args):
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _pending_hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if it was made with outdated parameters"""
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job(get_password_hash, password)
+
+async def hash_passwords_bulk(passwords: List[str]) -> List[str]:
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(
+        *(loop.run_in_executor(_bulk_hash_executor, get_password_hash, password) for password in passwords)
+    ))
+
+async def get_unusable_password_hash() -> str:
+    """Valid hash of a discarded secret, for accounts that must set their password from an invite link"""
+    global _unusable_password_hash
+    if _unusable_password_hash is None:
+        loop = asyncio.get_running_loop()
+        _unusable_password_hash = await loop.run_in_executor(
+            _bulk_hash_executor, get_password_hash, secrets.token_urlsafe(32)
+        )
+    return _unusable_password_hash
+
+def shutdown_password_hasher() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+    _bulk_hash_executor.shutdown(wait=False, cancel_futures=True)
+
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -37,18 +107,21 @@ def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     except jwt.JWTError:
         return None
     
-import smtplib
-from email.mime.text import MIMEText
+from .mail import enqueue_email
 
 async def send_reset_email(email: str, reset_token: str):
-    msg = MIMEText(f"Reset your password: http://localhost:8000/reset?token={reset_token}")
-    msg["Subject"] = "Password Reset"
-    msg["From"] = settings.EMAIL_USERNAME
-    msg["To"] = email
-    with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-        server.starttls()
-        server.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
-        server.send_message(msg)
+    await enqueue_email(
+        to=email,
+        subject="Password Reset",
+        body=f"Reset your password: {settings.PASSWORD_RESET_URL}?token={reset_token}",
+    )
+
+async def send_invitation_email(email: str, reset_token: str):
+    await enqueue_email(
+        to=email,
+        subject="Welcome to SmartDoc",
+        body=f"Your SmartDoc account is ready. Set your password: {settings.PASSWORD_RESET_URL}?token={reset_token}",
+    )
 
 # from twilio.rest import Client
 
@@ -0,0 +1,65 @@
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+import orjson
+from fastapi import HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+def _default(value: Any) -> Any:
+    # orjson has no Decimal support; strings match what pydantic emits for Decimal fields
+    if isinstance(value, Decimal):
+        return str(value)
+    # asyncpg returns its own UUID subclass, which orjson does not recognise as uuid.UUID
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """One TypeAdapter per response type; building the validator/serializer is the expensive part"""
+    return TypeAdapter(tp)
+
+def model_response(tp: Any, value: Any, status_code: int = 200) -> Response:
+    """Validate ORM objects against `tp` once and serialize in pydantic-core, skipping FastAPI's re-validation"""
+    adapter = type_adapter(tp)
+    content = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+def response_columns(model: Any, schema: Type[BaseModel]) -> List:
+    """Columns of `model` that `schema` renders, for column-only selects"""
+    table_columns = model.__table__.columns
+    return [getattr(model, name) for name in schema.model_fields if name in table_columns]
+
+@lru_cache(maxsize=256)
+def projection_columns(model: Any, schema: Type[BaseModel], fields: Optional[str],
+                       required: Tuple = (), summary: Optional[Type[BaseModel]] = None) -> Tuple:
+    """Columns for a `?fields=` list of `schema` columns; "summary" expands to `summary`'s fields.
+
+    `required` columns (the keyset sort key) are always selected so the cursor can be built.
+    """
+    available = {column.key: column for column in response_columns(model, schema)}
+    if not fields:
+        return tuple(available.values())
+    names: List[str] = []
+    for name in (name.strip() for name in fields.split(",")):
+        expanded = list(summary.model_fields) if name == "summary" and summary else [name]
+        names.extend(item for item in expanded if item and item not in names)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: summary, {', '.join(available)}"
+        )
+    names.extend(column.key for column in required if column.key not in names)
+    return tuple(available[name] for name in names)
+
+def rows_page_response(rows: Sequence, next_cursor: Optional[str]) -> FastJSONResponse:
+    """Page of column-select Rows serialized straight from the tuples, without pydantic models"""
+    items: List[Dict] = [row._asdict() for row in rows]
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
@@ -1,9 +1,9 @@
 from ..schemas import doctorSchema, hospitalSchema, patientSchema
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import Optional, Dict
 import secrets
-import redis
 from ..schemas.doctorSchema import DoctorCreate, DoctorResponse
 from ..schemas.patientSchema import PatientCreate, PatientResponse
 from ..schemas.hospitalSchema import HospitalCreate, HospitalResponse
@@ -11,15 +11,19 @@ from app.repositories.userRepository import UserRepository
 from app.repositories.hospitalRepository import HospitalRepository
 from app.repositories.doctorRepository import DoctorRepository
 from app.repositories.patientRepository import PatientRepository
-from ....smartdoc.app.security import create_access_token, create_refresh_token
-from ..schemas.userSchema import UserLogin, UserResponse, Token, AdminCreate, UserRole, UserStatus
-from app.models import UserRole
+from app.security import create_access_token, create_refresh_token, send_reset_email
+from ..schemas.userSchema import UserLogin, UserResponse, Token, AdminCreate
+from app.models import UserRole, UserStatus
+from app.models.user import User
 import uuid
 from ..models.__init__ import SubscriptionStatus
-import redis.asyncio as aioredis
+from app.db.redis import get_redis
+from app.config import settings
+from app.tasks import enqueue
+from app.tasks.otp import send_otp_sms
 from datetime import datetime
-# Redis client for storing reset tokens
-redis_client = redis.Redis.from_url("redis://localhost:6379", decode_responses=True)
+
+RESET_TOKEN_TTL_SECONDS = 3600
 
 class AuthService:
     def __init__(self, db: AsyncSession):
@@ -29,15 +33,20 @@ class AuthService:
         self.doctor_repo = DoctorRepository(db)
         self.patient_repo = PatientRepository(db)
     
-    async def create_admin(self, admin_data: AdminCreate) -> Dict:
-        existing_user = await self.user_repo.get_by_id(admin_data.email)
-        if existing_user:
+    async def _create_user(self, email: str, password: str, role: UserRole, commit: bool = False) -> User:
+        # The unique index on users.email is the duplicate check, so registration needs no pre-query
+        try:
+            return await self.user_repo.create_user(email=email, password=password, role=role, commit=commit)
+        except IntegrityError:
+            await self.db.rollback()
             raise HTTPException(status_code=400, detail="Email already registered")
-        
-        user = await self.user_repo.create_user(
+    
+    async def create_admin(self, admin_data: AdminCreate) -> Dict:
+        user = await self._create_user(
             email=admin_data.email,
             password=admin_data.password,
-            role=UserRole.ADMIN
+            role=UserRole.ADMIN,
+            commit=True
         )
         
         access_token = create_access_token(subject=str(user.id))
@@ -52,12 +61,8 @@ class AuthService:
         }
     
     async def create_hospital_account(self, hospital_data: HospitalCreate) -> Dict:
-        existing_user = await self.user_repo.get_by_id(hospital_data.email)
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Create user account
-        user = await self.user_repo.create_user(
+        # Create user account; flushed only, so it commits or rolls back with the profile
+        user = await self._create_user(
             email=hospital_data.email,
             password=hospital_data.password,
             role=UserRole.HOSPITAL
@@ -89,12 +94,8 @@ class AuthService:
         if hospital.subscription_status != SubscriptionStatus.ACTIVE:
             raise HTTPException(status_code=403, detail="Hospital subscription is not active")
         
-        existing_user = await self.user_repo.get_by_id(doctor_data.email)
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Create user account
-        user = await self.user_repo.create_user(
+        # Create user account; flushed only, so it commits or rolls back with the profile
+        user = await self._create_user(
             email=doctor_data.email,
             password=doctor_data.password,
             role=UserRole.DOCTOR
@@ -119,19 +120,16 @@ class AuthService:
         }
     
     async def create_patient_account(self, patient_data: PatientCreate) -> Dict:
-        existing_user = await self.user_repo.get_by_id(patient_data.email)
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Create user account
-        user = await self.user_repo.create_user(
+        # Create user account; flushed only, so it commits or rolls back with the profile
+        user = await self._create_user(
             email=patient_data.email,
             password=patient_data.password,
             role=UserRole.PATIENT
         )
         
         # Create patient profile
-        patient_dict = patient_data.dict(exclude={"email", "password"})
+        # data_consent is checked at sign-up but has no column on patients
+        patient_dict = patient_data.dict(exclude={"email", "password", "data_consent"})
         patient_dict["user_id"] = str(user.id)
         
         patient = await self.patient_repo.create(patient_dict)
@@ -177,18 +175,23 @@ class AuthService:
         )
     
     async def forgot_password(self, email: str) -> Dict:
-        user = await self.user_repo.get_by_id(email)
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return {"message": "If email exists, a reset link has been sent"}
         
         reset_token = secrets.token_urlsafe(32)
-        redis_client.setex(f"reset_token:{reset_token}", 3600, str(user.id))
+        await get_redis().setex(f"reset_token:{reset_token}", RESET_TOKEN_TTL_SECONDS, str(user.id))
+        await send_reset_email(user.email, reset_token)
         
-        # TODO: Send email or WhatsApp OTP
-        return {"message": "success"}
+        # TODO: WhatsApp OTP
+        return {"message": "If email exists, a reset link has been sent"}
     
     async def reset_password(self, token: str, new_password: str) -> Dict:
-        user_id = redis_client.get(f"reset_token:{token}")
+        # Read and consume the token in one MULTI/EXEC round trip so it can only be used once
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.get(f"reset_token:{token}")
+            pipe.delete(f"reset_token:{token}")
+            user_id, _ = await pipe.execute()
         if not user_id:
             raise HTTPException(status_code=400, detail="Invalid or expired reset token")
         
@@ -196,22 +199,16 @@ class AuthService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        await self.user_repo.update(user, new_password)
-        redis_client.delete(f"reset_token:{token}")
+        await self.user_repo.update_password(user, new_password)
         
         return {"message": "Password reset successful"}
-
-# async def send_otp(self, phone: str) -> Dict:
-#     from twilio.rest import Client
-#     patient = await self.patient_repo.get_by_phone(phone)
-#     if not patient:
-#         raise HTTPException(status_code=404, detail="Patient not found")
-#     otp = secrets.token_digits(6)
-#     client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-#     client.messages.create(
-#         body=f"Your SmartDoc OTP is {otp}",
-#         from_=settings.TWILIO_PHONE_NUMBER,
-#         to=phone
-#     )
-#     redis_client.setex(f"otp:{phone}", 300, otp)
-#     return {"message": "OTP sent"}
\ No newline at end of file
+    
+    async def send_otp(self, phone: str) -> Dict:
+        patient = await self.patient_repo.get_by_phone(phone)
+        if not patient:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        
+        otp = f"{secrets.randbelow(10 ** 6):06d}"
+        await get_redis().setex(f"otp:{phone}", settings.OTP_TTL_SECONDS, otp)
+        await enqueue(send_otp_sms, phone, otp)
+        return {"message": "OTP sent"}
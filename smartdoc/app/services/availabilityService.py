@@ -0,0 +1,57 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from fastapi import HTTPException
+from datetime import datetime, timedelta, timezone
+from app.availability import availability_index
+from app.config import settings
+from app.repositories.doctorRepository import DoctorRepository
+from app.repositories.consultationRepository import ConsultationRepository
+from app.schemas.doctorSchema import DoctorAvailability
+
+class AvailabilityService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.doctor_repo = DoctorRepository(db)
+        self.consultation_repo = ConsultationRepository(db)
+    
+    async def _load(self):
+        now = datetime.now(timezone.utc)
+        schedules = await self.doctor_repo.get_availability_schedules()
+        # Past the horizon by one refresh interval, so every window search() accepts until the
+        # next reload is covered by the bookings loaded here
+        bookings = await self.consultation_repo.get_booked_slots(
+            now - timedelta(days=1),
+            now + timedelta(days=settings.AVAILABILITY_HORIZON_DAYS, seconds=settings.AVAILABILITY_INDEX_REFRESH_SECONDS)
+        )
+        return schedules, bookings
+    
+    async def ensure_fresh(self) -> None:
+        await availability_index.ensure_fresh(self._load)
+    
+    async def search(self, start: datetime, hours: float, specialization: Optional[str] = None,
+                     hospital_id: Optional[str] = None, limit: int = 50) -> List[DoctorAvailability]:
+        # Slots in the past are gone and bookings past the horizon are not loaded, so the
+        # window is clamped to [now, now + AVAILABILITY_HORIZON_DAYS)
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(days=settings.AVAILABILITY_HORIZON_DAYS)
+        if start >= horizon:
+            raise HTTPException(
+                status_code=422,
+                detail=f"start must be within {settings.AVAILABILITY_HORIZON_DAYS} days from now"
+            )
+        end = min(start + timedelta(hours=hours), horizon)
+        start = max(start, now)
+        if end <= start:
+            return []
+        
+        await self.ensure_fresh()
+        matches = availability_index.search(start, end, specialization, hospital_id, limit)
+        return [
+            DoctorAvailability(
+                doctor_id=schedule.doctor_id,
+                hospital_id=schedule.hospital_id,
+                specialization=schedule.specialization,
+                slots=slots
+            )
+            for schedule, slots in matches
+        ]
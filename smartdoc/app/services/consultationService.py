@@ -0,0 +1,93 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from typing import List
+from datetime import date, datetime, time, timedelta, timezone
+from app.config import settings
+from app.models import UserRole, UserStatus, ConsultationStatus
+from app.models.user import User
+from app.models.consultation import Consultation
+from app.repositories.consultationRepository import ConsultationRepository
+from app.repositories.doctorRepository import DoctorRepository
+from app.repositories.patientRepository import PatientRepository
+from app.services.availabilityService import AvailabilityService
+from app.availability import availability_index
+from app.schemas.consultationSchema import ConsultationCreate
+
+class ConsultationService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.consultation_repo = ConsultationRepository(db)
+        self.doctor_repo = DoctorRepository(db)
+        self.patient_repo = PatientRepository(db)
+    
+    def _validate_slot(self, scheduled_at: datetime) -> datetime:
+        if scheduled_at.tzinfo is None:
+            raise HTTPException(status_code=422, detail="scheduled_at must include a timezone offset")
+        scheduled_at = scheduled_at.astimezone(timezone.utc)
+        # Slots are aligned so the unique (doctor_id, scheduled_at) index rules out overlaps
+        minutes = scheduled_at.hour * 60 + scheduled_at.minute
+        if scheduled_at.second or scheduled_at.microsecond or minutes % settings.CONSULTATION_SLOT_MINUTES:
+            raise HTTPException(
+                status_code=422,
+                detail=f"scheduled_at must start on a {settings.CONSULTATION_SLOT_MINUTES}-minute slot boundary"
+            )
+        if scheduled_at <= datetime.now(timezone.utc):
+            raise HTTPException(status_code=422, detail="scheduled_at must be in the future")
+        return scheduled_at
+    
+    async def book(self, booking: ConsultationCreate, current_user: User) -> Consultation:
+        scheduled_at = self._validate_slot(booking.scheduled_at)
+        
+        patient = await self.patient_repo.get_by_user_id(str(current_user.id))
+        if not patient:
+            raise HTTPException(status_code=404, detail="Patient profile not found")
+        doctor = await self.doctor_repo.get_by_id(str(booking.doctor_id))
+        if not doctor or doctor.status != UserStatus.ACTIVE:
+            raise HTTPException(status_code=404, detail="Doctor not found")
+        
+        await AvailabilityService(self.db).ensure_fresh()
+        if availability_index.in_working_hours(str(doctor.id), scheduled_at) is False:
+            raise HTTPException(status_code=422, detail="Doctor is not available at this time")
+        
+        try:
+            consultation = await self.consultation_repo.create({
+                "patient_id": patient.id,
+                "doctor_id": doctor.id,
+                "hospital_id": doctor.hospital_id,
+                "consultation_type": booking.consultation_type,
+                "symptoms": booking.symptoms,
+                "scheduled_at": scheduled_at,
+                "status": ConsultationStatus.SCHEDULED,
+            })
+        except IntegrityError:
+            raise HTTPException(status_code=409, detail="This time slot is no longer available")
+        availability_index.book(str(doctor.id), scheduled_at)
+        return consultation
+    
+    async def get_doctor_day(self, doctor_id: str, day: date) -> List[Consultation]:
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        return await self.consultation_repo.get_doctor_schedule(doctor_id, start, start + timedelta(days=1))
+    
+    async def cancel(self, consultation_id: str, current_user: User) -> Consultation:
+        consultation = await self.consultation_repo.get_by_id(consultation_id)
+        if not consultation:
+            raise HTTPException(status_code=404, detail="Consultation not found")
+        
+        if current_user.role == UserRole.PATIENT:
+            patient = await self.patient_repo.get_by_user_id(str(current_user.id))
+            allowed = patient is not None and patient.id == consultation.patient_id
+        elif current_user.role == UserRole.DOCTOR:
+            doctor = await self.doctor_repo.get_by_user_id(str(current_user.id))
+            allowed = doctor is not None and doctor.id == consultation.doctor_id
+        else:
+            allowed = current_user.role == UserRole.ADMIN
+        if not allowed:
+            raise HTTPException(status_code=403, detail="Not authorized")
+        
+        if consultation.status != ConsultationStatus.SCHEDULED:
+            raise HTTPException(status_code=400, detail="Only scheduled consultations can be cancelled")
+        consultation = await self.consultation_repo.update_status(consultation, ConsultationStatus.CANCELLED)
+        if consultation.scheduled_at is not None:
+            availability_index.release(str(consultation.doctor_id), consultation.scheduled_at)
+        return consultation
@@ -0,0 +1,227 @@
+import asyncio
+import csv
+import json
+import logging
+import re
+import secrets
+import uuid
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from app.availability import availability_index
+from app.config import settings
+from app.db.redis import get_redis
+from app.models import UserRole, SubscriptionStatus
+from app.repositories.userRepository import UserRepository
+from app.repositories.doctorRepository import DoctorRepository
+from app.repositories.hospitalRepository import HospitalRepository
+from app.schemas.doctorSchema import DoctorImportRow
+from app.security import hash_passwords_bulk, get_unusable_password_hash, send_invitation_email
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+LIST_FIELDS = {"available_days"}
+
+# (row number, parsed object or a parse error message)
+ImportRecord = Tuple[int, Any]
+
+async def _iter_lines(upload: UploadFile) -> AsyncIterator[str]:
+    # Split before decoding: a newline byte never occurs inside a UTF-8 sequence, so characters
+    # split across chunks stay whole, and invalid bytes only fail the line that holds them
+    pending, encoding = b"", "utf-8-sig"
+    while chunk := await upload.read(READ_CHUNK_SIZE):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.decode(encoding).rstrip("\r")
+            encoding = "utf-8"
+    if pending.strip():
+        yield pending.decode(encoding).rstrip("\r")
+
+async def iter_csv_records(upload: UploadFile) -> AsyncIterator[ImportRecord]:
+    header, record, row = None, "", 0
+    async for line in _iter_lines(upload):
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        data = {}
+        for name, value in zip(header, values):
+            value = value.strip()
+            if not value:
+                continue
+            data[name] = [item for item in re.split(r"[;,]\s*", value) if item] if name in LIST_FIELDS else value
+        yield row, data
+    if record:
+        yield row + 1, "Unterminated quoted field"
+
+async def iter_ndjson_records(upload: UploadFile) -> AsyncIterator[ImportRecord]:
+    row = 0
+    async for line in _iter_lines(upload):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield row, f"Invalid JSON: {e}"
+            continue
+        yield row, data if isinstance(data, dict) else "Each line must be a JSON object"
+
+async def _stop_on_decode_error(records: AsyncIterator[ImportRecord]) -> AsyncIterator[ImportRecord]:
+    # Earlier batches are already committed, so report the failure as a row instead of failing the request
+    row = 0
+    try:
+        async for row, data in records:
+            yield row, data
+    except UnicodeDecodeError:
+        yield row + 1, "File is not valid UTF-8; this and later rows were not imported"
+
+class DoctorImportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.user_repo = UserRepository(db)
+        self.doctor_repo = DoctorRepository(db)
+        self.hospital_repo = HospitalRepository(db)
+    
+    async def import_records(self, hospital_id: str, records: AsyncIterator[ImportRecord]) -> Dict:
+        """Validate, hash and insert doctors in batches; one commit per batch"""
+        hospital = await self.hospital_repo.get_by_id(hospital_id)
+        if not hospital:
+            raise HTTPException(status_code=404, detail="Hospital not found")
+        if hospital.subscription_status != SubscriptionStatus.ACTIVE:
+            raise HTTPException(status_code=403, detail="Hospital subscription is not active")
+        
+        # Read once: a failed batch rolls back, which expires the hospital
+        hospital_id = str(hospital.id)
+        results: List[Dict] = []
+        batch: List[Tuple[int, DoctorImportRow]] = []
+        seen_emails = set()
+        async for row, data in records:
+            if row > settings.DOCTOR_IMPORT_MAX_ROWS:
+                results.append({"row": row, "status": "invalid",
+                                "errors": f"Imports are limited to {settings.DOCTOR_IMPORT_MAX_ROWS} rows"})
+                break
+            if isinstance(data, str):
+                results.append({"row": row, "status": "invalid", "errors": data})
+                continue
+            try:
+                doctor = DoctorImportRow(**{**data, "hospital_id": hospital_id})
+            except ValidationError as e:
+                results.append({"row": row, "status": "invalid",
+                                "errors": e.errors(include_url=False, include_context=False)})
+                continue
+            email_key = doctor.email.lower()
+            if email_key in seen_emails:
+                results.append({"row": row, "status": "duplicate", "email": doctor.email,
+                                "errors": "Email appears earlier in the file"})
+                continue
+            seen_emails.add(email_key)
+            batch.append((row, doctor))
+            if len(batch) >= settings.DOCTOR_IMPORT_BATCH_SIZE:
+                results.extend(await self._insert_batch(batch))
+                batch = []
+        if batch:
+            results.extend(await self._insert_batch(batch))
+        
+        availability_index.invalidate()
+        results.sort(key=lambda result: result["row"])
+        summary = {status: 0 for status in ("created", "invalid", "duplicate", "failed")}
+        for result in results:
+            summary[result["status"]] += 1
+        return {**summary, "rows": results}
+    
+    async def _insert_batch(self, batch: List[Tuple[int, DoctorImportRow]]) -> List[Dict]:
+        hashes = iter(await hash_passwords_bulk([doctor.password for _, doctor in batch if doctor.password]))
+        unusable_hash = await get_unusable_password_hash() if any(not doctor.password for _, doctor in batch) else None
+        users, doctors = [], []
+        for _, doctor in batch:
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id,
+                "email": doctor.email,
+                "hashed_password": next(hashes) if doctor.password else unusable_hash,
+                "role": UserRole.DOCTOR
+            })
+            doctors.append({"id": uuid.uuid4(), "user_id": user_id, **doctor.dict(exclude={"email", "password"})})
+        
+        failed = set()
+        try:
+            inserted = await self._save(users, doctors)
+        except DBAPIError:
+            await self.db.rollback()
+            # Retry row by row so one bad row does not fail the rest of the batch
+            logger.warning("Doctor import batch of %d rows failed; retrying row by row", len(batch), exc_info=True)
+            inserted = set()
+            for index, (row, _) in enumerate(batch):
+                try:
+                    inserted |= await self._save([users[index]], [doctors[index]])
+                except DBAPIError:
+                    await self.db.rollback()
+                    logger.warning("Doctor import row %d could not be saved", row, exc_info=True)
+                    failed.add(index)
+        
+        results = []
+        invites = []
+        for index, (row, doctor) in enumerate(batch):
+            if index in failed:
+                results.append({"row": row, "status": "failed", "email": doctor.email,
+                                "errors": "Row could not be saved"})
+                continue
+            if users[index]["email"] not in inserted:
+                results.append({"row": row, "status": "duplicate", "email": doctor.email,
+                                "errors": "Email already registered"})
+                continue
+            results.append({"row": row, "status": "created", "email": doctor.email,
+                            "doctor_id": str(doctors[index]["id"])})
+            if not doctor.password:
+                invites.append((str(users[index]["id"]), doctor.email))
+        if invites:
+            await self._send_invitations(invites)
+        return results
+    
+    async def _save(self, users: List[Dict], doctors: List[Dict]) -> Set[str]:
+        """Insert and commit; returns the emails inserted, skipping those already registered"""
+        inserted = await self.user_repo.bulk_create(users)
+        created = [index for index, user in enumerate(users) if user["email"] in inserted]
+        if created:
+            await self.doctor_repo.bulk_create([doctors[index] for index in created])
+        await self.db.commit()
+        return inserted
+    
+    async def _send_invitations(self, invites: List[Tuple[str, str]]) -> None:
+        tokens = [secrets.token_urlsafe(32) for _ in invites]
+        # Invites are password-reset tokens with a longer lifetime, redeemed via /auth/reset-password
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for token, (user_id, _) in zip(tokens, invites):
+                pipe.setex(f"reset_token:{token}", settings.DOCTOR_INVITE_TTL_SECONDS, user_id)
+            await pipe.execute()
+        await asyncio.gather(*(send_invitation_email(email, token) for token, (_, email) in zip(tokens, invites)))
+    
+    async def import_upload(self, hospital_id: str, upload: UploadFile, file_format: Optional[str] = None) -> Dict:
+        file_format = file_format or self._detect_format(upload)
+        records = iter_csv_records(upload) if file_format == "csv" else iter_ndjson_records(upload)
+        return await self.import_records(hospital_id, _stop_on_decode_error(records))
+    
+    def _detect_format(self, upload: UploadFile) -> str:
+        filename = (upload.filename or "").lower()
+        content_type = (upload.content_type or "").lower()
+        if filename.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+            return "csv"
+        if filename.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+            return "ndjson"
+        raise HTTPException(status_code=400, detail="Unrecognised file type; pass format=csv or format=ndjson")
@@ -0,0 +1,65 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.geo import IndexedHospital, bounding_box, haversine_km, hospital_index
+from app.repositories.hospitalRepository import HospitalRepository
+from app.schemas.matchingSchema import MatchingQuery, HospitalMatch
+
+# Search radii tried in turn by the SQL fallback before giving up on finding `limit` matches
+FALLBACK_RADII_KM = (25, 100, 400, 1600, 20040)
+
+class MatchingService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.hospital_repo = HospitalRepository(db)
+    
+    async def match_hospitals(self, query: MatchingQuery) -> List[HospitalMatch]:
+        specialty = query.specialty.lower() if query.specialty else None
+        
+        predicate = None
+        if query.emergency_services is not None:
+            predicate = lambda hospital: hospital.emergency_services == query.emergency_services
+        
+        if settings.HOSPITAL_INDEX_ENABLED:
+            await hospital_index.ensure_fresh(self.hospital_repo.get_geo_index_entries)
+            matches = hospital_index.nearest(
+                query.latitude, query.longitude, query.limit, predicate, query.max_distance_km, specialty
+            )
+        else:
+            matches = await self._match_with_bounding_box(query, specialty, predicate)
+        
+        return [
+            HospitalMatch(
+                id=hospital.id,
+                name=hospital.name,
+                city=hospital.city,
+                latitude=hospital.latitude,
+                longitude=hospital.longitude,
+                specialties=sorted(hospital.specialties),
+                emergency_services=hospital.emergency_services,
+                distance_km=round(distance, 2),
+            )
+            for distance, hospital in matches
+        ]
+    
+    async def _match_with_bounding_box(self, query: MatchingQuery, specialty: Optional[str],
+                                       predicate) -> List[Tuple[float, IndexedHospital]]:
+        max_distance = query.max_distance_km
+        matches: List[Tuple[float, IndexedHospital]] = []
+        for radius in FALLBACK_RADII_KM:
+            if max_distance is not None:
+                radius = min(radius, max_distance)
+            candidates = await self.hospital_repo.get_in_bounding_box(*bounding_box(query.latitude, query.longitude, radius))
+            matches = sorted(
+                (
+                    (haversine_km(query.latitude, query.longitude, h.latitude, h.longitude), h)
+                    for h in candidates
+                    if (specialty is None or specialty in h.specialties) and (predicate is None or predicate(h))
+                ),
+                key=lambda match: match[0]
+            )
+            # Only hits inside the circle are guaranteed to beat anything outside the box
+            matches = [match for match in matches if match[0] <= radius]
+            if len(matches) >= query.limit or radius == max_distance:
+                break
+        return matches[:query.limit]
@@ -0,0 +1,127 @@
+import logging
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from pydantic import ValidationError
+from typing import Optional, Dict, List
+from app.models import UserRole
+from app.models.user import User
+from app.models.medical_history import MedicalHistory
+from app.repositories.medicalHistoryRepository import MedicalHistoryRepository, PatchOp, JSONB_FIELDS, ARRAY_FIELDS
+from app.repositories.consultationRepository import ConsultationRepository
+from app.repositories.doctorRepository import DoctorRepository
+from app.repositories.hospitalRepository import HospitalRepository
+from app.repositories.patientRepository import PatientRepository
+from app.schemas.medicalHistorySchema import MedicalHistoryPatch, MedicalHistoryPatchOp, MedicalHistoryUpdate
+
+logger = logging.getLogger(__name__)
+
+def _normalize_term(value) -> str:
+    # Allergy and condition lists are stored lower-cased so containment lookups are case-insensitive
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPException(status_code=422, detail="Value must be a non-empty string")
+    return value.strip().lower()
+
+class MedicalHistoryService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.history_repo = MedicalHistoryRepository(db)
+        self.consultation_repo = ConsultationRepository(db)
+        self.doctor_repo = DoctorRepository(db)
+        self.hospital_repo = HospitalRepository(db)
+        self.patient_repo = PatientRepository(db)
+    
+    async def _care_scope(self, current_user: User) -> Optional[Dict[str, str]]:
+        """care_patient_ids() filter for a doctor (their own bookings) or a hospital (its doctors' bookings)"""
+        if current_user.role == UserRole.DOCTOR:
+            doctor = await self.doctor_repo.get_by_user_id(str(current_user.id))
+            return {"doctor_id": str(doctor.id)} if doctor else None
+        if current_user.role == UserRole.HOSPITAL:
+            hospital = await self.hospital_repo.get_by_user_id(str(current_user.id))
+            return {"hospital_id": str(hospital.id)} if hospital else None
+        return None
+    
+    async def resolve_patient_id(self, current_user: User, patient_id: Optional[str] = None) -> str:
+        """Patient whose record the user may access; doctors and hospitals need a live booking with the patient"""
+        if current_user.role == UserRole.PATIENT:
+            patient = await self.patient_repo.get_by_user_id(str(current_user.id))
+            if not patient or (patient_id is not None and str(patient.id) != patient_id):
+                raise HTTPException(status_code=404, detail="Patient profile not found")
+            return str(patient.id)
+        if patient_id is None:
+            raise HTTPException(status_code=422, detail="patient_id is required")
+        if current_user.role == UserRole.ADMIN:
+            return patient_id
+        scope = await self._care_scope(current_user)
+        if not scope or not await self.consultation_repo.has_patient_in_care(patient_id, **scope):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return patient_id
+    
+    async def get(self, patient_id: str) -> MedicalHistory:
+        history = await self.history_repo.get_by_patient_id(patient_id)
+        if not history:
+            raise HTTPException(status_code=404, detail="Medical history not found")
+        return history
+    
+    def _parse_op(self, patch_op: MedicalHistoryPatchOp) -> PatchOp:
+        if not patch_op.path.startswith("/"):
+            raise HTTPException(status_code=422, detail=f"Invalid path {patch_op.path!r}")
+        segments = [segment.replace("~1", "/").replace("~0", "~") for segment in patch_op.path[1:].split("/")]
+        field, path = segments[0], segments[1:]
+        if field not in MedicalHistoryUpdate.model_fields:
+            raise HTTPException(status_code=422, detail=f"Unknown field {field!r}")
+        if path and field not in JSONB_FIELDS:
+            raise HTTPException(status_code=422, detail=f"{field} has no nested paths")
+        
+        op, value = patch_op.op, patch_op.value
+        if op in ("append", "remove"):
+            if value is None:
+                raise HTTPException(status_code=422, detail=f"{op} requires a value")
+            if field in ARRAY_FIELDS:
+                value = _normalize_term(value)
+            elif field not in JSONB_FIELDS:
+                raise HTTPException(status_code=422, detail=f"{field} is not a list")
+        elif op == "set" and not path:
+            try:
+                value = getattr(MedicalHistoryUpdate(**{field: value}), field)
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+            if field in ARRAY_FIELDS and value is not None:
+                value = list(dict.fromkeys(_normalize_term(item) for item in value))
+        return op, field, path, value
+    
+    async def patch(self, patient_id: str, patch: MedicalHistoryPatch) -> MedicalHistory:
+        ops = [self._parse_op(patch_op) for patch_op in patch.ops]
+        try:
+            history = await self.history_repo.apply_patch(patient_id, ops, patch.expected_version)
+            if history is None:
+                if patch.expected_version is not None:
+                    raise HTTPException(status_code=409, detail="Medical history has been modified")
+                await self.history_repo.ensure_exists(patient_id)
+                history = await self.history_repo.apply_patch(patient_id, ops)
+        except DBAPIError:
+            # e.g. appending to a path that holds an object rather than a list; the database
+            # error stays in the log
+            logger.info("Medical history patch for patient %s failed", patient_id, exc_info=True)
+            raise HTTPException(status_code=422, detail="Patch could not be applied to the current record")
+        return history
+    
+    async def search(self, current_user: User, allergy: Optional[str], condition: Optional[str],
+                     medication: Optional[str], cursor: Optional[str], limit: int) -> Dict:
+        if not (allergy or condition or medication):
+            raise HTTPException(status_code=422, detail="Provide allergy, condition or medication")
+        patient_scope = None
+        if current_user.role != UserRole.ADMIN:
+            scope = await self._care_scope(current_user)
+            if not scope:
+                raise HTTPException(status_code=403, detail="Not authorized")
+            patient_scope = self.consultation_repo.care_patient_ids(**scope)
+        rows, next_cursor = await self.history_repo.search(
+            allergy=_normalize_term(allergy) if allergy else None,
+            condition=_normalize_term(condition) if condition else None,
+            medication=medication,
+            patient_scope=patient_scope,
+            cursor=cursor,
+            limit=limit
+        )
+        return {"items": rows, "next_cursor": next_cursor}
@@ -1,12 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.repositories.userRepository import UserRepository
 from app.repositories.doctorRepository import DoctorRepository
 from app.repositories.patientRepository import PatientRepository
 from app.repositories.hospitalRepository import HospitalRepository
 from app.models.user import User
 from app.models import UserRole
+from app.cache import principal_cache
 from app.schemas.userSchema import UserResponse
 from app.schemas import hospitalSchema, doctorSchema, patientSchema
 
@@ -18,50 +19,37 @@ class ProfileService:
         self.doctor_repo = DoctorRepository(db)
         self.patient_repo = PatientRepository(db)
     
-    async def get_all_profiles(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        users = await self.user_repo.get_all_users(skip, limit)
-        profiles = []
+    def _build_profile(self, user: User, hospital=None, doctor=None, patient=None) -> Dict:
+        profile_data = UserResponse.model_validate(user, from_attributes=True).model_dump()
         
-        for user in users:
-            profile_data = UserResponse.from_orm(user).dict()
-            if user.role == UserRole.HOSPITAL:
-                hospital = await self.hospital_repo.get_by_id(str(user.id))
-                if hospital:
-                    profile_data["hospital"] = hospitalSchema.HospitalResponse.from_orm(hospitalSchema).dict()
-            elif user.role == UserRole.DOCTOR:
-                doctor = await self.doctor_repo.get_by_id(str(user.id))
-                if doctor:
-                    profile_data["doctor"] = doctorSchema.DoctorResponse.from_orm(doctorSchema).dict()
-            elif user.role == UserRole.PATIENT:
-                patient = await self.patient_repo.get_by_id(str(user.id))
-                if patient:
-                    profile_data["patient"] = patientSchema.PatientResponse.from_orm(patientSchema).dict()
-            
-            profiles.append(profile_data)
+        if user.role == UserRole.HOSPITAL and hospital:
+            profile_data["hospital"] = hospitalSchema.HospitalResponse.model_validate(hospital, from_attributes=True).model_dump()
+        elif user.role == UserRole.DOCTOR and doctor:
+            profile_data["doctor"] = doctorSchema.DoctorResponse.model_validate(doctor, from_attributes=True).model_dump()
+        elif user.role == UserRole.PATIENT and patient:
+            profile_data["patient"] = patientSchema.PatientResponse.model_validate(patient, from_attributes=True).model_dump()
         
-        return profiles
+        return profile_data
+    
+    async def get_all_profiles(self, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+        # Entities with hospital/doctor/patient eagerly loaded, for serialization as Page[UserProfileResponse]
+        users, next_cursor = await self.user_repo.get_profiles_page(cursor, limit)
+        return {"items": users, "next_cursor": next_cursor}
     
     async def get_user_profile(self, user_id: str) -> Dict:
         user = await self.user_repo.get_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        profile_data = UserResponse.from_orm(user).dict()
-        
+        hospital = doctor = patient = None
         if user.role == UserRole.HOSPITAL:
             hospital = await self.hospital_repo.get_by_user_id(user_id)
-            if hospital:
-                profile_data["hospital"] = hospitalSchema.HospitalResponse.from_orm(hospitalSchema).dict()
         elif user.role == UserRole.DOCTOR:
             doctor = await self.doctor_repo.get_by_user_id(user_id)
-            if doctor:
-                profile_data["doctor"] = doctorSchema.DoctorResponse.from_orm(doctorSchema).dict()
         elif user.role == UserRole.PATIENT:
             patient = await self.patient_repo.get_by_user_id(user_id)
-            if patient:
-                profile_data["patient"] = patientSchema.PatientResponse.from_orm(patientSchema).dict()
         
-        return profile_data
+        return self._build_profile(user, hospital, doctor, patient)
     
     async def get_signed_in_user_profile(self, current_user: User) -> Dict:
         return await self.get_user_profile(str(current_user.id))
@@ -80,7 +68,7 @@ class ProfileService:
                 raise HTTPException(status_code=400, detail="Email already registered")
             user.email = update_data["email"]
             await self.db.commit()
-            await self.db.refresh(user)
+            await principal_cache.invalidate(user_id)
         
         if user.role == UserRole.HOSPITAL and "hospital" in update_data:
             hospital = await self.hospital_repo.get_by_user_id(user_id)
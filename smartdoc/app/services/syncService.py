@@ -0,0 +1,266 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import UserRole, ConsultationStatus
+from app.models.user import User
+from app.models.Patient import Patient
+from app.models.medical_history import MedicalHistory
+from app.models.consultation import Consultation
+from app.pagination import encode_cursor, decode_cursor
+from app.repositories.syncRepository import SyncRepository
+from app.repositories.patientRepository import PatientRepository
+from app.repositories.doctorRepository import DoctorRepository
+from app.schemas.syncSchema import SyncEntity, SyncRequest
+
+logger = logging.getLogger(__name__)
+
+# Each synced model maps `version` as its version_id_col, so ORM updates bump it too and
+# API edits show up as conflicts for stale offline copies
+SYNCED_MODELS = {
+    SyncEntity.PATIENT: Patient,
+    SyncEntity.MEDICAL_HISTORY: MedicalHistory,
+    SyncEntity.CONSULTATION: Consultation,
+}
+
+# Server-managed columns clients can never write
+PROTECTED_COLUMNS = {"id", "user_id", "version", "created_at", "updated_at"}
+
+# Consultation fields each side of the appointment may edit offline. Bookings, reschedules and
+# cancellations go through ConsultationService, which validates the slot and updates the
+# availability index, so sync only touches the clinical and feedback fields of existing rows.
+CONSULTATION_WRITABLE = {
+    UserRole.PATIENT: {"symptoms", "rating", "patient_feedback"},
+    UserRole.DOCTOR: {
+        "status", "completed_at", "consultation_notes", "diagnosis", "prescribed_medications",
+        "follow_up_required", "follow_up_date",
+    },
+}
+CONSULTATION_SYNC_STATUSES = {ConsultationStatus.IN_PROGRESS, ConsultationStatus.COMPLETED}
+
+# Cursor position before any row stamped at the same updated_at
+_MIN_ID = uuid.UUID(int=0)
+# Sort order the sync token is signed with
+_SYNC_TOKEN_ORDER = (Consultation.__table__.c.updated_at, Consultation.__table__.c.id)
+
+def _coerce(column, value: Any) -> Any:
+    """Convert a JSON value into what the column's DBAPI binding expects.
+    
+    Raises ValueError for any value of the wrong type, so a bad offline edit is rejected on
+    its own instead of failing the whole sync.
+    """
+    if value is None:
+        return None
+    try:
+        return _convert(column, value)
+    except (TypeError, ArithmeticError):
+        raise ValueError(f"{column.name} has an invalid value")
+
+def _convert(column, value: Any) -> Any:
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class(value)
+    enums = getattr(column.type, "enums", None)
+    if enums and value not in enums:
+        raise ValueError(f"{column.name} must be one of {', '.join(enums)}")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is time:
+        return time.fromisoformat(value)
+    if python_type is Decimal:
+        # str() would otherwise turn true or a list into something Decimal might accept
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError(column.name)
+        return Decimal(str(value))
+    if python_type is uuid.UUID:
+        return uuid.UUID(str(value))
+    return value
+
+class SyncService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.sync_repo = SyncRepository(db)
+        self.patient_repo = PatientRepository(db)
+        self.doctor_repo = DoctorRepository(db)
+    
+    async def _scopes(self, current_user: User) -> Dict[SyncEntity, tuple]:
+        """Entity -> (owner column, owner id) for the data this account may sync"""
+        if current_user.role == UserRole.PATIENT:
+            patient = await self.patient_repo.get_by_user_id(str(current_user.id))
+            if patient:
+                return {
+                    SyncEntity.PATIENT: ("id", patient.id),
+                    SyncEntity.MEDICAL_HISTORY: ("patient_id", patient.id),
+                    SyncEntity.CONSULTATION: ("patient_id", patient.id),
+                }
+        elif current_user.role == UserRole.DOCTOR:
+            doctor = await self.doctor_repo.get_by_user_id(str(current_user.id))
+            if doctor:
+                return {SyncEntity.CONSULTATION: ("doctor_id", doctor.id)}
+        raise HTTPException(status_code=403, detail="No syncable profile for this account")
+    
+    def _row_values(self, model, owner_column: str, data: Dict[str, Any], is_insert: bool,
+                    writable: Optional[set] = None) -> Dict[str, Any]:
+        columns = model.__table__.c
+        values = {}
+        for key, value in data.items():
+            if key in PROTECTED_COLUMNS or key == owner_column or key not in columns:
+                raise ValueError(f"Field '{key}' cannot be synced")
+            if writable is not None and key not in writable:
+                raise ValueError(f"Field '{key}' cannot be synced")
+            values[key] = _coerce(columns[key], value)
+        if is_insert:
+            missing = [
+                column.name for column in columns
+                if not column.nullable and column.default is None and column.server_default is None
+                and column.name not in values and column.name not in ("id", owner_column)
+            ]
+            if missing:
+                raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        return values
+    
+    async def sync(self, request: SyncRequest, current_user: User) -> Dict:
+        scopes = await self._scopes(current_user)
+        server_now = await self.sync_repo.server_now()
+        
+        applied, conflicts, rejected = [], [], []
+        # Later edits of the same row within a batch supersede earlier ones
+        latest = {}
+        for mutation in request.mutations:
+            key = (mutation.entity, mutation.id)
+            if key in latest:
+                rejected.append({"id": latest[key].id, "reason": "Superseded by a later mutation in this batch"})
+            latest[key] = mutation
+        
+        # Mutations with the same entity and fields are written together in one statement
+        updates, upserts = defaultdict(list), defaultdict(list)
+        for mutation in latest.values():
+            if mutation.entity not in scopes:
+                rejected.append({"id": mutation.id, "reason": "Entity cannot be synced by this account"})
+                continue
+            if mutation.entity == SyncEntity.CONSULTATION and mutation.base_version == 0:
+                rejected.append({"id": mutation.id, "reason": "Consultations are booked through /consultations"})
+                continue
+            model = SYNCED_MODELS[mutation.entity]
+            owner_column, owner_id = scopes[mutation.entity]
+            writable = CONSULTATION_WRITABLE[current_user.role] if mutation.entity == SyncEntity.CONSULTATION else None
+            try:
+                values = self._row_values(
+                    model, owner_column, mutation.data, is_insert=mutation.base_version == 0, writable=writable
+                )
+            except ValueError as e:
+                rejected.append({"id": mutation.id, "reason": str(e)})
+                continue
+            
+            if mutation.entity == SyncEntity.PATIENT:
+                # The patient row itself is never created through sync
+                if mutation.id != owner_id or not values:
+                    rejected.append({"id": mutation.id, "reason": "Only your own patient profile can be updated"})
+                else:
+                    updates[(mutation.entity, tuple(sorted(values)))].append(
+                        {**values, "id": mutation.id, "base_version": mutation.base_version}
+                    )
+                continue
+            if mutation.entity == SyncEntity.CONSULTATION:
+                if not values:
+                    rejected.append({"id": mutation.id, "reason": "No changes"})
+                elif "status" in values and values["status"] not in CONSULTATION_SYNC_STATUSES:
+                    rejected.append({"id": mutation.id, "reason": "Cancel through /consultations/{id}/cancel"})
+                else:
+                    updates[(mutation.entity, tuple(sorted(values)))].append(
+                        {**values, "id": mutation.id, "base_version": mutation.base_version}
+                    )
+                continue
+            
+            row = {**values, "id": mutation.id, owner_column: owner_id, "version": mutation.base_version + 1}
+            upserts[(mutation.entity, tuple(sorted(row)))].append(row)
+        
+        failed = set()
+        await self._write_groups(updates, scopes, self.sync_repo.update_versioned, applied, conflicts, rejected, failed)
+        await self._write_groups(upserts, scopes, self.sync_repo.upsert_versioned, applied, conflicts, rejected, failed)
+        
+        changes, has_more, next_cursor = await self._changes(scopes, request.sync_token, server_now)
+        await self._attach_conflicts(scopes, conflicts, changes, rejected)
+        await self.db.commit()
+        
+        rejected_ids = {rejection["id"] for rejection in rejected}
+        return {
+            "applied": applied,
+            "conflicts": [row_id for _, row_id in conflicts if row_id not in rejected_ids],
+            "rejected": rejected,
+            "changes": changes,
+            "has_more": has_more,
+            "sync_token": encode_cursor(next_cursor, "sync", _SYNC_TOKEN_ORDER),
+        }
+    
+    async def _write_groups(self, groups: Dict, scopes, write, applied: List, conflicts: List,
+                            rejected: List[Dict], failed: set) -> None:
+        """Write each group with one statement under a SAVEPOINT. A group the database refuses is
+        retried row by row, so a failing mutation is rejected on its own instead of aborting the batch."""
+        for (entity, _), rows in groups.items():
+            model = SYNCED_MODELS[entity]
+            owner_column, owner_id = scopes[entity]
+            try:
+                async with self.db.begin_nested():
+                    written = await write(model, owner_column, owner_id, rows)
+            except DBAPIError:
+                written = set()
+                for row in rows:
+                    try:
+                        async with self.db.begin_nested():
+                            written |= await write(model, owner_column, owner_id, [row])
+                    except DBAPIError:
+                        self._reject_failed(rejected, failed, row["id"])
+            applied.extend(written)
+            conflicts.extend((entity, row["id"]) for row in rows if row["id"] not in written | failed)
+    
+    def _reject_failed(self, rejected: List[Dict], failed: set, row_id) -> None:
+        # Constraint details stay in the server log; clients only learn that the row was refused
+        logger.warning("Sync mutation %s rejected by the database", row_id, exc_info=True)
+        rejected.append({"id": row_id, "reason": "Mutation could not be applied"})
+        failed.add(row_id)
+    
+    async def _changes(self, scopes, sync_token: Optional[str], server_now: datetime):
+        # (updated_at, id) keyset, so rows sharing a timestamp are never skipped at a page boundary
+        after = tuple(decode_cursor(sync_token, "sync", _SYNC_TOKEN_ORDER)) if sync_token else None
+        changes, truncated = {}, []
+        for entity, (owner_column, owner_id) in scopes.items():
+            model = SYNCED_MODELS[entity]
+            rows = await self.sync_repo.changed_since(
+                model, model.__table__.c[owner_column] == owner_id, after, settings.SYNC_MAX_CHANGES
+            )
+            changes[entity] = rows
+            if len(rows) == settings.SYNC_MAX_CHANGES:
+                truncated.append((rows[-1]["updated_at"], rows[-1]["id"]))
+        if truncated:
+            # Resume from the oldest truncated entity; re-sent rows are idempotent for the client
+            return changes, True, min(truncated)
+        # Rows committed by transactions that started before ours may carry an earlier updated_at
+        return changes, False, (server_now - timedelta(seconds=settings.SYNC_CLOCK_SKEW_SECONDS), _MIN_ID)
+    
+    async def _attach_conflicts(self, scopes, conflicts: List[tuple], changes: Dict, rejected: List[Dict]) -> None:
+        """Ship the server copy of every conflicting row so the client can rebase its edit"""
+        by_entity = defaultdict(set)
+        for entity, row_id in conflicts:
+            by_entity[entity].add(row_id)
+        for entity, ids in by_entity.items():
+            model = SYNCED_MODELS[entity]
+            owner_column, owner_id = scopes[entity]
+            rows = await self.sync_repo.get_rows(model, ids, model.__table__.c[owner_column] == owner_id)
+            present = {row["id"] for row in changes[entity]}
+            changes[entity].extend(row for row in rows if row["id"] not in present)
+            found = {row["id"] for row in rows}
+            # Ids that exist under another owner are indistinguishable from missing rows
+            rejected.extend({"id": row_id, "reason": "Not found"} for row_id in ids - found)
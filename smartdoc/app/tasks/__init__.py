@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.db.db import connect_args
+from app.db.redis import scoped_redis
+
+async def enqueue(task, *args, **kwargs):
+    """Publish a task from async code without blocking the event loop on the broker round trip"""
+    return await run_in_threadpool(task.apply_async, args, kwargs)
+
+def run_with_session(func: Callable[..., Awaitable[Any]], *args) -> Any:
+    """Run `func(session, *args)` to completion from a (sync) task.
+
+    Every call gets its own event loop, so the engine is created per call without
+    pooling and get_redis() hands out a client private to the call: neither asyncpg
+    nor redis.asyncio connections can be shared across loops. The process-wide Redis
+    client is left alone, so eager mode inside the web process keeps working.
+    """
+    async def runner():
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool, connect_args=connect_args())
+        try:
+            async with scoped_redis(), AsyncSession(engine, expire_on_commit=False) as session:
+                return await func(session, *args)
+        finally:
+            await engine.dispose()
+    
+    return asyncio.run(runner())
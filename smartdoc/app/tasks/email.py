@@ -0,0 +1,30 @@
+import os
+import socket
+import redis
+from celery.signals import worker_process_shutdown
+from app.celery import celery_app
+from app.config import settings
+from app.mail import SMTPConnection, deliver_outbox
+
+# Per worker process: the SMTP session and Redis connection outlive individual tasks
+_smtp_connection = SMTPConnection()
+_redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+def _consumer_id() -> str:
+    # Computed per call: the module is imported before the prefork pool forks its children
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+@celery_app.task
+def deliver_mail_outbox() -> dict:
+    totals = {"sent": 0, "retried": 0, "dead": 0}
+    # Keep draining full batches so a backlog clears within a single run
+    while True:
+        stats = deliver_outbox(_redis_client, _smtp_connection, settings.MAIL_BATCH_SIZE, _consumer_id())
+        for key, value in stats.items():
+            totals[key] += value
+        if sum(stats.values()) < settings.MAIL_BATCH_SIZE:
+            return totals
+
+@worker_process_shutdown.connect
+def _close_smtp_connection(**kwargs):
+    _smtp_connection.close()
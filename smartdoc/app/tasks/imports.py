@@ -0,0 +1,16 @@
+from typing import Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.celery import celery_app
+from app.services.doctorImportService import DoctorImportService
+from app.tasks import run_with_session
+
+async def _rows(rows: List[Dict]):
+    for index, row in enumerate(rows, start=1):
+        yield index, row
+
+async def _import_doctors(db: AsyncSession, hospital_id: str, rows: List[Dict]) -> Dict:
+    return await DoctorImportService(db).import_records(hospital_id, _rows(rows))
+
+@celery_app.task(ignore_result=False)
+def import_doctors(hospital_id: str, rows: List[Dict]) -> Dict:
+    return run_with_session(_import_doctors, hospital_id, rows)
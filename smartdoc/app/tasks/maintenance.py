@@ -0,0 +1,27 @@
+import redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.celery import celery_app
+from app.config import settings
+from app.mail import DEAD_LETTER_KEY
+from app.tasks import run_with_session
+
+# Tables whose planner statistics drift fastest under onboarding and booking traffic
+HOT_TABLES = ("users", "hospitals", "doctors", "patients", "consultations")
+
+@celery_app.task
+def trim_mail_dead_letters() -> None:
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    try:
+        client.ltrim(DEAD_LETTER_KEY, -settings.MAIL_DEAD_LETTER_LIMIT, -1)
+    finally:
+        client.close()
+
+async def _analyze(db: AsyncSession) -> None:
+    for table in HOT_TABLES:
+        await db.execute(text(f"ANALYZE {table}"))
+    await db.commit()
+
+@celery_app.task
+def analyze_hot_tables() -> None:
+    run_with_session(_analyze)
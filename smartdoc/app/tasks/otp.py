@@ -0,0 +1,33 @@
+import logging
+from app.celery import celery_app
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+@celery_app.task(autoretry_for=(ConnectionError, TimeoutError), retry_backoff=True, max_retries=3)
+def send_otp_sms(phone: str, otp: str) -> None:
+    if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
+        logger.warning("Twilio is not configured; OTP for %s was not delivered", phone)
+        return
+    
+    # Optional dependency, only needed on workers consuming the otp queue
+    from requests import RequestException
+    from twilio.base.exceptions import TwilioRestException
+    from twilio.rest import Client
+    
+    client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    # Transient provider failures are re-raised as ConnectionError so autoretry_for picks them up
+    try:
+        client.messages.create(
+            body=f"Your SmartDoc OTP is {otp}",
+            from_=settings.TWILIO_PHONE_NUMBER,
+            to=phone
+        )
+    except RequestException as e:
+        # Twilio's HTTP client is requests, whose network errors are not builtin ConnectionErrors
+        raise ConnectionError(f"SMS provider unreachable: {e}") from e
+    except TwilioRestException as e:
+        # Rate limiting and provider outages; other statuses (an invalid number) would fail again
+        if e.status == 429 or e.status >= 500:
+            raise ConnectionError(f"SMS provider returned {e.status}") from e
+        raise
@@ -0,0 +1,74 @@
+"""python -m benchmarks {seed,load,micro,statements,matching,compare}; run from smartdoc/ with the app's environment set."""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="SmartDoc benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Recreate the schema and load deterministic benchmark data")
+    seed.add_argument("--scale", type=float, default=1.0, help="Multiplier on the base volumes in seed.VOLUMES")
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--append", action="store_true", help="Insert without dropping and recreating the schema")
+
+    load = commands.add_parser("load", help="Drive the API with concurrent clients and record latencies")
+    load.add_argument("--mode", choices=("mix", "login-storm"), default="mix")
+    load.add_argument("--scale", type=float, default=1.0, help="The --scale the database was seeded with")
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--duration", type=float, default=30, help="Measured seconds (mix mode)")
+    load.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring (mix mode)")
+    load.add_argument("--observers", type=int, default=4,
+                      help="Clients reading the directory during a login storm (login-storm mode)")
+    load.add_argument("--sessions", type=int, default=50, help="Patients logged in up front for profile requests")
+    load.add_argument("--url", help="Target an already running server instead of starting uvicorn")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--workers", type=int, default=1)
+    load.add_argument("--output", help="Results file (default: benchmarks/results/<time>-<commit>-<mode>.json)")
+
+    micro = commands.add_parser("micro", help="In-process serialization and middleware micro-benchmarks")
+    micro.add_argument("--output", help="Also write the results to this JSON file")
+
+    statements = commands.add_parser("statements", help="SQL statements per registration against the seeded database")
+    statements.add_argument("--output", help="Also write the results to this JSON file")
+
+    matching = commands.add_parser("matching", help="Nearest-hospital search: brute-force haversine versus the grid index")
+    matching.add_argument("--hospitals", type=int, default=50000)
+    matching.add_argument("--seed", type=int, default=42)
+    matching.add_argument("--k", type=int, default=10, help="Hospitals returned per query")
+    matching.add_argument("--output", help="Also write the results to this JSON file")
+    
+    compare = commands.add_parser("compare", help="Compare two load results files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        from .seed import seed as run_seed
+        asyncio.run(run_seed(args.scale, args.seed, reset=not args.append))
+    elif args.command == "load":
+        from .load import run as run_load
+        run_load({name: value for name, value in vars(args).items() if name != "command"})
+    elif args.command == "micro":
+        from .micro import run as run_micro
+        results = run_micro()
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2))
+    elif args.command == "statements":
+        from .statements import run as run_statements
+        results = run_statements()
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2))
+    elif args.command == "matching":
+        from .matching import run as run_matching
+        results = run_matching(args.hospitals, args.seed, args.k)
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2))
+    else:
+        from .load import compare as run_compare
+        run_compare(args.baseline, args.candidate)
+
+if __name__ == "__main__":
+    main()
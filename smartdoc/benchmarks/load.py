@@ -0,0 +1,311 @@
+"""Concurrent HTTP load against the API with per-route throughput and latency percentiles."""
+import asyncio
+import base64
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import httpx
+from .seed import ADMIN_EMAIL, SEED_PASSWORD, VOLUMES, SPECIALIZATIONS, patient_email
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+
+    def record(self, seconds: float, status: Optional[int]) -> None:
+        self.latencies.append(seconds)
+        if status is None:
+            self.errors += 1
+            return
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+
+    def summary(self, duration: float) -> Dict:
+        values = sorted(self.latencies)
+        milliseconds = lambda seconds: round(seconds * 1000, 2)
+        return {
+            "requests": len(values),
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "throughput_rps": round(len(values) / duration, 1) if duration else 0.0,
+            "mean_ms": milliseconds(sum(values) / len(values)) if values else 0.0,
+            "p50_ms": milliseconds(percentile(values, 0.50)),
+            "p95_ms": milliseconds(percentile(values, 0.95)),
+            "p99_ms": milliseconds(percentile(values, 0.99)),
+            "max_ms": milliseconds(values[-1]) if values else 0.0,
+        }
+
+def _token_subject(token: str) -> str:
+    payload = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["sub"]
+
+class Scenario:
+    """Weighted request mix; paths come from the app's own route table so router prefixes can't drift"""
+
+    def __init__(self, client: httpx.AsyncClient, paths: Dict[str, str], patients: int, seed: int):
+        self.client = client
+        self.paths = paths
+        self.patients = patients
+        self.rng = random.Random(seed)
+        self.sessions: List[Tuple[str, str]] = []  # (user id, bearer token)
+        self.admin_token: Optional[str] = None
+        self.doctor_ids: List[str] = []
+        self.run_id = uuid.uuid4().hex[:8]
+        self.registrations = 0
+
+    async def login(self, email: str) -> httpx.Response:
+        return await self.client.post(self.paths["login"], json={"email": email, "password": SEED_PASSWORD})
+
+    async def prepare(self, sessions: int) -> None:
+        """Log in a pool of patients and the admin up front so authenticated routes don't measure bcrypt"""
+        response = await self.login(ADMIN_EMAIL)
+        response.raise_for_status()
+        self.admin_token = response.json()["access_token"]
+        emails = [patient_email(index) for index in self.rng.sample(range(self.patients), min(sessions, self.patients))]
+        for response in await asyncio.gather(*(self.login(email) for email in emails)):
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            self.sessions.append((_token_subject(token), token))
+        response = await self.client.get(self.paths["doctors"], params={"limit": 500, "fields": "summary"})
+        response.raise_for_status()
+        self.doctor_ids = [doctor["id"] for doctor in response.json()["items"]]
+
+    def requests(self) -> Dict[str, Tuple[int, Callable]]:
+        """route name -> (weight, coroutine factory)"""
+        return {
+            "GET /hospitals": (20, lambda: self.client.get(self.paths["hospitals"], params={"limit": 50})),
+            "GET /hospitals?fields=summary": (10, lambda: self.client.get(
+                self.paths["hospitals"], params={"limit": 100, "fields": "summary"})),
+            "GET /doctors?specialization": (20, lambda: self.client.get(
+                self.paths["doctors"], params={"specialization": self.rng.choice(SPECIALIZATIONS), "limit": 50})),
+            "GET /doctors/{id}": (15, lambda: self.client.get(
+                self.paths["doctor"].replace("{doctor_id}", self.rng.choice(self.doctor_ids)))),
+            "GET /auth/profile/{id}": (15, self._own_profile),
+            "GET /auth/profiles": (5, lambda: self.client.get(
+                self.paths["profiles"], params={"limit": 100}, headers=self._bearer(self.admin_token))),
+            "POST /auth/login": (10, lambda: self.login(patient_email(self.rng.randrange(self.patients)))),
+            "POST /auth/patient/register": (5, self._register),
+        }
+
+    def _bearer(self, token: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    def _own_profile(self):
+        user_id, token = self.rng.choice(self.sessions)
+        return self.client.get(self.paths["profile"].replace("{user_id}", user_id), headers=self._bearer(token))
+
+    def _register(self):
+        self.registrations += 1
+        return self.client.post(self.paths["register"], json={
+            "email": f"load-{self.run_id}-{self.registrations}@bench.smartdoc.example.com", "password": SEED_PASSWORD,
+            "first_name": "Load", "last_name": "Test", "phone": "+2348000000000",
+            "date_of_birth": "1990-01-01", "gender": "female"
+        })
+
+async def _timed(stats: RouteStats, factory: Callable) -> None:
+    start = time.perf_counter()
+    try:
+        response = await factory()
+        status = response.status_code
+    except httpx.HTTPError:
+        status = None
+    stats.record(time.perf_counter() - start, status)
+
+async def run_mix(scenario: Scenario, concurrency: int, duration: float, warmup: float) -> Tuple[Dict[str, RouteStats], float]:
+    mix = scenario.requests()
+    names = list(mix)
+    weights = [mix[name][0] for name in names]
+    stats = {name: RouteStats() for name in names}
+    discard = {name: RouteStats() for name in names}
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def client_loop():
+        while (now := time.perf_counter()) < stop_at:
+            name = scenario.rng.choices(names, weights)[0]
+            await _timed(stats[name] if now >= measure_from else discard[name], mix[name][1])
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return stats, time.perf_counter() - measure_from
+
+async def run_login_storm(scenario: Scenario, clients: int, observers: int) -> Tuple[Dict[str, RouteStats], float]:
+    """Every client logs in at the same moment: the password-hashing pool and queue under a burst.
+
+    `observers` clients keep reading the directory meanwhile, measuring what the burst does
+    to routes that need no password hashing.
+    """
+    stats = RouteStats()
+    directory = {
+        "GET /hospitals (during storm)": lambda: scenario.client.get(scenario.paths["hospitals"], params={"limit": 50}),
+        "GET /doctors?specialization (during storm)": lambda: scenario.client.get(
+            scenario.paths["doctors"], params={"specialization": scenario.rng.choice(SPECIALIZATIONS), "limit": 50}),
+    }
+    background = {name: RouteStats() for name in directory}
+    emails = [patient_email(scenario.rng.randrange(scenario.patients)) for _ in range(clients)]
+    storm_over = asyncio.Event()
+
+    async def observer():
+        while not storm_over.is_set():
+            for name, factory in directory.items():
+                await _timed(background[name], factory)
+
+    started = time.perf_counter()
+    watching = [asyncio.create_task(observer()) for _ in range(observers)]
+    await asyncio.gather(*(_timed(stats, lambda email=email: scenario.login(email)) for email in emails))
+    duration = time.perf_counter() - started
+    storm_over.set()
+    await asyncio.gather(*watching)
+    return {"POST /auth/login (storm)": stats, **background}, duration
+
+def resolve_paths() -> Dict[str, str]:
+    from main import app
+    return {
+        "login": app.url_path_for("login"),
+        "register": app.url_path_for("create_patient_account"),
+        "hospitals": app.url_path_for("get_hospitals"),
+        "doctors": app.url_path_for("get_doctors"),
+        "doctor": app.url_path_for("get_doctor", doctor_id="{doctor_id}"),
+        "profile": app.url_path_for("get_user_profile", user_id="{user_id}"),
+        "profiles": app.url_path_for("get_all_profiles"),
+    }
+
+@contextmanager
+def serve(port: int, workers: int) -> Iterator[str]:
+    """Run main:app under uvicorn in a subprocess for the duration of the block"""
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    process = subprocess.Popen(command, cwd=APP_DIR, env=os.environ.copy())
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if process.poll() is not None:
+                raise SystemExit(f"uvicorn exited with code {process.returncode}")
+            try:
+                if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise SystemExit("The app did not become healthy within 60s")
+            time.sleep(0.25)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=APP_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run_metadata(options: Dict) -> Dict:
+    from app.config import settings
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain")),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "options": options,
+        "settings": {name: getattr(settings, name) for name in (
+            "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "PASSWORD_HASH_WORKERS", "PASSWORD_HASH_QUEUE_SIZE", "BCRYPT_ROUNDS",
+            "METRICS_ENABLED")},
+    }
+
+def save_results(results: Dict, output: Optional[str]) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        commit = results["meta"]["commit"][:10] or "nogit"
+        path = RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}-{results['meta']['options']['mode']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, default=str))
+    return path
+
+def print_table(routes: Dict[str, Dict]) -> None:
+    header = f"{'route':<44}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, summary in routes.items():
+        print(f"{name:<44}{summary['requests']:>8}{summary['errors']:>6}{summary['throughput_rps']:>9}"
+              f"{summary['p50_ms']:>9}{summary['p95_ms']:>9}{summary['p99_ms']:>9}")
+
+async def _drive(base_url: str, options: Dict) -> Dict:
+    paths = resolve_paths()
+    patients = int(VOLUMES["patients"] * options["scale"])
+    connections = options["concurrency"] + options["observers"]
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        scenario = Scenario(client, paths, patients, options["seed"])
+        if options["mode"] == "login-storm":
+            stats, duration = await run_login_storm(scenario, options["concurrency"], options["observers"])
+        else:
+            await scenario.prepare(options["sessions"])
+            stats, duration = await run_mix(scenario, options["concurrency"], options["duration"], options["warmup"])
+    total = RouteStats()
+    for route in stats.values():
+        total.latencies.extend(route.latencies)
+        total.errors += route.errors
+        for status, count in route.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+    return {
+        "duration_seconds": round(duration, 2),
+        "routes": {name: route.summary(duration) for name, route in stats.items() if route.latencies},
+        "total": total.summary(duration),
+    }
+
+def run(options: Dict) -> Path:
+    if options["url"]:
+        results = asyncio.run(_drive(options["url"], options))
+    else:
+        with serve(options["port"], options["workers"]) as base_url:
+            results = asyncio.run(_drive(base_url, options))
+    results = {"meta": run_metadata(options), **results}
+    print_table({**results["routes"], "TOTAL": results["total"]})
+    path = save_results(results, options["output"])
+    print(f"Results written to {path}")
+    return path
+
+def compare(baseline: str, candidate: str) -> None:
+    """Per-route p50/p95/p99 and throughput change from `baseline` to `candidate`"""
+    before, after = (json.loads(Path(path).read_text()) for path in (baseline, candidate))
+    print(f"{before['meta']['commit'][:10]} -> {after['meta']['commit'][:10]}")
+    header = f"{'route':<44}" + "".join(f"{metric:>18}" for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"))
+    print(header)
+    print("-" * len(header))
+    routes = {**after["routes"], "TOTAL": after["total"]}
+    for name, summary in routes.items():
+        previous = before["total"] if name == "TOTAL" else before["routes"].get(name)
+        if previous is None:
+            continue
+        cells = []
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = previous[metric], summary[metric]
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            cells.append(f"{new:>10} {change:>7}")
+        print(f"{name:<44}" + "".join(cells))
@@ -0,0 +1,93 @@
+"""Nearest-hospital matching: brute-force haversine over every hospital versus HospitalSpatialIndex.
+
+Runs in-process on deterministic synthetic hospitals (no database needed): most sit around
+the seed's cities, the rest anywhere on the globe, including the poles and the antimeridian.
+Every indexed answer is checked against the brute-force one before timings are reported.
+"""
+import heapq
+import json
+import math
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from app.geo import HospitalSpatialIndex, IndexedHospital, haversine_km
+from .seed import CITIES, SPECIALIZATIONS
+
+QUERY_COUNT = 500
+
+def build_hospitals(count: int, seed: int) -> List[IndexedHospital]:
+    rng = random.Random(seed)
+    hospitals = []
+    for index in range(count):
+        if rng.random() < 0.8:
+            _, _, latitude, longitude = rng.choice(CITIES)
+            latitude, longitude = latitude + rng.gauss(0, 1.5), longitude + rng.gauss(0, 1.5)
+        else:
+            latitude, longitude = math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180)
+        # A long tail, so some specialties are rare enough for the member scan
+        specialties = rng.sample(SPECIALIZATIONS[:8], 3) + rng.sample(SPECIALIZATIONS[8:], int(rng.random() < 0.02))
+        hospitals.append(IndexedHospital(
+            id=str(index), name=f"Hospital {index}", city=None, latitude=latitude, longitude=longitude,
+            specialties=frozenset(specialties), emergency_services=rng.random() < 0.4
+        ))
+    return hospitals
+
+def brute_force(hospitals: List[IndexedHospital], lat: float, lon: float, k: int,
+                predicate: Optional[Callable] = None, specialty: Optional[str] = None) -> List[Tuple[float, str]]:
+    return heapq.nsmallest(k, (
+        (haversine_km(lat, lon, hospital.latitude, hospital.longitude), hospital.id) for hospital in hospitals
+        if (specialty is None or specialty in hospital.specialties) and (predicate is None or predicate(hospital))
+    ))
+
+def _queries(seed: int) -> List[Tuple[float, float]]:
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(QUERY_COUNT):
+        if rng.random() < 0.8:
+            _, _, latitude, longitude = rng.choice(CITIES)
+            queries.append((latitude + rng.uniform(-2, 2), longitude + rng.uniform(-2, 2)))
+        else:
+            queries.append((math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180)))
+    return queries
+
+def _latencies_ms(func: Callable, queries: List[Tuple[float, float]]) -> Tuple[Dict[str, float], List]:
+    samples, answers = [], []
+    for lat, lon in queries:
+        start = time.perf_counter()
+        answers.append(func(lat, lon))
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }, answers
+
+def run(count: int = 50000, seed: int = 42, k: int = 10) -> Dict:
+    hospitals = build_hospitals(count, seed)
+    index = HospitalSpatialIndex()
+    started = time.perf_counter()
+    index.replace_all(hospitals)
+    build_ms = (time.perf_counter() - started) * 1000
+    queries = _queries(seed)
+    emergency = lambda hospital: hospital.emergency_services
+    
+    scenarios = {
+        "nearest": (None, None),
+        "specialty": (None, SPECIALIZATIONS[0]),
+        "rare_specialty": (None, SPECIALIZATIONS[-1]),
+        "emergency": (emergency, None),
+    }
+    results = {"hospitals": count, "k": k, "queries": len(queries), "index_build_ms": round(build_ms, 1), "scenarios": {}}
+    for name, (predicate, specialty) in scenarios.items():
+        brute, expected = _latencies_ms(lambda lat, lon: brute_force(hospitals, lat, lon, k, predicate, specialty), queries)
+        indexed, found = _latencies_ms(lambda lat, lon: index.nearest(lat, lon, k, predicate, None, specialty), queries)
+        for want, got in zip(expected, found):
+            if [round(distance, 6) for distance, _ in want] != [round(distance, 6) for distance, _ in got]:
+                raise SystemExit(f"{name}: indexed results differ from brute force")
+        results["scenarios"][name] = {
+            "brute_force": brute, "indexed": indexed, "speedup_p50": round(brute["p50_ms"] / indexed["p50_ms"], 1)
+        }
+    print(json.dumps(results, indent=2))
+    return results
@@ -0,0 +1,96 @@
+"""In-process micro-benchmarks for the hot paths that don't need a database.
+
+- serialization: a 100-doctor page through FastAPI's default response path versus
+  model_response (ORM objects) and rows_page_response (column-select Rows)
+- middleware: GET /health through the router with and without MetricsMiddleware
+"""
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from datetime import time as clock
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import result_tuple
+from app.models import UserStatus, Gender
+from app.pagination import Page
+from app.schemas.doctorSchema import DoctorResponse
+from app.serialization import model_response, rows_page_response
+
+PAGE_SIZE = 100
+
+def _doctors(count: int) -> List[SimpleNamespace]:
+    return [SimpleNamespace(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), hospital_id=uuid.uuid4(), first_name="Ada", last_name=f"Okafor{index}",
+        phone="+2348000000000", specialization="cardiology", sub_specialization=None,
+        available_days=["monday", "wednesday", "friday"], available_hours_start=clock(8), available_hours_end=clock(16),
+        bio="Consultant physician", gender=Gender.FEMALE, status=UserStatus.ACTIVE
+    ) for index in range(count)]
+
+def _time_per_call(func: Callable[[], object], repeat: int = 7, number: int = 200) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {"median_us": round(statistics.median(samples), 1), "min_us": round(min(samples), 1)}
+
+def serialization() -> Dict[str, Dict[str, float]]:
+    doctors = _doctors(PAGE_SIZE)
+    fields = list(DoctorResponse.model_fields)
+    make_row = result_tuple(fields)
+    rows = [make_row([getattr(doctor, name) for name in fields]) for doctor in doctors]
+    page = {"items": doctors, "next_cursor": "cursor"}
+
+    def fastapi_default():
+        # What a response_model endpoint does: validate, encode, then json.dumps
+        validated = Page[DoctorResponse].model_validate(
+            {"items": [DoctorResponse.model_validate(doctor, from_attributes=True) for doctor in doctors],
+             "next_cursor": "cursor"})
+        return JSONResponse(jsonable_encoder(validated)).body
+
+    return {
+        "fastapi_default": _time_per_call(fastapi_default),
+        "model_response": _time_per_call(lambda: model_response(Page[DoctorResponse], page).body),
+        "rows_page_response": _time_per_call(lambda: rows_page_response(rows, "cursor").body),
+    }
+
+async def _drive(app, calls: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/health", "raw_path": b"/health", "query_string": b"",
+             "headers": [], "root_path": "", "scheme": "http", "server": ("bench", 80), "client": ("bench", 1),
+             "http_version": "1.1", "asgi": {"version": "3.0"}}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / calls * 1e6
+
+def middleware(calls: int = 20000) -> Dict[str, float]:
+    from main import app
+    from app.metrics import MetricsMiddleware
+
+    async def measure():
+        router = app.router
+        instrumented = MetricsMiddleware(router)
+        await _drive(router, 1000)
+        await _drive(instrumented, 1000)
+        return {"router_us": await _drive(router, calls), "with_metrics_us": await _drive(instrumented, calls)}
+
+    results = asyncio.run(measure())
+    results["overhead_us"] = results["with_metrics_us"] - results["router_us"]
+    return {name: round(value, 1) for name, value in results.items()}
+
+def run() -> Dict:
+    results = {"serialization": serialization(), "middleware": middleware()}
+    print(json.dumps(results, indent=2))
+    return results
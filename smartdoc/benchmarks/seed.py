@@ -0,0 +1,170 @@
+"""Deterministic benchmark data: hospitals, doctors, patients, medical histories and consultations.
+
+Every seeded account shares SEED_PASSWORD, hashed once, so seeding stays fast while logins
+still pay the full bcrypt cost. The schema is created from the models; point DATABASE_URL
+at a disposable database whose name contains "bench".
+"""
+import random
+import time
+import uuid
+from datetime import date, datetime, time as clock, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.db.db import Base
+from app.models import (
+    UserRole, UserStatus, Gender, BloodGroup, SubscriptionStatus, ConsultationStatus, ConsultationType
+)
+from app.models.user import User
+from app.models.hospital import Hospital
+from app.models.Doctor import Doctor
+from app.models.Patient import Patient
+from app.models.consultation import Consultation
+from app.models.medical_history import MedicalHistory
+from app.security import get_password_hash
+
+SEED_PASSWORD = "Bench-password-1"
+ADMIN_EMAIL = "admin@bench.smartdoc.example.com"
+BATCH_SIZE = 5000
+
+# Rows per unit of --scale
+VOLUMES = {"hospitals": 50, "doctors_per_hospital": 20, "patients": 5000, "consultations_per_patient": 4}
+
+SPECIALIZATIONS = [
+    "cardiology", "dermatology", "endocrinology", "gastroenterology", "general practice", "neurology",
+    "obstetrics", "oncology", "ophthalmology", "orthopedics", "pediatrics", "psychiatry", "urology"
+]
+CITIES = [
+    ("Lagos", "Lagos", 6.5244, 3.3792), ("Abuja", "FCT", 9.0765, 7.3986), ("Ibadan", "Oyo", 7.3775, 3.9470),
+    ("Kano", "Kano", 12.0022, 8.5920), ("Port Harcourt", "Rivers", 4.8156, 7.0498), ("Enugu", "Enugu", 6.4584, 7.5464)
+]
+FIRST_NAMES = ["Ada", "Bola", "Chidi", "Dayo", "Emeka", "Funmi", "Gbenga", "Halima", "Ifeoma", "Jide", "Kemi",
+               "Lanre", "Musa", "Ngozi", "Ola", "Tunde", "Uche", "Yemi", "Zainab"]
+LAST_NAMES = ["Adeyemi", "Bello", "Chukwu", "Danjuma", "Eze", "Fashola", "Garba", "Ibrahim", "Johnson", "Kalu",
+              "Lawal", "Mohammed", "Nwosu", "Okafor", "Okoro", "Olawale", "Suleiman", "Uzor", "Yusuf"]
+ALLERGIES = ["penicillin", "peanuts", "latex", "sulfa", "shellfish", "pollen", "aspirin"]
+CONDITIONS = ["hypertension", "asthma", "diabetes", "sickle cell", "migraine", "arthritis"]
+MEDICATIONS = ["amlodipine", "metformin", "salbutamol", "lisinopril", "ibuprofen", "folic acid"]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+
+def doctor_email(index: int) -> str:
+    return f"doctor{index}@bench.smartdoc.example.com"
+
+def patient_email(index: int) -> str:
+    return f"patient{index}@bench.smartdoc.example.com"
+
+def hospital_email(index: int) -> str:
+    return f"hospital{index}@bench.smartdoc.example.com"
+
+def check_disposable(url: str) -> None:
+    database = make_url(url).database or ""
+    if "bench" not in database:
+        raise SystemExit(f"Refusing to reset database {database!r}: its name must contain 'bench'")
+
+async def _insert(connection, model, rows: List[Dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await connection.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+def build_rows(scale: float, seed: int) -> Dict[str, List[Dict]]:
+    rng = random.Random(seed)
+    password_hash = get_password_hash(SEED_PASSWORD)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    def person() -> Dict:
+        return {"first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES),
+                "phone": f"+234{rng.randrange(10**9, 10**10)}"}
+
+    def user(email: str, role: UserRole) -> Dict:
+        return {"id": uuid.uuid4(), "email": email, "hashed_password": password_hash, "role": role,
+                "status": UserStatus.ACTIVE, "is_verified": True}
+
+    users = [user(ADMIN_EMAIL, UserRole.ADMIN)]
+    hospitals, doctors, patients, histories, consultations = [], [], [], [], []
+
+    for index in range(max(1, int(VOLUMES["hospitals"] * scale))):
+        account = user(hospital_email(index), UserRole.HOSPITAL)
+        city, state, latitude, longitude = rng.choice(CITIES)
+        users.append(account)
+        hospitals.append({
+            "id": uuid.uuid4(), "user_id": account["id"], "name": f"{city} {rng.choice(LAST_NAMES)} Hospital {index}",
+            "phone": f"+234{rng.randrange(10**9, 10**10)}", "address": f"{rng.randrange(1, 300)} Hospital Road",
+            "city": city, "state": state, "country": "Nigeria", "postal_code": f"{rng.randrange(100000, 999999)}",
+            "latitude": round(latitude + rng.uniform(-0.2, 0.2), 6),
+            "longitude": round(longitude + rng.uniform(-0.2, 0.2), 6),
+            "registration_number": f"BENCH-{index:06d}", "specialties": rng.sample(SPECIALIZATIONS, 4),
+            "emergency_services": rng.random() < 0.4, "bed_capacity": rng.randrange(20, 800),
+            "status": UserStatus.ACTIVE, "subscription_status": SubscriptionStatus.ACTIVE
+        })
+
+    for index in range(len(hospitals) * VOLUMES["doctors_per_hospital"]):
+        account = user(doctor_email(index), UserRole.DOCTOR)
+        users.append(account)
+        start_hour = rng.choice([7, 8, 9])
+        doctors.append({
+            "id": uuid.uuid4(), "user_id": account["id"], "hospital_id": hospitals[index % len(hospitals)]["id"],
+            **person(), "gender": rng.choice(list(Gender)), "specialization": rng.choice(SPECIALIZATIONS),
+            "available_days": rng.sample(WEEKDAYS, 4), "available_hours_start": clock(start_hour),
+            "available_hours_end": clock(start_hour + 8), "bio": "Consultant physician", "status": UserStatus.ACTIVE
+        })
+
+    for index in range(max(1, int(VOLUMES["patients"] * scale))):
+        account = user(patient_email(index), UserRole.PATIENT)
+        city, state, _, _ = rng.choice(CITIES)
+        users.append(account)
+        patient_id = uuid.uuid4()
+        patients.append({
+            "id": patient_id, "user_id": account["id"], **person(),
+            "date_of_birth": date(1950, 1, 1) + timedelta(days=rng.randrange(0, 26000)),
+            "gender": rng.choice([Gender.MALE, Gender.FEMALE]), "city": city, "state": state, "country": "Nigeria",
+            "blood_group": rng.choice(list(BloodGroup))
+        })
+        histories.append({
+            "id": uuid.uuid4(), "patient_id": patient_id,
+            "allergies": rng.sample(ALLERGIES, rng.randrange(0, 3)),
+            "chronic_conditions": rng.sample(CONDITIONS, rng.randrange(0, 2)),
+            "current_medications": [{"name": name} for name in rng.sample(MEDICATIONS, rng.randrange(0, 3))]
+        })
+
+    # Each doctor's consultations sit in consecutive half-hour slots, so no two share a slot
+    slots_used: Dict[int, int] = {}
+    slot = timedelta(minutes=settings.CONSULTATION_SLOT_MINUTES)
+    origin = now - timedelta(days=60)
+    for patient in patients:
+        for _ in range(VOLUMES["consultations_per_patient"]):
+            doctor_index = rng.randrange(len(doctors))
+            doctor = doctors[doctor_index]
+            scheduled_at = origin + slots_used.get(doctor_index, 0) * slot
+            slots_used[doctor_index] = slots_used.get(doctor_index, 0) + 1
+            consultations.append({
+                "id": uuid.uuid4(), "patient_id": patient["id"], "doctor_id": doctor["id"],
+                "hospital_id": doctor["hospital_id"], "consultation_type": ConsultationType.DIRECT_BOOKING,
+                "symptoms": "Headache and fatigue", "scheduled_at": scheduled_at,
+                "status": ConsultationStatus.COMPLETED if scheduled_at < now else ConsultationStatus.SCHEDULED
+            })
+
+    return {"users": users, "hospitals": hospitals, "doctors": doctors, "patients": patients,
+            "medical_history": histories, "consultations": consultations}
+
+async def seed(scale: float = 1.0, seed: int = 42, reset: bool = True) -> Dict[str, int]:
+    if reset:
+        check_disposable(settings.DATABASE_URL)
+    started = time.perf_counter()
+    rows = build_rows(scale, seed)
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            if reset:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+            for model, key in ((User, "users"), (Hospital, "hospitals"), (Doctor, "doctors"), (Patient, "patients"),
+                               (MedicalHistory, "medical_history"), (Consultation, "consultations")):
+                await _insert(connection, model, rows[key])
+            await connection.execute(text("ANALYZE"))
+    finally:
+        await engine.dispose()
+    counts = {key: len(value) for key, value in rows.items()}
+    print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+    return counts
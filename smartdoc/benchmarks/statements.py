@@ -0,0 +1,56 @@
+"""SQL statements per request for the write paths, counted in-process against the seeded database.
+
+Each registration should be its INSERTs and nothing else: no email pre-check and no
+refresh() SELECT after the commit. The doctor registration adds the hospital lookup.
+"""
+import asyncio
+import json
+import uuid
+from typing import Dict
+import httpx
+from app.profiling import record_statements, statement_shape
+from .seed import SEED_PASSWORD
+
+def _payloads(hospital_id: str) -> Dict[str, tuple]:
+    tag = uuid.uuid4().hex[:10]
+    person = {"first_name": "Stmt", "last_name": "Count", "phone": "+2348000000000"}
+    return {
+        "POST /auth/patient/register": ("create_patient_account", {
+            **person, "email": f"stmt-patient-{tag}@bench.smartdoc.example.com", "password": SEED_PASSWORD,
+            "date_of_birth": "1990-01-01", "gender": "female"}),
+        "POST /auth/doctor/register": ("create_doctor_account", {
+            **person, "email": f"stmt-doctor-{tag}@bench.smartdoc.example.com", "password": SEED_PASSWORD,
+            "hospital_id": hospital_id, "specialization": "cardiology"}),
+        "POST /auth/hospital/register": ("create_hospital_account", {
+            "name": f"Statement Count Hospital {tag}", "phone": "+2348000000000", "address": "1 Bench Road",
+            "city": "Lagos", "state": "Lagos", "country": "Nigeria", "postal_code": "100001",
+            "registration_number": f"STMT-{tag}", "email": f"stmt-hospital-{tag}@bench.smartdoc.example.com",
+            "password": SEED_PASSWORD}),
+    }
+
+async def _measure() -> Dict[str, Dict]:
+    from main import app
+    from app.db.db import engine
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            hospitals = await client.get(app.url_path_for("get_hospitals"), params={"limit": 1, "fields": "id"})
+            hospitals.raise_for_status()
+            hospital_id = hospitals.json()["items"][0]["id"]
+            for name, (endpoint, payload) in _payloads(hospital_id).items():
+                with record_statements() as recorder:
+                    response = await client.post(app.url_path_for(endpoint), json=payload)
+                results[name] = {"status": response.status_code, "statements": recorder.count,
+                                 "shapes": [statement_shape(statement)[:120] for statement in recorder.statements]}
+    finally:
+        await engine.dispose()
+    return results
+
+def run() -> Dict[str, Dict]:
+    results = asyncio.run(_measure())
+    for name, result in results.items():
+        print(f"{name:<34}{result['status']:>5}{result['statements']:>4} statements")
+        for shape in result["shapes"]:
+            print(f"    {shape}")
+    return results
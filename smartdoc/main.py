@@ -1,11 +1,32 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from app.api.__init__ import api_router
+from app.security import shutdown_password_hasher
+from app.config import settings
+from app.db.db import engine, replica_pool, warm_up_pool, pool_status
+from app.db.redis import init_redis, close_redis
+from app.serialization import FastJSONResponse
+from app.profiling import QueryDebugMiddleware
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_redis()
+    await warm_up_pool(settings.DB_POOL_WARMUP_CONNECTIONS)
+    await replica_pool.start()
+    yield
+    await replica_pool.stop()
+    await close_redis()
+    await engine.dispose()
+    shutdown_password_hasher()
 
 app = FastAPI(
     title="Medical App API",
     description="API for medical consultation application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -17,6 +38,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Development only: statement counts and N+1 hints on every response
+if settings.SQL_DEBUG_HEADERS:
+    app.add_middleware(QueryDebugMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -26,4 +54,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/db")
+async def database_health():
+    """Connection pool occupancy and checkout wait times"""
+    return pool_status()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
\ No newline at end of file
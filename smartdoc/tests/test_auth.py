@@ -0,0 +1,25 @@
+from app.models import UserRole
+from app.repositories import userRepository
+from app.repositories.userRepository import UserRepository
+from tests.conftest import PASSWORD, create_user
+
+async def test_authenticate_holds_no_connection_while_hashing(db, monkeypatch):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    verify = userRepository.verify_and_update_password_async
+    
+    async def checked_verify(password, hashed_password):
+        assert not db.in_transaction(), "a pooled connection is pinned during bcrypt"
+        return await verify(password, hashed_password)
+    
+    monkeypatch.setattr(userRepository, "verify_and_update_password_async", checked_verify)
+    assert (await UserRepository(db).authenticate(user.email, PASSWORD)).id == user.id
+    assert await UserRepository(db).authenticate(user.email, "wrong-password") is None
+
+async def test_login(client, db):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    response = await client.post(client.app.url_path_for("login"), json={"email": user.email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    await db.refresh(user)
+    assert user.last_login is not None
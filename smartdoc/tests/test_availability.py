@@ -0,0 +1,131 @@
+from datetime import datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+import pytest
+from app.availability import AvailabilityIndex, DoctorSchedule, availability_index
+from app.config import settings
+from tests.conftest import consultation_row, create_consultation, create_doctor, create_hospital, create_patient
+
+MONDAY = datetime(2030, 1, 7, tzinfo=timezone.utc)
+
+def _schedule(doctor_id="d1", days=("monday", "tuesday"), start=time(9), end=time(12), hospital_id="h1",
+              specialization="Cardiology") -> DoctorSchedule:
+    return DoctorSchedule.from_doctor(SimpleNamespace(
+        id=doctor_id, hospital_id=hospital_id, specialization=specialization, available_days=list(days),
+        available_hours_start=start, available_hours_end=end
+    ))
+
+def _index(*schedules, bookings=(), tz="UTC") -> AvailabilityIndex:
+    index = AvailabilityIndex(slot_minutes=30, tz=tz, max_age_seconds=60)
+    index.replace_all(schedules, bookings)
+    return index
+
+def _slots(index, start, hours, **filters):
+    return {schedule.doctor_id: slots for schedule, slots in index.search(start, start + timedelta(hours=hours), **filters)}
+
+def _at(hour: int, minute: int = 0, day: datetime = MONDAY) -> datetime:
+    return day.replace(hour=hour, minute=minute)
+
+def test_working_hours_mask():
+    index = _index(_schedule(start=time(9, 15), end=time(12, 10)))
+    # 09:15 rounds up to the 09:30 slot; the 12:00 slot would end after 12:10
+    assert _slots(index, MONDAY, 24)["d1"] == [_at(9, 30), _at(10), _at(10, 30), _at(11), _at(11, 30)]
+    assert index.in_working_hours("d1", _at(9)) is False
+    assert index.in_working_hours("d1", _at(11, 30)) is True
+    assert index.in_working_hours("d1", _at(12)) is False
+    # Wednesday is not a working day
+    assert index.in_working_hours("d1", _at(10, day=MONDAY + timedelta(days=2))) is False
+    assert index.in_working_hours("unknown", _at(10)) is None
+
+def test_no_schedule_without_hours_or_days():
+    assert _schedule(days=()) is None
+    assert _schedule(start=None) is None
+    index = _index(_schedule(start=time(12), end=time(9)))
+    assert _slots(index, MONDAY, 24) == {}
+
+def test_slot_already_under_way_is_not_offered():
+    index = _index(_schedule())
+    assert _slots(index, _at(10, 10), 1)["d1"] == [_at(10, 30), _at(11)]
+    assert _slots(index, _at(10), 1)["d1"] == [_at(10), _at(10, 30)]
+
+def test_window_end_is_exclusive():
+    index = _index(_schedule())
+    assert _slots(index, _at(9), 1)["d1"] == [_at(9), _at(9, 30)]
+    assert _slots(index, _at(9), 1.01)["d1"] == [_at(9), _at(9, 30), _at(10)]
+
+def test_bookings_and_cancellations_update_free_slots():
+    index = _index(_schedule(), bookings=[("d1", _at(9))])
+    assert _slots(index, _at(9), 1.5)["d1"] == [_at(9, 30), _at(10)]
+    index.book("d1", _at(9, 30))
+    assert _slots(index, _at(9), 1.5)["d1"] == [_at(10)]
+    index.release("d1", _at(9))
+    assert _slots(index, _at(9), 1.5)["d1"] == [_at(9), _at(10)]
+    index.book("d1", _at(9))
+    index.book("d1", _at(10))
+    assert _slots(index, _at(9), 1.5) == {}
+
+def test_unloaded_index_ignores_bookings():
+    index = AvailabilityIndex(slot_minutes=30, tz="UTC", max_age_seconds=60)
+    index.book("d1", _at(9))
+    index.replace_all([_schedule()], [])
+    assert _at(9) in _slots(index, _at(9), 1)["d1"]
+
+def test_window_spanning_days():
+    index = _index(_schedule(days=("monday", "tuesday", "wednesday"), start=time(0), end=time(1)))
+    # Monday 23:00 to Wednesday 00:45: all of Tuesday's hour and the Wednesday slots starting before 00:45
+    slots = _slots(index, _at(23), 25.75)["d1"]
+    tuesday, wednesday = MONDAY + timedelta(days=1), MONDAY + timedelta(days=2)
+    assert slots == [_at(0, 0, tuesday), _at(0, 30, tuesday), _at(0, 0, wednesday), _at(0, 30, wednesday)]
+
+def test_days_follow_the_clinic_timezone():
+    # Lagos is UTC+1: Monday 09:00 local is 08:00 UTC, and Sunday 23:30 UTC is already Monday
+    index = _index(_schedule(days=("monday",), start=time(0), end=time(9, 30)), tz="Africa/Lagos")
+    slots = _slots(index, MONDAY - timedelta(hours=1), 24)["d1"]
+    assert slots[0] == datetime(2030, 1, 6, 23, 0, tzinfo=timezone.utc)
+    assert slots[-1] == _at(8)
+    assert slots[0].astimezone(ZoneInfo("Africa/Lagos")).weekday() == 0
+
+def test_filters_and_limit():
+    index = _index(
+        _schedule("d1"), _schedule("d2", hospital_id="h2"), _schedule("d3", specialization="Neurology")
+    )
+    assert set(_slots(index, _at(9), 1)) == {"d1", "d2", "d3"}
+    assert set(_slots(index, _at(9), 1, specialization="CARDIOLOGY")) == {"d1", "d2"}
+    assert set(_slots(index, _at(9), 1, specialization="cardiology", hospital_id="h2")) == {"d2"}
+    assert len(_slots(index, _at(9), 1, limit=2)) == 2
+
+async def _availability(client, **params):
+    return await client.get(client.app.url_path_for("get_doctor_availability"), params=params)
+
+async def test_endpoint_clamps_the_window_to_now(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    now = datetime.now(timezone.utc)
+    response = await _availability(client, start=(now - timedelta(days=2)).isoformat(), hours=49)
+    assert response.status_code == 200, response.text
+    slots = [slot for item in response.json() if item["doctor_id"] == str(doctor.id) for slot in item["slots"]]
+    assert slots and all(datetime.fromisoformat(slot) >= now for slot in slots)
+
+async def test_endpoint_rejects_a_start_past_the_horizon(client, database):
+    start = datetime.now(timezone.utc) + timedelta(days=settings.AVAILABILITY_HORIZON_DAYS, hours=1)
+    response = await _availability(client, start=start.isoformat())
+    assert response.status_code == 422
+
+async def test_endpoint_stops_at_the_horizon_and_sees_bookings(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    booked = await create_consultation(db, patient, doctor)
+    horizon = datetime.now(timezone.utc) + timedelta(days=settings.AVAILABILITY_HORIZON_DAYS)
+    availability_index.invalidate()
+    
+    response = await _availability(client, start=(horizon - timedelta(hours=2)).isoformat(), hours=48)
+    assert response.status_code == 200, response.text
+    [item] = [item for item in response.json() if item["doctor_id"] == str(doctor.id)]
+    assert max(datetime.fromisoformat(slot) for slot in item["slots"]) < horizon
+    
+    start = booked.scheduled_at - timedelta(hours=1)
+    response = await _availability(client, start=start.isoformat(), hours=2)
+    [item] = [item for item in response.json() if item["doctor_id"] == str(doctor.id)]
+    slots = [datetime.fromisoformat(slot) for slot in item["slots"]]
+    assert booked.scheduled_at not in slots and booked.scheduled_at + timedelta(minutes=30) in slots
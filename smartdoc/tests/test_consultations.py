@@ -0,0 +1,55 @@
+import asyncio
+from sqlalchemy import func, select
+from app.models.consultation import Consultation
+from app.models.user import User
+from tests.conftest import auth_headers, consultation_row, create_doctor, create_hospital, create_patient
+
+PATIENTS = 8
+
+async def _booking_clients(db, count: int):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patients = [await create_patient(db) for _ in range(count)]
+    users = {user.id: user for user in (await db.execute(select(User))).scalars()}
+    return doctor, [auth_headers(users[patient.user_id]) for patient in patients], patients
+
+async def test_parallel_bookings_for_one_slot_admit_exactly_one(client, db):
+    doctor, headers, patients = await _booking_clients(db, PATIENTS)
+    scheduled_at = consultation_row(patients[0], doctor).scheduled_at.isoformat()
+    path = client.app.url_path_for("book_consultation")
+    responses = await asyncio.gather(*(
+        client.post(path, json={"doctor_id": str(doctor.id), "scheduled_at": scheduled_at}, headers=patient_headers)
+        for patient_headers in headers
+    ))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [201] + [409] * (PATIENTS - 1), [response.text for response in responses]
+    booked = await db.scalar(select(func.count()).select_from(Consultation).where(Consultation.doctor_id == doctor.id))
+    assert booked == 1
+
+async def test_parallel_bookings_for_different_slots_all_succeed(client, db):
+    doctor, headers, patients = await _booking_clients(db, 3)
+    path = client.app.url_path_for("book_consultation")
+    responses = await asyncio.gather(*(
+        client.post(path, headers=patient_headers, json={
+            "doctor_id": str(doctor.id),
+            # Earlier slots, so none runs past the doctor's 23:30 end of day
+            "scheduled_at": consultation_row(patients[0], doctor, slot=-index).scheduled_at.isoformat()
+        })
+        for index, patient_headers in enumerate(headers)
+    ))
+    assert [response.status_code for response in responses] == [201, 201, 201], [response.text for response in responses]
+
+async def test_cancelled_slot_can_be_booked_again(client, db):
+    doctor, headers, patients = await _booking_clients(db, 2)
+    scheduled_at = consultation_row(patients[0], doctor).scheduled_at.isoformat()
+    body = {"doctor_id": str(doctor.id), "scheduled_at": scheduled_at}
+    path = client.app.url_path_for("book_consultation")
+    
+    first = await client.post(path, json=body, headers=headers[0])
+    assert first.status_code == 201, first.text
+    assert (await client.post(path, json=body, headers=headers[1])).status_code == 409
+    response = await client.post(client.app.url_path_for("cancel_consultation", consultation_id=first.json()["id"]),
+                                 headers=headers[0])
+    assert response.status_code == 200, response.text
+    response = await client.post(path, json=body, headers=headers[1])
+    assert response.status_code == 201, response.text
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from app.models import UserStatus
+from app.models.user import User
+from app.models.hospital import Hospital
+from app.models.Doctor import Doctor
+from app.repositories.doctorRepository import DoctorRepository
+from benchmarks.seed import build_rows
+
+@pytest.fixture
+async def seeded(db):
+    """The benchmark seed's hospitals and doctors (1000 at scale 1), analyzed so the planner sees them"""
+    rows = build_rows(scale=1.0, seed=42)
+    account_ids = {row["user_id"] for row in rows["hospitals"] + rows["doctors"]}
+    await db.execute(insert(User), [row for row in rows["users"] if row["id"] in account_ids])
+    await db.execute(insert(Hospital), rows["hospitals"])
+    await db.execute(insert(Doctor), rows["doctors"])
+    await db.commit()
+    await db.execute(text("ANALYZE users, hospitals, doctors"))
+    return rows
+
+async def _plan(db, **filters) -> str:
+    """EXPLAIN the statement DoctorRepository.get_all sends for `filters`, with the parameters it binds.
+
+    asyncpg runs it as a prepared statement, and Postgres plans a prepared statement with its
+    parameter values (a custom plan) unless a generic plan proves as cheap, so this is the plan
+    the endpoint gets: the LIKE prefix and the keyset row are known to the planner.
+    """
+    sent = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM doctors" in statement:
+            sent.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        rows, cursor = await DoctorRepository(db).get_all(**filters)
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+    assert rows
+    [(statement, parameters)] = sent
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return "\n".join(row[0] for row in result)
+
+@pytest.mark.parametrize("filters, index", [
+    ({}, "ix_doctors_last_name_id"),
+    ({"specialization": "cardiology"}, "ix_doctors_specialization_last_name_id"),
+    ({"specialization": "cardiology", "status": UserStatus.ACTIVE}, "ix_doctors_specialization_last_name_id"),
+    ({"name_prefix": "oka"}, "ix_doctors_last_name_lower_pattern"),
+])
+async def test_get_all_uses_an_index(db, seeded, filters, index):
+    plan = await _plan(db, **filters)
+    assert index in plan, plan
+    assert "Seq Scan on doctors" not in plan, plan
+
+async def test_hospital_filter_uses_hospital_index(db, seeded):
+    hospital_id = str(seeded["hospitals"][0]["id"])
+    plan = await _plan(db, hospital_id=hospital_id, specialization=seeded["doctors"][0]["specialization"])
+    assert "ix_doctors_hospital_id_specialization_last_name_id" in plan, plan
+    plan = await _plan(db, hospital_id=hospital_id)
+    assert "ix_doctors_hospital_id_" in plan and "Seq Scan on doctors" not in plan, plan
+
+async def test_later_pages_seek_the_keyset_index(db, seeded):
+    _, cursor = await DoctorRepository(db).get_all(limit=20)
+    plan = await _plan(db, cursor=cursor, limit=20)
+    assert "Index Scan using ix_doctors_last_name_id" in plan and "Index Cond: (ROW(" in plan, plan
+    assert "Sort" not in plan, plan
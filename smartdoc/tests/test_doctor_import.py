@@ -0,0 +1,118 @@
+import json
+from sqlalchemy import select
+from app.config import settings
+from app.mail import OUTBOX_KEY
+from app.models import UserRole
+from app.models.Doctor import Doctor
+from app.models.user import User
+from app.services import doctorImportService
+from tests.conftest import PASSWORD, auth_headers, create_hospital, create_user
+
+HEADER = "email,password,first_name,last_name,phone,specialization,available_days,bio"
+
+async def _import(client, hospital, content: bytes, filename: str = "doctors.csv"):
+    response = await client.post(
+        client.app.url_path_for("import_doctors"), headers=auth_headers(User(id=hospital.user_id)),
+        files={"file": (filename, content, "application/octet-stream")}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _statuses(report):
+    return {result["row"]: result["status"] for result in report["rows"]}
+
+async def _doctors(db, hospital):
+    result = await db.execute(select(Doctor).where(Doctor.hospital_id == hospital.id).order_by(Doctor.first_name))
+    return result.scalars().all()
+
+async def test_csv_import_report(client, db, redis):
+    hospital = await create_hospital(db)
+    existing = await create_user(db, UserRole.PATIENT, email="taken@example.com")
+    await db.commit()
+    rows = [
+        HEADER,
+        f'ada@example.com,{PASSWORD},Ada,Okafor,+2348000000001,cardiology,"monday; wednesday","Line one',
+        'line two, with a comma"',
+        f'{existing.email},{PASSWORD},Bola,Bello,+2348000000002,cardiology,,',
+        f'ADA@example.com,{PASSWORD},Ada,Again,+2348000000003,cardiology,,',
+        'broken@example.com,,Chidi',
+        'nopass@example.com,,Dayo,Eze,+2348000000004,neurology,friday,',
+        f'invalid@example.com,{PASSWORD},Emeka,,+2348000000005,,,',
+    ]
+    report = await _import(client, hospital, ("﻿" + "\r\n".join(rows) + "\r\n").encode())
+    
+    assert _statuses(report) == {1: "created", 2: "duplicate", 3: "duplicate", 4: "invalid", 5: "created", 6: "invalid"}
+    assert {key: report[key] for key in ("created", "invalid", "duplicate", "failed")} == {
+        "created": 2, "invalid": 2, "duplicate": 2, "failed": 0}
+    assert report["rows"][1]["errors"] == "Email already registered"
+    assert report["rows"][2]["errors"] == "Email appears earlier in the file"
+    assert report["rows"][3]["errors"] == "Expected 8 columns, got 3"
+    
+    ada, dayo = await _doctors(db, hospital)
+    assert ada.bio == "Line one\nline two, with a comma"
+    assert ada.available_days == ["monday", "wednesday"]
+    assert dayo.first_name == "Dayo"
+    
+    # The password-less row gets an invitation: a long-lived reset token and an email
+    [key] = await redis.keys("reset_token:*")
+    assert await redis.get(key) == str(dayo.user_id)
+    assert 0 < await redis.ttl(key) <= settings.DOCTOR_INVITE_TTL_SECONDS
+    [message] = [json.loads(item) for item in await redis.lrange(OUTBOX_KEY, 0, -1)]
+    assert message["to"] == "nopass@example.com" and message["body"].endswith(key.split(":", 1)[1])
+
+async def test_unterminated_quote_is_reported(client, db):
+    hospital = await create_hospital(db)
+    content = f'{HEADER}\nada@example.com,{PASSWORD},Ada,Okafor,+2348000000001,cardiology,,"never closed\nmore'.encode()
+    report = await _import(client, hospital, content)
+    assert report["rows"] == [{"row": 1, "status": "invalid", "email": None, "doctor_id": None,
+                               "errors": "Unterminated quoted field"}]
+
+async def test_utf8_split_across_chunks(client, db, monkeypatch):
+    monkeypatch.setattr(doctorImportService, "READ_CHUNK_SIZE", 5)
+    hospital = await create_hospital(db)
+    content = f'{HEADER}\nzoe@example.com,{PASSWORD},Zoë,Nwọsu,+2348000000001,cardiology,,Ọ̀ṣun 日本\n'.encode()
+    report = await _import(client, hospital, content)
+    assert report["created"] == 1, report
+    [doctor] = await _doctors(db, hospital)
+    assert (doctor.first_name, doctor.last_name, doctor.bio) == ("Zoë", "Nwọsu", "Ọ̀ṣun 日本")
+
+async def test_invalid_utf8_stops_the_import(client, db):
+    hospital = await create_hospital(db)
+    content = f'{HEADER}\nada@example.com,{PASSWORD},Ada,Okafor,+2348000000001,cardiology,,\n'.encode() + b"\xff\xfe,,\n"
+    report = await _import(client, hospital, content)
+    assert report["created"] == 1
+    assert report["rows"][-1]["errors"] == "File is not valid UTF-8; this and later rows were not imported"
+
+async def test_max_rows_cutoff(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "DOCTOR_IMPORT_MAX_ROWS", 2)
+    hospital = await create_hospital(db)
+    rows = [f"doctor{index}@example.com,{PASSWORD},Ada,Okafor{index},+2348000000001,cardiology,," for index in range(4)]
+    report = await _import(client, hospital, "\n".join([HEADER, *rows]).encode())
+    assert _statuses(report) == {1: "created", 2: "created", 3: "invalid"}
+    assert report["rows"][-1]["errors"] == "Imports are limited to 2 rows"
+    assert len(await _doctors(db, hospital)) == 2
+
+async def test_ndjson_import(client, db):
+    hospital = await create_hospital(db)
+    lines = [
+        json.dumps({"email": "ada@example.com", "password": PASSWORD, "first_name": "Ada", "last_name": "Okafor",
+                    "phone": "+2348000000001", "specialization": "cardiology", "available_days": ["monday"]}),
+        "",
+        "{not json",
+        "[1, 2]",
+    ]
+    report = await _import(client, hospital, "\n".join(lines).encode(), filename="doctors.ndjson")
+    assert _statuses(report) == {1: "created", 2: "invalid", 3: "invalid"}
+    assert report["rows"][1]["errors"].startswith("Invalid JSON")
+    assert report["rows"][2]["errors"] == "Each line must be a JSON object"
+
+async def test_a_row_the_database_refuses_fails_alone(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "DOCTOR_IMPORT_BATCH_SIZE", 3)
+    hospital = await create_hospital(db)
+    rows = [f"doctor{index}@example.com,{PASSWORD},Ada,Okafor{index},+2348000000001,cardiology,," for index in range(6)]
+    # Longer than doctors.phone allows
+    rows[1] = rows[1].replace("+2348000000001", "+234" + "0" * 30)
+    report = await _import(client, hospital, "\n".join([HEADER, *rows]).encode())
+    assert _statuses(report) == {1: "created", 2: "failed", 3: "created", 4: "created", 5: "created", 6: "created"}
+    assert report["rows"][1]["errors"] == "Row could not be saved"
+    assert len(await _doctors(db, hospital)) == 5
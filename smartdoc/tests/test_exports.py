@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from decimal import Decimal
+import pytest
+from app.config import settings
+from app.models import BloodGroup, UserRole
+from app.models.Doctor import Doctor
+from app.models.hospital import Hospital
+from app.models.Patient import Patient
+from app.models.user import User
+from tests.conftest import auth_headers, create_doctor, create_hospital, create_patient, create_user
+
+async def _export(client, db, name: str, **params):
+    admin = await create_user(db, UserRole.ADMIN)
+    await db.commit()
+    return await client.get(client.app.url_path_for(name), params=params, headers=auth_headers(admin))
+
+async def test_hospitals_ndjson(client, db):
+    hospital = await create_hospital(db)
+    response = await _export(client, db, "export_hospitals")
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="hospitals.ndjson"'
+    [row] = [json.loads(line) for line in response.text.splitlines()]
+    assert list(row) == [column.key for column in Hospital.__table__.columns]
+    assert row["id"] == str(hospital.id) and row["user_id"] == str(hospital.user_id)
+    assert row["status"] == "active" and row["subscription_status"] == hospital.subscription_status.value
+    assert Decimal(row["latitude"]) == Decimal("6.5") and isinstance(row["latitude"], str)
+    assert row["specialties"] == ["cardiology"]
+    assert row["created_at"] == hospital.created_at.isoformat()
+
+async def test_doctors_csv_in_batches(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    hospital = await create_hospital(db)
+    doctors = [await create_doctor(db, hospital) for _ in range(3)]
+    await create_doctor(db, await create_hospital(db, name="Other Hospital"))
+    
+    response = await _export(client, db, "export_doctors", format="csv", hospital_id=str(hospital.id))
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == [column.key for column in Doctor.__table__.columns]
+    assert sorted(row[0] for row in rows) == sorted(str(doctor.id) for doctor in doctors)
+    row = dict(zip(header, rows[0]))
+    assert row["gender"] == "female" and row["status"] == "active"
+    assert row["available_days"] == "monday;tuesday;wednesday;thursday;friday;saturday;sunday"
+    assert row["available_hours_start"] == "00:00:00" and row["sub_specialization"] == ""
+
+async def test_patients_csv(client, db):
+    response = await _export(client, db, "export_patients", format="csv")
+    assert response.status_code == 200
+    assert response.text.splitlines() == [",".join(column.key for column in Patient.__table__.columns)]
+    
+    patient = await create_patient(db)
+    patient.height_cm, patient.blood_group = Decimal("172.5"), BloodGroup.O_POSITIVE
+    await db.commit()
+    response = await _export(client, db, "export_patients", format="csv")
+    header, row = list(csv.reader(io.StringIO(response.text)))
+    row = dict(zip(header, row))
+    assert row["date_of_birth"] == "1990-01-01" and row["height_cm"] == "172.50"
+    assert row["gender"] == "male" and row["blood_group"] == BloodGroup.O_POSITIVE.value
+
+@pytest.mark.parametrize("name", ["export_hospitals", "export_doctors", "export_patients"])
+async def test_exports_are_admin_only(client, db, name):
+    hospital = await create_hospital(db)
+    patient = await create_patient(db)
+    for user_id in (hospital.user_id, patient.user_id):
+        response = await client.get(client.app.url_path_for(name), headers=auth_headers(User(id=user_id)))
+        assert response.status_code == 403
+    response = await client.get(client.app.url_path_for(name))
+    assert response.status_code in (401, 403)
@@ -0,0 +1,62 @@
+from app.models.hospital import Hospital
+from app.pagination import encode_cursor
+from tests.conftest import create_doctor, create_hospital
+
+async def test_hospital_list_serializes_rows(client, db):
+    hospital = await create_hospital(db)
+    for fields in (None, "name", "summary"):
+        response = await client.get(client.app.url_path_for("get_hospitals"), params={"fields": fields} if fields else {})
+        assert response.status_code == 200, response.text
+        [item] = response.json()["items"]
+        assert item["name"] == hospital.name
+        if fields != "name":
+            assert item["id"] == str(hospital.id)
+
+async def test_doctor_list_serializes_rows(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    for fields in (None, "summary"):
+        response = await client.get(client.app.url_path_for("get_doctors"), params={"fields": fields} if fields else {})
+        assert response.status_code == 200, response.text
+        [item] = response.json()["items"]
+        assert item["id"] == str(doctor.id)
+        assert item["hospital_id"] == str(hospital.id)
+
+async def _first_page(client, endpoint, **params):
+    response = await client.get(client.app.url_path_for(endpoint), params={"limit": 1, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+async def test_cursor_resumes_its_listing(client, db):
+    hospitals = [await create_hospital(db, name) for name in ("Alpha", "Beta")]
+    first = await _first_page(client, "get_hospitals")
+    second = await _first_page(client, "get_hospitals", cursor=first["next_cursor"])
+    assert [first["items"][0]["id"], second["items"][0]["id"]] == [str(hospital.id) for hospital in hospitals]
+    assert second["next_cursor"] is None
+
+async def test_cursor_from_another_listing_is_rejected(client, db):
+    hospital = await create_hospital(db)
+    for _ in range(2):
+        await create_doctor(db, hospital)
+    await create_hospital(db, "Second Hospital")
+    # Both listings sort by a (string, id) pair, so only the signed listing tells their cursors apart
+    doctors_cursor = (await _first_page(client, "get_doctors"))["next_cursor"]
+    response = await client.get(client.app.url_path_for("get_hospitals"), params={"cursor": doctors_cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Pagination cursor was issued for a different listing"
+
+async def test_cursor_with_another_sort_order_is_rejected(client, db):
+    hospital = await create_hospital(db)
+    await create_hospital(db, "Second Hospital")
+    cursor = encode_cursor([hospital.id, hospital.name], "hospitals", (Hospital.id, Hospital.name))
+    response = await client.get(client.app.url_path_for("get_hospitals"), params={"cursor": cursor})
+    assert response.status_code == 400
+
+async def test_tampered_cursor_is_rejected(client, db):
+    await create_hospital(db)
+    await create_hospital(db, "Second Hospital")
+    cursor = (await _first_page(client, "get_hospitals"))["next_cursor"]
+    tampered = cursor[:-2] + ("AA" if cursor[-2:] != "AA" else "BB")
+    response = await client.get(client.app.url_path_for("get_hospitals"), params={"cursor": tampered})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
@@ -0,0 +1,70 @@
+import json
+import smtplib
+import time
+import fakeredis
+import pytest
+from app.config import settings
+from app.mail import (
+    DEAD_LETTER_KEY, HEARTBEAT_KEY, OUTBOX_KEY, PROCESSING_KEY, RETRY_KEY, deliver_outbox, promote_due_retries
+)
+
+class FakeConnection:
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.sent = []
+
+    def send(self, message) -> None:
+        if self.error is not None:
+            raise self.error
+        self.sent.append(message["To"])
+
+    def close(self) -> None:
+        pass
+
+@pytest.fixture
+def mail_redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+def _queue(client, *recipients, attempts=0):
+    for recipient in recipients:
+        client.rpush(OUTBOX_KEY, json.dumps({"id": recipient, "to": recipient, "subject": "Hi", "body": "Hello",
+                                             "attempts": attempts}))
+
+def test_sent_messages_are_acknowledged(mail_redis):
+    _queue(mail_redis, "a@example.com", "b@example.com")
+    connection = FakeConnection()
+    stats = deliver_outbox(mail_redis, connection, 10, "worker-1")
+    assert stats == {"sent": 2, "retried": 0, "dead": 0}
+    assert connection.sent == ["a@example.com", "b@example.com"]
+    assert mail_redis.llen(OUTBOX_KEY) == mail_redis.llen(PROCESSING_KEY.format("worker-1")) == 0
+
+def test_failures_are_retried_then_dead_lettered(mail_redis):
+    _queue(mail_redis, "a@example.com")
+    _queue(mail_redis, "b@example.com", attempts=settings.MAIL_MAX_ATTEMPTS - 1)
+    stats = deliver_outbox(mail_redis, FakeConnection(smtplib.SMTPServerDisconnected()), 10, "worker-1")
+    assert stats == {"sent": 0, "retried": 1, "dead": 1}
+    assert mail_redis.zcard(RETRY_KEY) == mail_redis.llen(DEAD_LETTER_KEY) == 1
+    assert mail_redis.llen(PROCESSING_KEY.format("worker-1")) == 0
+
+def test_messages_of_a_crashed_worker_are_requeued(mail_redis):
+    _queue(mail_redis, "a@example.com", "b@example.com")
+    with pytest.raises(RuntimeError):
+        deliver_outbox(mail_redis, FakeConnection(RuntimeError("worker killed")), 10, "worker-1")
+    assert mail_redis.llen(PROCESSING_KEY.format("worker-1")) == 1
+    
+    # Still heartbeating: another worker leaves its in-flight message alone
+    connection = FakeConnection()
+    deliver_outbox(mail_redis, connection, 10, "worker-2")
+    assert connection.sent == ["b@example.com"]
+    
+    mail_redis.delete(HEARTBEAT_KEY.format("worker-1"))
+    deliver_outbox(mail_redis, connection, 10, "worker-2")
+    assert connection.sent == ["b@example.com", "a@example.com"]
+    assert mail_redis.llen(PROCESSING_KEY.format("worker-1")) == 0
+
+def test_due_retries_are_promoted_once(mail_redis):
+    mail_redis.zadd(RETRY_KEY, {"due": time.time() - 1, "later": time.time() + 3600})
+    assert promote_due_retries(mail_redis) == 1
+    assert promote_due_retries(mail_redis) == 0
+    assert mail_redis.lrange(OUTBOX_KEY, 0, -1) == ["due"]
+    assert mail_redis.zrange(RETRY_KEY, 0, -1) == ["later"]
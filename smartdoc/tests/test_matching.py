@@ -0,0 +1,145 @@
+import math
+import random
+import pytest
+from app.config import settings
+from app.geo import HospitalSpatialIndex, IndexedHospital, bounding_box, haversine_km
+from app.models.user import User
+from app.schemas.matchingSchema import MatchingQuery
+from app.services.matchingService import MatchingService
+from tests.conftest import auth_headers, create_hospital, create_patient
+
+SPECIALTIES = ["cardiology", "pediatrics", "oncology"]
+
+def _hospitals(rng: random.Random, count: int = 5000):
+    hospitals = []
+    for index in range(count):
+        # Uniform over the sphere, plus clusters at both poles and either side of the antimeridian
+        if index % 10 == 0:
+            lat, lon = rng.choice([-1, 1]) * rng.uniform(88, 90), rng.uniform(-180, 180)
+        elif index % 10 == 1:
+            lat, lon = rng.uniform(-3, 3), rng.choice([-1, 1]) * rng.uniform(178, 180)
+        else:
+            lat, lon = math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180)
+        specialties = rng.sample(SPECIALTIES, 2) + (["transplant"] if index % 100 == 0 else [])
+        hospitals.append(IndexedHospital(str(index), f"Hospital {index}", None, lat, lon,
+                                         frozenset(specialties), rng.random() < 0.3))
+    return hospitals
+
+def _brute_force(hospitals, lat, lon, k, predicate=None, max_distance_km=None, specialty=None):
+    matches = sorted(
+        (haversine_km(lat, lon, hospital.latitude, hospital.longitude), hospital.id) for hospital in hospitals
+        if (specialty is None or specialty in hospital.specialties) and (predicate is None or predicate(hospital))
+    )
+    return [match for match in matches if max_distance_km is None or match[0] <= max_distance_km][:k]
+
+def _query_points(rng: random.Random):
+    points = [(90, 0), (-90, 45), (89.95, 179.99), (0, 180), (0, -180), (1, 179.999), (-1, -179.999)]
+    points += [(rng.choice([-1, 1]) * rng.uniform(87, 90), rng.uniform(-180, 180)) for _ in range(40)]
+    points += [(rng.uniform(-4, 4), rng.choice([-1, 1]) * rng.uniform(179, 180)) for _ in range(40)]
+    points += [(math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180)) for _ in range(80)]
+    return points
+
+@pytest.fixture(scope="module")
+def index():
+    hospitals = _hospitals(random.Random(5))
+    index = HospitalSpatialIndex()
+    index.replace_all(hospitals)
+    return index, hospitals
+
+@pytest.mark.parametrize("k, specialty, emergency, max_distance_km", [
+    (1, None, None, None),
+    (10, None, None, None),
+    (10, "cardiology", None, None),
+    (5, "transplant", None, None),
+    (10, None, True, None),
+    (10, "pediatrics", True, 500),
+    (50, None, None, 100),
+])
+def test_nearest_matches_brute_force(index, k, specialty, emergency, max_distance_km):
+    index, hospitals = index
+    predicate = None if emergency is None else (lambda hospital: hospital.emergency_services == emergency)
+    for lat, lon in _query_points(random.Random(k)):
+        found = [(round(distance, 6), hospital.id)
+                 for distance, hospital in index.nearest(lat, lon, k, predicate, max_distance_km, specialty)]
+        expected = _brute_force(hospitals, lat, lon, k, predicate, max_distance_km, specialty)
+        # Ties may come back in either order, so compare the distances
+        assert [distance for distance, _ in found] == [round(distance, 6) for distance, _ in expected], (lat, lon)
+
+def test_nearest_finds_neighbours_across_the_antimeridian():
+    index = HospitalSpatialIndex()
+    east = IndexedHospital("east", "East", None, 0.0, 179.95, frozenset(), False)
+    west = IndexedHospital("west", "West", None, 0.0, -179.95, frozenset(), False)
+    far = IndexedHospital("far", "Far", None, 0.0, 178.0, frozenset(), False)
+    index.replace_all([east, west, far])
+    assert [hospital.id for _, hospital in index.nearest(0.0, -179.99, 2)] == ["west", "east"]
+
+def test_removed_hospital_is_not_matched():
+    index = HospitalSpatialIndex()
+    hospital = IndexedHospital("1", "Moved", None, 6.5, 3.4, frozenset(), False)
+    index.replace_all([hospital])
+    index.remove("1")
+    assert index.nearest(6.5, 3.4, 1) == []
+
+@pytest.mark.parametrize("lat, lon, radius_km", [(0, 179.9, 50), (0, -179.9, 50), (89.9, 10, 25), (-89.95, 0, 10)])
+def test_bounding_box_contains_the_circle(lat, lon, radius_km):
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    rng = random.Random(1)
+    for _ in range(2000):
+        point_lat, point_lon = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        if haversine_km(lat, lon, point_lat, point_lon) > radius_km:
+            continue
+        in_lon = (min_lon <= point_lon <= max_lon) if min_lon <= max_lon else (point_lon >= min_lon or point_lon <= max_lon)
+        assert min_lat <= point_lat <= max_lat and in_lon
+    # Sample right around the centre as well, which uniform points rarely hit
+    for _ in range(2000):
+        point_lat = max(-90.0, min(90.0, lat + rng.uniform(-1, 1)))
+        point_lon = (lon + rng.uniform(-180, 180) + 180) % 360 - 180
+        if haversine_km(lat, lon, point_lat, point_lon) > radius_km:
+            continue
+        in_lon = (min_lon <= point_lon <= max_lon) if min_lon <= max_lon else (point_lon >= min_lon or point_lon <= max_lon)
+        assert min_lat <= point_lat <= max_lat and in_lon, (point_lat, point_lon)
+
+async def _place(db, lat: float, lon: float, specialties=("cardiology",), emergency: bool = False):
+    hospital = await create_hospital(db, name=f"Hospital {lat},{lon}")
+    hospital.latitude, hospital.longitude = lat, lon
+    hospital.specialties, hospital.emergency_services = list(specialties), emergency
+    await db.commit()
+    return hospital
+
+async def test_sql_fallback_matches_brute_force(db, monkeypatch):
+    monkeypatch.setattr(settings, "HOSPITAL_INDEX_ENABLED", False)
+    rng = random.Random(7)
+    placed = [
+        await _place(db, 0.0, -179.95), await _place(db, 0.0, 178.5), await _place(db, 89.95, 100.0),
+        await _place(db, 89.9, -80.0, emergency=True), await _place(db, 6.5, 3.4, ("pediatrics",)),
+    ]
+    for _ in range(15):
+        placed.append(await _place(db, rng.uniform(-60, 60), rng.uniform(-180, 180),
+                                   rng.sample(SPECIALTIES, 2), rng.random() < 0.5))
+    hospitals = [IndexedHospital.from_hospital(hospital) for hospital in placed]
+    service = MatchingService(db)
+    
+    for lat, lon, limit, specialty, emergency in [
+        (0.0, 179.95, 1, None, None), (0.0, 179.95, 3, None, None), (89.99, -100.0, 2, None, None),
+        (89.99, 0.0, 1, None, True), (6.4, 3.3, 1, "pediatrics", None), (-30.0, 20.0, 5, "cardiology", None),
+    ]:
+        query = MatchingQuery(latitude=lat, longitude=lon, limit=limit, specialty=specialty,
+                              emergency_services=emergency)
+        predicate = None if emergency is None else (lambda hospital: hospital.emergency_services == emergency)
+        expected = _brute_force(hospitals, lat, lon, limit, predicate, specialty=specialty)
+        matches = await service.match_hospitals(query)
+        assert [match.id for match in matches] == [hospital_id for _, hospital_id in expected], (lat, lon)
+
+async def test_match_endpoint_uses_the_index(client, db, monkeypatch):
+    from app.geo import hospital_index
+    monkeypatch.setattr(hospital_index, "loaded_at", None)
+    near = await _place(db, 6.45, 3.39, ("pediatrics",), emergency=True)
+    await _place(db, 6.6, 3.5, ("pediatrics",))
+    await _place(db, 6.46, 3.40, ("cardiology",), emergency=True)
+    patient = await create_patient(db)
+    response = await client.post(
+        client.app.url_path_for("match_hospitals"), headers=auth_headers(User(id=patient.user_id)),
+        json={"latitude": 6.45, "longitude": 3.39, "specialty": "Pediatrics", "emergency_services": True}
+    )
+    assert response.status_code == 200, response.text
+    assert [match["id"] for match in response.json()] == [str(near.id)]
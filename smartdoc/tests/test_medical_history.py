@@ -0,0 +1,74 @@
+from app.models import ConsultationStatus
+from app.models.user import User
+from tests.conftest import auth_headers, create_consultation, create_doctor, create_hospital, create_patient
+
+def _headers(profile):
+    return auth_headers(User(id=profile.user_id))
+
+async def _get_history(client, profile, patient):
+    return await client.get(client.app.url_path_for("get_medical_history", patient_id=str(patient.id)),
+                            headers=_headers(profile))
+
+async def test_access_requires_a_live_booking_with_the_caller(client, db):
+    hospital = await create_hospital(db)
+    other_hospital = await create_hospital(db, name="Other Hospital")
+    doctor = await create_doctor(db, hospital)
+    colleague = await create_doctor(db, hospital)
+    outsider = await create_doctor(db, other_hospital)
+    patient = await create_patient(db)
+    cancelled_patient = await create_patient(db)
+    await create_consultation(db, patient, doctor)
+    await create_consultation(db, cancelled_patient, doctor, slot=1, status=ConsultationStatus.CANCELLED)
+    
+    assert (await _get_history(client, doctor, patient)).status_code == 200
+    assert (await _get_history(client, hospital, patient)).status_code == 200
+    assert (await _get_history(client, colleague, patient)).status_code == 403
+    assert (await _get_history(client, outsider, patient)).status_code == 403
+    assert (await _get_history(client, other_hospital, patient)).status_code == 403
+    assert (await _get_history(client, doctor, cancelled_patient)).status_code == 403
+
+async def test_hospital_access_follows_the_doctor_not_the_consultation_row(client, db):
+    hospital = await create_hospital(db)
+    other_hospital = await create_hospital(db, name="Other Hospital")
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    consultation = await create_consultation(db, patient, doctor)
+    consultation.hospital_id = other_hospital.id
+    await db.commit()
+    
+    assert (await _get_history(client, other_hospital, patient)).status_code == 403
+    assert (await _get_history(client, hospital, patient)).status_code == 200
+
+async def test_search_by_allergy_and_condition(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db, allergies=["penicillin", "latex"], conditions=["asthma"])
+    other = await create_patient(db, allergies=["penicillin"])
+    unrelated = await create_patient(db, allergies=["penicillin"])
+    await create_consultation(db, patient, doctor)
+    await create_consultation(db, other, doctor, slot=1)
+    path = client.app.url_path_for("search_medical_history")
+    
+    response = await client.get(path, params={"allergy": " Penicillin "}, headers=_headers(doctor))
+    assert response.status_code == 200, response.text
+    assert {item["patient_id"] for item in response.json()["items"]} == {str(patient.id), str(other.id)}
+    
+    response = await client.get(path, params={"allergy": "LATEX", "condition": "Asthma"}, headers=_headers(doctor))
+    assert [item["patient_id"] for item in response.json()["items"]] == [str(patient.id)]
+    
+    response = await client.get(path, params={"allergy": "penicillin"}, headers=_headers(hospital))
+    assert str(unrelated.id) not in {item["patient_id"] for item in response.json()["items"]}
+
+async def test_failed_patch_does_not_leak_database_errors(client, db):
+    patient = await create_patient(db)
+    path = client.app.url_path_for("patch_my_medical_history")
+    response = await client.patch(path, headers=_headers(patient), json={"ops": [
+        {"op": "set", "path": "/past_surgeries", "value": [{"name": "appendectomy", "year": 2010}]},
+    ]})
+    assert response.status_code == 200, response.text
+    response = await client.patch(path, headers=_headers(patient), json={"ops": [
+        # /past_surgeries/0 is an object, so PostgreSQL cannot iterate it as an array
+        {"op": "remove", "path": "/past_surgeries/0", "value": "appendectomy"},
+    ]})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Patch could not be applied to the current record"
@@ -0,0 +1,76 @@
+import pytest
+from app.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, Metric, Registry
+from tests.conftest import create_hospital
+
+def _scrape_text(text: str) -> dict:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines() if line and not line.startswith("#")
+    }
+
+async def _scrape(client) -> dict:
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    return _scrape_text(response.text)
+
+def _route(client, name: str) -> str:
+    [path] = [route.path for route in client.app.routes if getattr(route, "name", None) == name]
+    return path
+
+def test_metric_requires_samples():
+    with pytest.raises(TypeError):
+        Metric("smartdoc_test", "Abstract")
+
+def test_histogram_exposition():
+    registry = Registry()
+    histogram = registry.register(Histogram("smartdoc_test_seconds", "Test latency", ("route",), (0.1, 1)))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(("/a",), value)
+    lines = registry.render().splitlines()
+    assert lines == [
+        "# HELP smartdoc_test_seconds Test latency",
+        "# TYPE smartdoc_test_seconds histogram",
+        'smartdoc_test_seconds_bucket{route="/a",le="0.1"} 2',
+        'smartdoc_test_seconds_bucket{route="/a",le="1"} 3',
+        'smartdoc_test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'smartdoc_test_seconds_sum{route="/a"} 3.65',
+        'smartdoc_test_seconds_count{route="/a"} 4',
+    ]
+
+def test_counter_and_gauge_exposition():
+    registry = Registry()
+    counter = registry.register(Counter("smartdoc_test_events", "Events", ("kind",)))
+    gauge = registry.register(Gauge("smartdoc_test_in_flight", "In flight"))
+    counter.inc(('say "hi"\n',), 2)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert _scrape_text(registry.render()) == {
+        'smartdoc_test_events_total{kind="say \\"hi\\"\\n"}': 2, "smartdoc_test_in_flight": 1
+    }
+
+async def test_requests_are_recorded_by_route_template(client, db):
+    hospital = await create_hospital(db)
+    route = _route(client, "get_hospital")
+    path = client.app.url_path_for("get_hospital", hospital_id=str(hospital.id))
+    before = await _scrape(client)
+    
+    for _ in range(2):
+        assert (await client.get(path)).status_code == 200
+    await client.get("/no-such-path")
+    after = await _scrape(client)
+    
+    def delta(series: str) -> float:
+        return after.get(series, 0) - before.get(series, 0)
+    
+    assert delta(f'smartdoc_http_requests_total{{method="GET",route="{route}",status="200"}}') == 2
+    assert delta('smartdoc_http_requests_total{method="GET",route="unmatched",status="404"}') == 1
+    assert delta(f'smartdoc_http_request_duration_seconds_count{{method="GET",route="{route}"}}') == 2
+    assert delta(f'smartdoc_http_request_duration_seconds_bucket{{method="GET",route="{route}",le="+Inf"}}') == 2
+    assert not any(str(hospital.id) in series for series in after)
+    # One SELECT per request, counted against the route
+    assert delta(f'smartdoc_db_statements_per_request_bucket{{route="{route}",le="1"}}') == 2
+    assert delta(f'smartdoc_db_statements_per_request_sum{{route="{route}"}}') == 2
+    assert delta(f'smartdoc_db_statements_total{{route="{route}"}}') == 2
+    assert after["smartdoc_http_requests_in_flight"] == 1  # the scrape itself
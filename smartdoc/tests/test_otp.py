@@ -0,0 +1,53 @@
+import pytest
+from app.celery import celery_app
+from app.config import settings
+from app.tasks.otp import send_otp_sms
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("twilio")
+from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
+from twilio.http.response import Response
+
+@pytest.fixture
+def twilio(monkeypatch):
+    """Point the task at Twilio and make every API call produce the given outcome, recording the calls."""
+    monkeypatch.setattr(settings, "TWILIO_ACCOUNT_SID", "AC" + "0" * 32)
+    monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", "token")
+    monkeypatch.setattr(settings, "TWILIO_PHONE_NUMBER", "+15005550006")
+    # Propagating eager tasks raise the first Retry instead of running the retries
+    monkeypatch.setattr(celery_app.conf, "task_eager_propagates", False)
+    
+    def respond_with(outcome):
+        calls = []
+        
+        def request(self, method, url, *args, **kwargs):
+            calls.append(url)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        
+        monkeypatch.setattr(TwilioHttpClient, "request", request)
+        return calls
+    
+    return respond_with
+
+def test_network_errors_are_retried(twilio):
+    calls = twilio(requests.ConnectionError("connection reset"))
+    result = send_otp_sms.apply(args=("+15551234567", "123456"))
+    assert isinstance(result.result, ConnectionError)
+    # The first attempt plus max_retries
+    assert len(calls) == 1 + send_otp_sms.max_retries
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_provider_outages_are_retried(twilio, status):
+    calls = twilio(Response(status, '{"message": "Try again later"}'))
+    result = send_otp_sms.apply(args=("+15551234567", "123456"))
+    assert isinstance(result.result, ConnectionError)
+    assert len(calls) == 1 + send_otp_sms.max_retries
+
+def test_rejected_messages_are_not_retried(twilio):
+    calls = twilio(Response(400, '{"code": 21211, "message": "Invalid To number"}'))
+    result = send_otp_sms.apply(args=("+1555", "123456"))
+    assert isinstance(result.result, TwilioRestException)
+    assert len(calls) == 1
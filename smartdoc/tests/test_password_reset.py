@@ -0,0 +1,79 @@
+import asyncio
+import json
+import logging
+from app.config import settings
+from app.mail import OUTBOX_KEY
+from app.models import UserRole
+from app.services.authService import RESET_TOKEN_TTL_SECONDS
+from tests.conftest import create_patient, create_user
+
+NEW_PASSWORD = "New-password-1"
+
+async def _request_reset(client, redis, email: str) -> str:
+    response = await client.post(client.app.url_path_for("forgot_password"), json={"email": email})
+    assert response.status_code == 200, response.text
+    message = json.loads(await redis.lindex(OUTBOX_KEY, -1))
+    assert message["to"] == email
+    return message["body"].rsplit("token=", 1)[1]
+
+async def test_forgot_password_stores_an_expiring_token(client, db, redis):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    token = await _request_reset(client, redis, user.email)
+    assert await redis.get(f"reset_token:{token}") == str(user.id)
+    assert 0 < await redis.ttl(f"reset_token:{token}") <= RESET_TOKEN_TTL_SECONDS
+
+async def test_forgot_password_for_unknown_email_stores_nothing(client, database, redis):
+    response = await client.post(client.app.url_path_for("forgot_password"), json={"email": "nobody@example.com"})
+    assert response.status_code == 200
+    assert await redis.keys("reset_token:*") == []
+    assert await redis.llen(OUTBOX_KEY) == 0
+
+async def test_reset_token_is_single_use(client, db, redis):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    token = await _request_reset(client, redis, user.email)
+    path = client.app.url_path_for("reset_password")
+    
+    response = await client.post(path, json={"token": token, "new_password": NEW_PASSWORD})
+    assert response.status_code == 200, response.text
+    assert await redis.exists(f"reset_token:{token}") == 0
+    response = await client.post(path, json={"token": token, "new_password": "Other-password-1"})
+    assert response.status_code == 400
+    
+    response = await client.post(client.app.url_path_for("login"), json={"email": user.email, "password": NEW_PASSWORD})
+    assert response.status_code == 200, response.text
+
+async def test_concurrent_resets_consume_the_token_once(client, db, redis):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    token = await _request_reset(client, redis, user.email)
+    path = client.app.url_path_for("reset_password")
+    responses = await asyncio.gather(*(
+        client.post(path, json={"token": token, "new_password": f"{NEW_PASSWORD}-{index}"}) for index in range(5)
+    ))
+    assert sorted(response.status_code for response in responses) == [200, 400, 400, 400, 400]
+
+async def test_expired_reset_token_is_rejected(client, db, redis):
+    user = await create_user(db, UserRole.PATIENT)
+    await db.commit()
+    token = await _request_reset(client, redis, user.email)
+    await redis.delete(f"reset_token:{token}")
+    response = await client.post(client.app.url_path_for("reset_password"),
+                                 json={"token": token, "new_password": NEW_PASSWORD})
+    assert response.status_code == 400
+
+async def test_send_otp_stores_an_expiring_code(client, db, redis, caplog):
+    patient = await create_patient(db)
+    with caplog.at_level(logging.WARNING, logger="app.tasks.otp"):
+        response = await client.post(client.app.url_path_for("send_otp"), params={"phone": patient.phone})
+    assert response.status_code == 200, response.text
+    otp = await redis.get(f"otp:{patient.phone}")
+    assert len(otp) == 6 and otp.isdigit()
+    assert 0 < await redis.ttl(f"otp:{patient.phone}") <= settings.OTP_TTL_SECONDS
+    assert f"OTP for {patient.phone} was not delivered" in caplog.text
+
+async def test_send_otp_for_unknown_phone(client, database, redis):
+    response = await client.post(client.app.url_path_for("send_otp"), params={"phone": "+2340000000000"})
+    assert response.status_code == 404
+    assert await redis.keys("otp:*") == []
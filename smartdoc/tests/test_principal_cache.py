@@ -0,0 +1,28 @@
+from app.cache import principal_cache
+from app.models import UserRole
+from tests.conftest import auth_headers, create_user
+
+PRINCIPAL = {"id": "u1", "email": "u1@example.com", "role": "PATIENT", "status": "ACTIVE", "is_verified": True,
+             "hospital_subscription_active": None}
+
+async def test_load_that_raced_an_invalidation_is_not_cached(redis):
+    generation = await principal_cache.generation("u1")
+    # The role changes while the request that read the old row is still running
+    await principal_cache.invalidate("u1")
+    await principal_cache.set("u1", PRINCIPAL, generation)
+    assert await redis.get(principal_cache.key_prefix + "u1") is None
+    assert await principal_cache.get("u1") is None
+
+async def test_load_after_the_invalidation_is_cached(redis):
+    await principal_cache.invalidate("u1")
+    await principal_cache.set("u1", PRINCIPAL, await principal_cache.generation("u1"))
+    principal_cache.local.clear()
+    assert await principal_cache.get("u1") == PRINCIPAL
+
+async def test_requests_fill_the_cache(client, db, redis):
+    user = await create_user(db, UserRole.ADMIN)
+    await db.commit()
+    path = client.app.url_path_for("get_user_profile", user_id=str(user.id))
+    response = await client.get(path, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    assert await redis.get(principal_cache.key_prefix + str(user.id)) is not None
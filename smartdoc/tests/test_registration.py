@@ -0,0 +1,24 @@
+import uuid
+from tests.conftest import create_hospital
+
+def _email(role: str) -> str:
+    return f"{role}-{uuid.uuid4().hex[:8]}@example.com"
+
+async def test_doctor_registration(client, db):
+    hospital = await create_hospital(db)
+    response = await client.post(client.app.url_path_for("create_doctor_account"), json={
+        "email": _email("doctor"), "password": "Doctor-password-1", "hospital_id": str(hospital.id),
+        "first_name": "Ada", "last_name": "Okafor", "phone": "+2348000000003", "specialization": "cardiology"
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["doctor"]["hospital_id"] == str(hospital.id)
+    assert body["tokens"]["access_token"]
+
+async def test_patient_registration(client, db):
+    response = await client.post(client.app.url_path_for("create_patient_account"), json={
+        "email": _email("patient"), "password": "Patient-password-1", "first_name": "Bola", "last_name": "Bello",
+        "phone": "+2348000000004", "date_of_birth": "1990-01-01", "gender": "male", "data_consent": True
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["patient"]["first_name"] == "Bola"
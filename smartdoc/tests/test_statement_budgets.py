@@ -0,0 +1,58 @@
+import uuid
+import pytest
+from app.profiling import StatementBudgetExceeded
+from tests.conftest import create_hospital
+
+pytest_plugins = ["pytester"]
+
+def _patient(email: str) -> dict:
+    return {"email": email, "password": "Patient-password-1", "first_name": "Bola", "last_name": "Bello",
+            "phone": "+2348000000005", "date_of_birth": "1990-01-01", "gender": "female"}
+
+@pytest.mark.statement_budget(2)
+async def test_patient_registration_is_two_inserts(client, database):
+    response = await client.post(client.app.url_path_for("create_patient_account"),
+                                 json=_patient(f"budget-{uuid.uuid4().hex[:8]}@example.com"))
+    assert response.status_code == 200, response.text
+
+async def test_directory_pages_are_one_query(client, db, statement_budget):
+    await create_hospital(db)
+    with statement_budget(1, "GET /hospitals"):
+        response = await client.get(client.app.url_path_for("get_hospitals"))
+    assert response.status_code == 200
+
+async def test_recorder_reports_repeated_statements(client, db, sql_recorder):
+    hospital = await create_hospital(db)
+    path = client.app.url_path_for("get_hospital", hospital_id=str(hospital.id))
+    for _ in range(3):
+        await client.get(path)
+    [(shape, count)] = sql_recorder.repeated_shapes(3)
+    assert count == 3 and shape.startswith("SELECT hospitals.")
+
+async def test_budget_context_manager_raises(client, db, statement_budget):
+    hospital = await create_hospital(db)
+    with pytest.raises(StatementBudgetExceeded, match="executed 2 SQL statements, budget is 1"):
+        with statement_budget(1):
+            await client.get(client.app.url_path_for("get_hospital", hospital_id=str(hospital.id)))
+            await client.get(client.app.url_path_for("get_hospital", hospital_id=str(hospital.id)))
+
+def test_marker_fails_a_test_over_budget(pytester):
+    pytester.makepyfile("""
+        import pytest
+        from sqlalchemy import create_engine, text
+
+        @pytest.mark.statement_budget(2)
+        def test_over_budget():
+            with create_engine("sqlite://").connect() as connection:
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+
+        @pytest.mark.statement_budget(3)
+        def test_within_budget():
+            with create_engine("sqlite://").connect() as connection:
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+    """)
+    result = pytester.runpytest_inprocess("-p", "app.pytest_plugin")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*test_over_budget executed 3 SQL statements, budget is 2*"])
@@ -0,0 +1,137 @@
+import uuid
+from app.config import settings
+from app.models import ConsultationStatus
+from app.models.user import User
+from tests.conftest import (
+    auth_headers, consultation_row, create_consultation, create_doctor, create_hospital, create_patient
+)
+
+async def _sync(client, user_id, mutations=(), sync_token=None):
+    response = await client.post(client.app.url_path_for("sync_data"), headers=auth_headers(User(id=user_id)),
+                                 json={"mutations": list(mutations), "sync_token": sync_token})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _reasons(body):
+    return {rejection["id"]: rejection["reason"] for rejection in body["rejected"]}
+
+async def test_consultations_cannot_be_created_or_moved_through_sync(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    other_patient = await create_patient(db)
+    consultation = await create_consultation(db, patient, doctor)
+    new_id = str(uuid.uuid4())
+    
+    body = await _sync(client, doctor.user_id, [
+        {"entity": "consultation", "id": new_id, "base_version": 0,
+         "data": {"patient_id": str(other_patient.id), "consultation_type": "direct_booking"}},
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 1,
+         "data": {"patient_id": str(other_patient.id)}},
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 1, "data": {"status": "cancelled"}},
+    ])
+    reasons = _reasons(body)
+    assert new_id in reasons and str(consultation.id) in reasons
+    assert body["applied"] == []
+    
+    body = await _sync(client, patient.user_id, [
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 1,
+         "data": {"scheduled_at": "2030-01-01T09:00:00+00:00"}},
+    ])
+    assert "scheduled_at" in _reasons(body)[str(consultation.id)]
+
+async def test_doctor_updates_notes_and_status(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    other_doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    consultation = await create_consultation(db, patient, doctor)
+    mutation = {"entity": "consultation", "id": str(consultation.id), "base_version": 1,
+                "data": {"status": "completed", "diagnosis": "Migraine"}}
+    
+    body = await _sync(client, other_doctor.user_id, [mutation])
+    assert body["applied"] == [] and str(consultation.id) in _reasons(body)
+    
+    body = await _sync(client, doctor.user_id, [mutation])
+    assert body["applied"] == [str(consultation.id)]
+    [row] = body["changes"]["consultation"]
+    assert row["status"] == ConsultationStatus.COMPLETED.value
+    assert row["version"] == 2
+
+async def test_failing_mutation_is_rejected_alone(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    consultation = await create_consultation(db, patient, doctor)
+    history_id = str(uuid.uuid4())
+    
+    body = await _sync(client, patient.user_id, [
+        # Out of range for the rating CHECK constraint
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 1, "data": {"rating": 9}},
+        # The patient already has a medical history row
+        {"entity": "medical_history", "id": history_id, "base_version": 0, "data": {"allergies": ["latex"]}},
+        {"entity": "patient", "id": str(patient.id), "base_version": 1, "data": {"city": "Abuja"}},
+    ])
+    assert body["applied"] == [str(patient.id)]
+    reasons = _reasons(body)
+    assert reasons[str(consultation.id)] == reasons[history_id] == "Mutation could not be applied"
+    assert body["changes"]["patient"][0]["city"] == "Abuja"
+
+async def test_changes_page_through_rows_sharing_a_timestamp(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_MAX_CHANGES", 3)
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    # One transaction, so every row gets the same updated_at
+    rows = [consultation_row(patient, doctor, slot=slot) for slot in range(7)]
+    db.add_all(rows)
+    await db.commit()
+    
+    seen, token = [], None
+    for _ in range(5):
+        body = await _sync(client, doctor.user_id, sync_token=token)
+        seen.extend(row["id"] for row in body["changes"]["consultation"])
+        token = body["sync_token"]
+        if not body["has_more"]:
+            break
+    assert set(seen) == {str(row.id) for row in rows}
+
+async def test_wrong_typed_field_is_rejected_alone(client, db):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    consultation = await create_consultation(db, patient, doctor)
+    
+    body = await _sync(client, patient.user_id, [
+        {"entity": "patient", "id": str(patient.id), "base_version": 1, "data": {"date_of_birth": 19900101}},
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 1, "data": {"symptoms": "Cough"}},
+    ])
+    assert body["applied"] == [str(consultation.id)]
+    assert _reasons(body)[str(patient.id)] == "date_of_birth has an invalid value"
+    
+    body = await _sync(client, patient.user_id, [
+        {"entity": "patient", "id": str(patient.id), "base_version": 1, "data": {"height_cm": "abc"}},
+    ])
+    assert _reasons(body)[str(patient.id)] == "height_cm has an invalid value"
+
+async def test_updates_are_written_in_one_statement_per_field_set(client, db, sql_recorder):
+    hospital = await create_hospital(db)
+    doctor = await create_doctor(db, hospital)
+    patient = await create_patient(db)
+    consultations = [consultation_row(patient, doctor, slot=slot) for slot in range(20)]
+    db.add_all(consultations)
+    await db.commit()
+    data = {"status": "completed", "diagnosis": "Migraine", "prescribed_medications": [{"name": "ibuprofen"}],
+            "follow_up_date": "2030-01-01", "completed_at": None}
+    
+    body = await _sync(client, doctor.user_id, [
+        {"entity": "consultation", "id": str(consultation.id), "base_version": 2 if index == 0 else 1, "data": data}
+        for index, consultation in enumerate(consultations)
+    ])
+    assert sorted(body["applied"]) == sorted(str(consultation.id) for consultation in consultations[1:])
+    assert body["conflicts"] == [str(consultations[0].id)]
+    assert len([statement for statement in sql_recorder.statements if statement.startswith("UPDATE consultations")]) == 1
+    synced = {row["id"]: row for row in body["changes"]["consultation"]}
+    row = synced[str(consultations[1].id)]
+    assert row["prescribed_medications"] == [{"name": "ibuprofen"}] and row["follow_up_date"] == "2030-01-01"
+    assert row["status"] == ConsultationStatus.COMPLETED.value and row["version"] == 2
@@ -0,0 +1,24 @@
+import asyncio
+import fakeredis
+from app.db import redis as redis_module
+from app.db.redis import get_redis
+from app.tasks import run_with_session
+
+async def test_task_redis_client_leaves_the_web_client_open(database, redis, monkeypatch):
+    task_clients = []
+    
+    def new_client():
+        task_clients.append(fakeredis.FakeAsyncRedis(decode_responses=True))
+        return task_clients[-1]
+    
+    monkeypatch.setattr(redis_module, "_new_client", new_client)
+    
+    async def task(session):
+        await get_redis().set("task:ran", 1)
+        return get_redis()
+    
+    # A worker thread with its own event loop, as when an eager task runs from enqueue()
+    used = await asyncio.to_thread(run_with_session, task)
+    assert used is task_clients[0]
+    assert get_redis() is redis
+    assert await redis.ping()